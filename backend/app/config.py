@@ -6,11 +6,123 @@ load_dotenv()
 
 class Settings(BaseSettings):
     DATABASE_URL: str = os.getenv("DATABASE_URL", "mongodb://localhost:27017")
+    # MongoDB connection pool (per client; the API holds one sync and one async client)
+    MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+    MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+    MONGO_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+    # How long an operation may wait for a free pooled connection before failing
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+    MONGO_CONNECT_TIMEOUT_MS: int = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    MONGO_SOCKET_TIMEOUT_MS: int = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "20000"))
+    # Write concern: a node count or "majority", whether to wait for the journal, and how long to wait
+    MONGO_WRITE_CONCERN_W: str = os.getenv("MONGO_WRITE_CONCERN_W", "majority")
+    MONGO_WRITE_CONCERN_J: bool = os.getenv("MONGO_WRITE_CONCERN_J", "true").lower() == "true"
+    MONGO_WRITE_TIMEOUT_MS: int = int(os.getenv("MONGO_WRITE_TIMEOUT_MS", "5000"))
     CORS_ORIGINS: str = os.getenv("CORS_ORIGINS", "http://localhost:5173")
     OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "llama2:latest")
     GROQ_API: str = os.getenv("GROQ_API", "")
     # Default to Groq's Llama 3.1 8B Instant unless overridden via env
     GROQ_MODEL: str = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
+    # Groq model list cache; the file also shares the selected model between workers
+    GROQ_MODEL_CATALOG_TTL_SECONDS: int = int(os.getenv("GROQ_MODEL_CATALOG_TTL_SECONDS", "3600"))
+    GROQ_MODEL_CATALOG_PATH: str = os.getenv("GROQ_MODEL_CATALOG_PATH", ".cache/groq_model.json")
+    # Client-side Groq rate limiting; per-model budgets are re-synced from response headers
+    GROQ_RATE_LIMIT_ENABLED: bool = os.getenv("GROQ_RATE_LIMIT_ENABLED", "true").lower() == "true"
+    GROQ_RATE_LIMIT_RPM: int = int(os.getenv("GROQ_RATE_LIMIT_RPM", "30"))
+    GROQ_RATE_LIMIT_TPM: int = int(os.getenv("GROQ_RATE_LIMIT_TPM", "6000"))
+    # Longest a live turn / background call may wait for budget before degrading or failing
+    GROQ_RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS: float = float(os.getenv("GROQ_RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS", "5"))
+    GROQ_RATE_LIMIT_BACKGROUND_MAX_WAIT_SECONDS: float = float(os.getenv("GROQ_RATE_LIMIT_BACKGROUND_MAX_WAIT_SECONDS", "120"))
+    # Share of each budget background work must leave for live turns
+    GROQ_RATE_LIMIT_BACKGROUND_RESERVE: float = float(os.getenv("GROQ_RATE_LIMIT_BACKGROUND_RESERVE", "0.2"))
+    # Cheaper model (with its own limits) live turns fall back to when the main one is out of budget
+    GROQ_DEGRADED_MODEL: str = os.getenv("GROQ_DEGRADED_MODEL", "")
+    # spaCy proficiency scoring: nlp.pipe batch size and worker processes (only worth >1 for bulk re-scoring)
+    SCORING_BATCH_SIZE: int = int(os.getenv("SCORING_BATCH_SIZE", "64"))
+    SCORING_N_PROCESS: int = int(os.getenv("SCORING_N_PROCESS", "1"))
+    # Background scoring jobs (persisted in the scoring_jobs collection)
+    SCORING_WORKERS: int = int(os.getenv("SCORING_WORKERS", "2"))
+    SCORING_JOB_LEASE_SECONDS: int = int(os.getenv("SCORING_JOB_LEASE_SECONDS", "120"))
+    SCORING_JOB_MAX_ATTEMPTS: int = int(os.getenv("SCORING_JOB_MAX_ATTEMPTS", "3"))
+    SCORING_QUEUE_POLL_SECONDS: int = int(os.getenv("SCORING_QUEUE_POLL_SECONDS", "30"))
+    # Memoized scoring / extraction results keyed by normalized content hash
+    MEMO_CACHE_ENABLED: bool = os.getenv("MEMO_CACHE_ENABLED", "true").lower() == "true"
+    MEMO_CACHE_MAX_ENTRIES: int = int(os.getenv("MEMO_CACHE_MAX_ENTRIES", "10000"))
+    # Shared tier in the memo_cache collection, so workers reuse each other's results
+    MEMO_CACHE_MONGO_ENABLED: bool = os.getenv("MEMO_CACHE_MONGO_ENABLED", "false").lower() == "true"
+    MEMO_CACHE_MONGO_TTL_DAYS: int = int(os.getenv("MEMO_CACHE_MONGO_TTL_DAYS", "30"))
+    # Run one inference per heavy component at start-up so the first interview is not the cold one
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    # Seconds between MongoDB pings while the database is unreachable at start-up
+    READY_MONGO_RETRY_SECONDS: float = float(os.getenv("READY_MONGO_RETRY_SECONDS", "5"))
+    # Where interview sessions live: memory (single worker only), mongo or redis
+    SESSION_BACKEND: str = os.getenv("SESSION_BACKEND", "memory")
+    SESSION_REDIS_URL: str = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")
+    SESSION_KEY_PREFIX: str = os.getenv("SESSION_KEY_PREFIX", "talentscout:session:")
+    # Idle timeout for every backend; the LRU cap and sweep apply to the memory backend
+    SESSION_TTL_SECONDS: int = int(os.getenv("SESSION_TTL_SECONDS", "7200"))
+    SESSION_MAX_ENTRIES: int = int(os.getenv("SESSION_MAX_ENTRIES", "10000"))
+    SESSION_SWEEP_SECONDS: int = int(os.getenv("SESSION_SWEEP_SECONDS", "60"))
+    # Candidate export: documents per cursor batch, and CSV rows encoded per streamed chunk
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    EXPORT_CHUNK_ROWS: int = int(os.getenv("EXPORT_CHUNK_ROWS", "200"))
+    # Rows per Parquet row group (each one is encoded and sent as it fills)
+    EXPORT_PARQUET_ROW_GROUP_ROWS: int = int(os.getenv("EXPORT_PARQUET_ROW_GROUP_ROWS", "10000"))
+    # Rendered exports kept per worker for repeat downloads of an unchanged collection
+    EXPORT_SNAPSHOT_CACHE_BYTES: int = int(os.getenv("EXPORT_SNAPSHOT_CACHE_BYTES", str(64 * 2**20)))
+    # The since-cursor handed out stops this far in the past, so writes still in flight are not skipped
+    EXPORT_CURSOR_SETTLE_SECONDS: float = float(os.getenv("EXPORT_CURSOR_SETTLE_SECONDS", "5"))
+    # Backend used for completions: groq, ollama, gguf, gguf_pool, router or fake
+    LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "groq")
+    # Backends the router chooses between (LLM_PROVIDER=router), in preference order
+    LLM_ROUTER_PROVIDERS: str = os.getenv("LLM_ROUTER_PROVIDERS", "groq,ollama,gguf")
+    LLM_ROUTER_TIMEOUT_SECONDS: float = float(os.getenv("LLM_ROUTER_TIMEOUT_SECONDS", "20"))
+    LLM_ROUTER_EWMA_ALPHA: float = float(os.getenv("LLM_ROUTER_EWMA_ALPHA", "0.2"))
+    # Fire a second request for live turns once the primary exceeds its p95 latency
+    LLM_ROUTER_HEDGE: bool = os.getenv("LLM_ROUTER_HEDGE", "true").lower() == "true"
+    LLM_ROUTER_HEDGE_MIN_DELAY_MS: int = int(os.getenv("LLM_ROUTER_HEDGE_MIN_DELAY_MS", "300"))
+    # Circuit breaker: open when the error rate over the window crosses the threshold
+    LLM_ROUTER_BREAKER_WINDOW: int = int(os.getenv("LLM_ROUTER_BREAKER_WINDOW", "20"))
+    LLM_ROUTER_BREAKER_MIN_CALLS: int = int(os.getenv("LLM_ROUTER_BREAKER_MIN_CALLS", "5"))
+    LLM_ROUTER_BREAKER_ERROR_RATE: float = float(os.getenv("LLM_ROUTER_BREAKER_ERROR_RATE", "0.5"))
+    LLM_ROUTER_BREAKER_COOLDOWN_SECONDS: float = float(os.getenv("LLM_ROUTER_BREAKER_COOLDOWN_SECONDS", "30"))
+    # Max pooled HTTP connections to the Ollama server
+    OLLAMA_MAX_CONNECTIONS: int = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "20"))
+    # Max requests running or waiting on the local GGUF model; more are refused at once
+    GGUF_MAX_PENDING: int = int(os.getenv("GGUF_MAX_PENDING", "32"))
+    # Evaluated system-prefix states kept for the GGUF backend (0 disables)
+    GGUF_PREFIX_CACHE_ENTRIES: int = int(os.getenv("GGUF_PREFIX_CACHE_ENTRIES", "8"))
+    # Optional directory for the on-disk prefix state tier
+    GGUF_PREFIX_CACHE_DIR: str = os.getenv("GGUF_PREFIX_CACHE_DIR", "")
+    # Multi-process GGUF worker pool (LLM_PROVIDER=gguf_pool)
+    GGUF_POOL_WORKERS: int = int(os.getenv("GGUF_POOL_WORKERS", "2"))
+    GGUF_POOL_THREADS_PER_WORKER: int = int(os.getenv("GGUF_POOL_THREADS_PER_WORKER", "2"))
+    GGUF_POOL_QUEUE_DEPTH: int = int(os.getenv("GGUF_POOL_QUEUE_DEPTH", "64"))
+    GGUF_POOL_TIMEOUT_SECONDS: float = float(os.getenv("GGUF_POOL_TIMEOUT_SECONDS", "60"))
+    GGUF_POOL_BATCH_SIZE: int = int(os.getenv("GGUF_POOL_BATCH_SIZE", "4"))
+    GGUF_POOL_BATCH_MAX_PROMPT_CHARS: int = int(os.getenv("GGUF_POOL_BATCH_MAX_PROMPT_CHARS", "600"))
+    # JSON overrides for generation profiles, e.g. {"question": {"max_tokens": 200}}
+    GENERATION_PROFILE_OVERRIDES: str = os.getenv("GENERATION_PROFILE_OVERRIDES", "")
+    # Rule-based extraction below this confidence falls back to the LLM
+    FAST_EXTRACTION_MIN_CONFIDENCE: float = float(os.getenv("FAST_EXTRACTION_MIN_CONFIDENCE", "0.8"))
+    # Pre-generated phrasings for the constant "ask" prompts
+    PHRASING_CACHE_ENABLED: bool = os.getenv("PHRASING_CACHE_ENABLED", "true").lower() == "true"
+    PHRASING_CACHE_VARIANTS: int = int(os.getenv("PHRASING_CACHE_VARIANTS", "5"))
+    PHRASING_CACHE_TTL_SECONDS: int = int(os.getenv("PHRASING_CACHE_TTL_SECONDS", "86400"))
+    PHRASING_CACHE_MODE: str = os.getenv("PHRASING_CACHE_MODE", "round_robin")  # or "random"
+    PHRASING_CACHE_PATH: str = os.getenv("PHRASING_CACHE_PATH", ".cache/phrasing_cache.json")
+    # Extract a field and phrase the next question in one JSON completion
+    STRUCTURED_TURN_ENABLED: bool = os.getenv("STRUCTURED_TURN_ENABLED", "true").lower() == "true"
+    # Per-skill technical question bank
+    QUESTION_BANK_ENABLED: bool = os.getenv("QUESTION_BANK_ENABLED", "true").lower() == "true"
+    QUESTION_BANK_LRU_SKILLS: int = int(os.getenv("QUESTION_BANK_LRU_SKILLS", "256"))
+    QUESTION_BANK_LOW_WATERMARK: int = int(os.getenv("QUESTION_BANK_LOW_WATERMARK", "5"))
+    QUESTION_BANK_TARGET_SIZE: int = int(os.getenv("QUESTION_BANK_TARGET_SIZE", "20"))
+    QUESTION_BANK_PREWARM_SKILLS: str = os.getenv(
+        "QUESTION_BANK_PREWARM_SKILLS", "Python,JavaScript,Java,SQL,React,Node.js,C++,Docker"
+    )
+    QUESTION_BANK_PREWARM_TOP_N: int = int(os.getenv("QUESTION_BANK_PREWARM_TOP_N", "10"))
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""Start-up state of the heavy components, for ``/ready``.
+
+Importing the app no longer loads spaCy or model weights; the lifespan in
+``main.py`` loads and warms them in parallel after the server is already
+accepting connections. Each component's progress is tracked here so ``/ready``
+can tell a load balancer when the instance is actually able to serve
+interviews, while ``/health`` keeps answering as a plain liveness probe.
+"""
+
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from .metrics import metrics
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+# Loaded, but the warmup failed; requests are served with the fallback behaviour
+DEGRADED = "degraded"
+FAILED = "failed"
+
+
+class Component:
+    def __init__(self, name: str, required: bool = True):
+        self.name = name
+        # Optional components are reported but never hold back readiness
+        self.required = required
+        self.status = PENDING
+        self.load_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "status": self.status,
+            "required": self.required,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "error": self.error,
+        }
+
+
+class Readiness:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.components: Dict[str, Component] = {}
+
+    def register(self, name: str, required: bool = True) -> Component:
+        self.components[name] = Component(name, required)
+        return self.components[name]
+
+    async def load(self, name: str, loader: Callable[[], Awaitable[Optional[str]]]) -> None:
+        """Run ``loader`` for a registered component, recording its state and duration.
+
+        The loader may return an error message to mark the component degraded
+        rather than failed (it is usable, just not at full strength).
+        """
+        component = self.components[name]
+        component.status = LOADING
+        started = time.perf_counter()
+        try:
+            problem = await loader()
+            component.status = DEGRADED if problem else READY
+            component.error = problem
+        except Exception as e:
+            logging.error(f"Start-up of '{name}' failed: {e}")
+            component.status = FAILED
+            component.error = str(e)
+        component.load_seconds = time.perf_counter() - started
+        metrics.observe("startup_load", component.load_seconds, component=name)
+
+    @property
+    def ready(self) -> bool:
+        return all(
+            c.status in (READY, DEGRADED) for c in self.components.values() if c.required
+        )
+
+    def report(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "uptime_seconds": round(time.perf_counter() - self.started_at, 3),
+            "components": {name: c.to_dict() for name, c in self.components.items()},
+        }
+
+
+readiness = Readiness()
@@ -1,12 +1,117 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from .config import settings
-from .mongodb import get_mongo_db
+from .lifecycle import readiness
+from .metrics import metrics
+from .services.extraction_service import llm_call_rates
+from .services.structured_turn import fallback_rate
+from .services.llm_router import LLMRouter
+from .services.llm_provider import Priority, current_priority, is_unavailable
+from .services import memo_cache
+from .services.session_store import process_rss_bytes
+from .mongodb import get_memo_cache_collection
+from .mongodb import close_async_client
 from .routes import chat, export, candidate
 
- # MongoDB does not require table creation
+# Short technical answer scored once at start-up to warm the spaCy pipeline
+WARMUP_ANSWER = "I would add an index on the email field and cache the expensive query results."
 
-app = FastAPI(title="TalentScout API")
+
+async def load_mongo() -> None:
+    # Retry until reachable: the database may come up after the API does
+    while True:
+        try:
+            await chat.candidates.ping()
+            break
+        except Exception as e:
+            readiness.components["mongo"].error = str(e)
+            await asyncio.sleep(settings.READY_MONGO_RETRY_SECONDS)
+    # Idempotent; the unique email index is what makes the candidate upserts race-free
+    await chat.candidates.ensure_indexes()
+
+
+async def load_scorer() -> None:
+    await asyncio.to_thread(chat.scorer.load)
+    if settings.WARMUP_ENABLED:
+        await asyncio.to_thread(chat.scorer.score_answer, WARMUP_ANSWER)
+
+
+async def load_llm() -> Optional[str]:
+    current_priority.set(Priority.BACKGROUND)
+    # Local weights are loaded off the event loop even when the warmup is disabled
+    load = getattr(chat.llama2, "load", None)
+    if callable(load):
+        await asyncio.to_thread(load)
+    if not settings.WARMUP_ENABLED:
+        return None
+    reply = await chat.llama2.generate_response("Reply with OK.", profile="extraction")
+    if is_unavailable(reply):
+        return f"warmup failed: {reply}"
+    return None
+
+
+async def start_background_caches() -> None:
+    if settings.MEMO_CACHE_ENABLED and settings.MEMO_CACHE_MONGO_ENABLED:
+        await memo_cache.ensure_indexes(get_memo_cache_collection, settings.MEMO_CACHE_MONGO_TTL_DAYS)
+        for memo in [chat.scoring_memo, *chat.extraction_memos.values()]:
+            await memo.purge_stale()
+    await chat.scoring_queue.ensure_indexes()
+    chat.scoring_queue.start()
+    ensure_session_indexes = getattr(chat.sessions, "ensure_indexes", None)
+    if callable(ensure_session_indexes):
+        await ensure_session_indexes()
+    if settings.PHRASING_CACHE_ENABLED:
+        chat.phrasing.start()
+    if settings.QUESTION_BANK_ENABLED:
+        await chat.question_bank.ensure_indexes()
+        chat.question_bank.start()
+        await chat.question_bank.prewarm(
+            settings.QUESTION_BANK_PREWARM_SKILLS.split(","),
+            top_n=settings.QUESTION_BANK_PREWARM_TOP_N,
+        )
+
+
+async def load_models() -> None:
+    await asyncio.gather(readiness.load("scorer", load_scorer), readiness.load("llm", load_llm))
+    # Prewarming generates through the (now warm) LLM; not needed to serve a turn
+    await readiness.load("caches", start_background_caches)
+
+
+async def warm_up() -> None:
+    """Load the heavy components in parallel, then start the caches that use them."""
+    # The caches tolerate an unreachable database, so they do not wait for it
+    await asyncio.gather(readiness.load("mongo", load_mongo), load_models())
+    logging.info(f"Start-up finished: {readiness.report()}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    for name in ("mongo", "scorer", "llm"):
+        readiness.register(name)
+    readiness.register("caches", required=False)
+    chat.sessions.start()
+    # Loading runs behind the scenes so /health answers immediately and /ready reports progress
+    loader = asyncio.create_task(warm_up())
+    yield
+    loader.cancel()
+    try:
+        await loader
+    except asyncio.CancelledError:
+        pass
+    await chat.phrasing.stop()
+    await chat.question_bank.stop()
+    await chat.scoring_queue.stop()
+    await chat.sessions.stop()
+    await chat.llama2.aclose()
+    close_async_client()
+
+
+app = FastAPI(title="TalentScout API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,6 +119,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Read by dashboards for conditional and incremental exports
+    expose_headers=["ETag", "Last-Modified", "X-Export-Cursor"],
 )
 
 # Include routers
@@ -25,6 +132,24 @@ app.include_router(candidate.router, prefix="/api", tags=["candidate"])
 async def root():
     return {"message": "TalentScout API is running"}
 
+@app.get("/metrics")
+async def get_metrics():
+    metrics.set_gauge("process_rss_bytes", process_rss_bytes())
+    snapshot = metrics.snapshot()
+    snapshot["rates"] = {
+        "extraction_llm_call_rate": llm_call_rates(),
+        "structured_turn_fallback_rate": round(fallback_rate(), 4),
+        "memo_cache_hit_rate": memo_cache.hit_rates(),
+    }
+    if isinstance(chat.llama2, LLMRouter):
+        snapshot["llm_router"] = chat.llama2.status()
+    return snapshot
+
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/ready")
+async def ready():
+    report = readiness.report()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
\ No newline at end of file
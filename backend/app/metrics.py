@@ -0,0 +1,89 @@
+"""Lightweight in-process metrics registry.
+
+Counters and latency summaries keyed by metric name plus optional labels.
+Exposed as JSON from ``/metrics`` in ``main.py``; intentionally dependency-free
+so any service or route can record without extra setup.
+"""
+
+import threading
+from typing import Dict, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _fmt(name: str, key: LabelKey) -> str:
+    if not key:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in key) + "}"
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._timings: Dict[str, Dict[LabelKey, Dict[str, float]]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+
+    def incr(self, name: str, value: float = 1, **labels) -> None:
+        key = _key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._gauges.setdefault(name, {})[_key(labels)] = value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        key = _key(labels)
+        with self._lock:
+            series = self._timings.setdefault(name, {})
+            stat = series.setdefault(key, {"count": 0, "total": 0.0, "max": 0.0})
+            stat["count"] += 1
+            stat["total"] += seconds
+            stat["max"] = max(stat["max"], seconds)
+
+    def get(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_key(labels), 0)
+
+    def total(self, name: str) -> float:
+        """Sum of a counter across all label combinations."""
+        with self._lock:
+            return sum(self._counters.get(name, {}).values())
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            counters = {
+                _fmt(name, key): value
+                for name, series in self._counters.items()
+                for key, value in series.items()
+            }
+            gauges = {
+                _fmt(name, key): value
+                for name, series in self._gauges.items()
+                for key, value in series.items()
+            }
+            timings = {
+                _fmt(name, key): {
+                    "count": stat["count"],
+                    "avg_ms": round(stat["total"] / stat["count"] * 1000, 3) if stat["count"] else 0.0,
+                    "max_ms": round(stat["max"] * 1000, 3),
+                }
+                for name, series in self._timings.items()
+                for key, stat in series.items()
+            }
+        return {"counters": counters, "gauges": gauges, "timings": timings}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+            self._gauges.clear()
+
+
+metrics = Metrics()
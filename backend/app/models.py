@@ -14,6 +14,7 @@ class Candidate(BaseModel):
     tech_skills: Optional[List[str]] = None
     qa_responses: Optional[List[Dict]] = None
     english_proficiency_score: Optional[float] = 0.0
+    score_status: Optional[str] = "scored"  # "pending" until the background scoring job fills the score
     status: Optional[str] = "active"  # Can be: "active", "rejected", "completed"
     rejection_reason: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
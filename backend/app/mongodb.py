@@ -1,12 +1,73 @@
+from typing import Dict, Optional
+from motor.motor_asyncio import AsyncIOMotorClient #type: ignore
 from pymongo import MongoClient #type: ignore
 from .config import settings
 
-client = MongoClient(settings.DATABASE_URL)
+
+def client_options() -> Dict:
+    """Pool, timeout and write concern settings shared by the sync and async clients."""
+    w = settings.MONGO_WRITE_CONCERN_W
+    return {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGO_SOCKET_TIMEOUT_MS,
+        "w": int(w) if w.isdigit() else w,
+        "journal": settings.MONGO_WRITE_CONCERN_J,
+        "wTimeoutMS": settings.MONGO_WRITE_TIMEOUT_MS,
+    }
+
+
+# Used from worker threads (background services wrap their calls in asyncio.to_thread)
+client = MongoClient(settings.DATABASE_URL, **client_options())
 db = client['talent_hiring']
 candidates_collection = db['candidates']
+question_bank_collection = db['question_bank']
+scoring_jobs_collection = db['scoring_jobs']
+memo_cache_collection = db['memo_cache']
+change_counters_collection = db['change_counters']
+
+# Used by request handlers; created on first use so it binds to the running event loop
+async_client: Optional[AsyncIOMotorClient] = None
 
 def get_mongo_db():
     return db
 
+def get_async_mongo_db():
+    global async_client
+    if async_client is None:
+        async_client = AsyncIOMotorClient(settings.DATABASE_URL, **client_options())
+    return async_client['talent_hiring']
+
+def close_async_client():
+    global async_client
+    if async_client is not None:
+        async_client.close()
+        async_client = None
+
 def get_candidates_collection():
-    return candidates_collection
\ No newline at end of file
+    return candidates_collection
+
+def get_async_candidates_collection():
+    return get_async_mongo_db()['candidates']
+
+def get_change_counters_collection():
+    return change_counters_collection
+
+def get_async_change_counters_collection():
+    return get_async_mongo_db()['change_counters']
+
+def get_question_bank_collection():
+    return question_bank_collection
+
+def get_scoring_jobs_collection():
+    return scoring_jobs_collection
+
+def get_memo_cache_collection():
+    return memo_cache_collection
+
+def get_async_sessions_collection():
+    return get_async_mongo_db()['sessions']
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException
 from datetime import datetime
 import logging
-from ..mongodb import get_candidates_collection
+import uuid
 from ..schemas import RejectCandidateRequest, RejectCandidateResponse
+from .chat import candidates, end_session
 
 router = APIRouter()
 
@@ -13,43 +14,31 @@ async def reject_candidate(payload: RejectCandidateRequest):
     This is called when a candidate exits fullscreen more than the allowed number of times.
     """
     try:
-        candidates_collection = get_candidates_collection()
-        
-        # Find candidate by email
-        candidate = candidates_collection.find_one({"email": payload.email})
-        
-        if not candidate:
-            # If candidate doesn't exist yet in DB, log the rejection attempt
-            logging.warning(f"Attempted to reject non-existent candidate: {payload.email}")
-            # We'll create a minimal rejected candidate record
-            rejection_record = {
-                "email": payload.email,
+        # One upsert on the unique email: updates the candidate, or creates a minimal
+        # rejected record if they have not completed the interview yet
+        now = datetime.utcnow()
+        created = await candidates.upsert_by_email(
+            payload.email,
+            {
                 "status": "rejected",
                 "rejection_reason": payload.reason,
-                "updated_at": datetime.utcnow(),
-                "created_at": datetime.utcnow(),
+                "updated_at": now
+            },
+            on_insert={
+                "id": str(uuid.uuid4()),
                 "name": "Unknown (Rejected during interview)",
+                "created_at": now,
             }
-            candidates_collection.insert_one(rejection_record)
+        )
+
+        if created:
             logging.info(f"Created rejection record for candidate: {payload.email}")
         else:
-            # Update existing candidate
-            update_result = candidates_collection.update_one(
-                {"email": payload.email},
-                {
-                    "$set": {
-                        "status": "rejected",
-                        "rejection_reason": payload.reason,
-                        "updated_at": datetime.utcnow()
-                    }
-                }
-            )
-            
-            if update_result.modified_count == 0:
-                logging.warning(f"No candidate was updated for email: {payload.email}")
-            else:
-                logging.info(f"Successfully marked candidate as rejected: {payload.email}")
+            logging.info(f"Successfully marked candidate as rejected: {payload.email}")
         
+        # The interview is over; drop its in-memory state
+        await end_session(payload.sessionToken or payload.email, "rejected")
+
         return RejectCandidateResponse(
             success=True,
             message="Candidate has been marked as rejected due to malpractice",
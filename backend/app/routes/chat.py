@@ -1,13 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+import asyncio
+import hashlib
+import json
 import logging
-from ..mongodb import get_candidates_collection
-from typing import Dict
+import secrets
+from contextvars import ContextVar
+from functools import partial
+from ..mongodb import (
+    get_async_candidates_collection, get_async_change_counters_collection, get_candidates_collection,
+    get_change_counters_collection, get_memo_cache_collection, get_question_bank_collection,
+    get_scoring_jobs_collection,
+)
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 import re
 import uuid
+from ..metrics import metrics
 from ..models import Candidate
-from ..schemas import SendMessageRequest, SendMessageResponse, CandidateData
-from ..services.groq_service import GroqService
+from ..schemas import SendMessageRequest, SendMessageResponse, TurnRequest, TurnResponse
+from ..services.llm_provider import LLMProvider, answered_by, build_provider, is_unavailable, provider_id
+from ..services.extraction_service import EXTRACTORS, fast_extract
+from ..services.structured_turn import structured_turn
+from ..services.phrasing_cache import PhrasingCache
+from ..services.question_bank import QuestionBank
+from ..config import settings
 from ..services.scoring_service import ScoringService
+from ..services.scoring_queue import ScoringQueue, memo_for
+from ..services.memo_cache import MemoCache, normalize, template_tag
+from ..services.session_store import InterviewSession, answer_key, build_session_store
+from ..services.candidate_repository import CandidateRepository
+from ..services.export_snapshots import ExportSnapshotCache
 from ..models import Candidate
 from ..system_prompt import (
     GREETING_PROMPT, NAME_EXTRACTION_PROMPT, ASK_EMAIL_PROMPT, REPEAT_NAME_PROMPT,
@@ -20,10 +42,235 @@ from ..system_prompt import (
 
 mrouter = APIRouter()
 router = APIRouter()
-llama2 = GroqService()
+llama2: LLMProvider = build_provider(settings.LLM_PROVIDER)
 scorer = ScoringService()
+# Candidate writes here and in candidate.py drop this worker's cached exports
+export_snapshots = ExportSnapshotCache(settings.EXPORT_SNAPSHOT_CACHE_BYTES)
+candidates = CandidateRepository(
+    get_async_candidates_collection,
+    get_async_change_counters_collection,
+    on_change=export_snapshots.invalidate,
+)
+memo_collection = get_memo_cache_collection if settings.MEMO_CACHE_MONGO_ENABLED else None
+scoring_memo = memo_for(scorer, max_entries=settings.MEMO_CACHE_MAX_ENTRIES, collection_getter=memo_collection)
+scoring_queue = ScoringQueue(
+    scorer,
+    get_scoring_jobs_collection,
+    get_candidates_collection,
+    workers=settings.SCORING_WORKERS,
+    lease_seconds=settings.SCORING_JOB_LEASE_SECONDS,
+    max_attempts=settings.SCORING_JOB_MAX_ATTEMPTS,
+    poll_seconds=settings.SCORING_QUEUE_POLL_SECONDS,
+    memo=scoring_memo if settings.MEMO_CACHE_ENABLED else None,
+    counters_getter=get_change_counters_collection,
+    on_candidate_change=export_snapshots.invalidate,
+)
+
+# Per-answer scoring still running in this process, by session id; results go to the session store
+_answer_scoring: Dict[str, Set[asyncio.Future]] = {}
+
+
+def _forget_answer_scoring(session_id: str) -> None:
+    for future in _answer_scoring.pop(session_id, set()):
+        future.cancel()
+
+
+sessions = build_session_store(settings.SESSION_BACKEND, on_evict=_forget_answer_scoring)
+
+# Set for the duration of a streamed turn; receives text shown to the candidate
+_stream_sink: ContextVar[Optional[Callable[[str], Awaitable[None]]]] = ContextVar("stream_sink", default=None)
+
+
+async def emit(text: str) -> None:
+    """Forward candidate-visible text to the SSE stream, if this turn is streamed."""
+    sink = _stream_sink.get()
+    if sink is not None and text:
+        await sink(text)
+
+
+async def visible_completion(prompt: str, profile: str) -> str:
+    """Completion shown to the candidate; tokens are forwarded as produced when streaming."""
+    sink = _stream_sink.get()
+    if sink is None:
+        return await llama2.generate_response(prompt, profile=profile)
+    parts = []
+    async for token in llama2.stream_response(prompt, profile=profile):
+        parts.append(token)
+        await sink(token)
+    return "".join(parts).strip()
+
+# Prompts that take no input; their completions are pre-generated
+CONSTANT_PROMPTS = [
+    GREETING_PROMPT, ASK_EMAIL_PROMPT, REPEAT_NAME_PROMPT, RETRY_EMAIL_PROMPT,
+    ASK_PHONE_PROMPT, RETRY_PHONE_PROMPT, ASK_EXPERIENCE_PROMPT, ASK_POSITION_PROMPT,
+    ASK_LOCATION_PROMPT, ASK_TECH_STACK_PROMPT,
+]
+
+
+async def _generate_phrasing(prompt: str) -> str:
+    return clean_llm_output(await visible_completion(prompt, "ask"))
+
+
+phrasing = PhrasingCache(
+    _generate_phrasing,
+    CONSTANT_PROMPTS,
+    variants=settings.PHRASING_CACHE_VARIANTS,
+    ttl_seconds=settings.PHRASING_CACHE_TTL_SECONDS,
+    path=settings.PHRASING_CACHE_PATH,
+    mode=settings.PHRASING_CACHE_MODE,
+)
+
+
+async def _generate_question(skill: str) -> str:
+    tech_question_prompt = TECHNICAL_QUESTION_PROMPT.format(skill=skill)
+    question = clean_llm_output(await visible_completion(tech_question_prompt, "question"))
+    return clean_technical_question(question)
+
+
+question_bank = QuestionBank(
+    _generate_question,
+    get_question_bank_collection,
+    lru_size=settings.QUESTION_BANK_LRU_SKILLS,
+    low_watermark=settings.QUESTION_BANK_LOW_WATERMARK,
+    target_size=settings.QUESTION_BANK_TARGET_SIZE,
+)
+
+
+async def next_technical_question(session: InterviewSession, skill: str) -> str:
+    """Draw an unseen banked question for ``skill``, generating one live if the bank is empty."""
+    asked = session.asked_questions
+    question = None
+    if settings.QUESTION_BANK_ENABLED:
+        question = await question_bank.draw(skill, exclude=asked)
+        await emit(question)
+    if not question:
+        question = await _generate_question(skill)
+        if settings.QUESTION_BANK_ENABLED:
+            await question_bank.add(skill, question)
+    asked.append(question)
+    return question
+
+
+# LLM extraction prompts; each gets its own memo namespace so editing one
+# template only invalidates that prompt's cached results
+EXTRACTION_PROMPTS = {
+    "name": NAME_EXTRACTION_PROMPT,
+    "email": EMAIL_EXTRACTION_PROMPT,
+    "phone": PHONE_EXTRACTION_PROMPT,
+    "experience": EXPERIENCE_EXTRACTION_PROMPT,
+    "position": POSITION_EXTRACTION_PROMPT,
+    "location": LOCATION_EXTRACTION_PROMPT,
+    "skills": TECH_STACK_EXTRACTION_PROMPT,
+}
+
+
+def _llm_model() -> str:
+    # For the router this includes the provider it would call, so each backend gets its own entries
+    return provider_id(llama2)
 
-sessions: Dict[str, Dict] = {}
+
+def _answered_by_keyed_model() -> bool:
+    """False when the router's reply came from a provider other than the one in the memo key (failover, hedge)."""
+    answered = answered_by.get()
+    return answered is None or answered == getattr(llama2, "model", None)
+
+
+extraction_memos = {
+    field: MemoCache(
+        f"extract:{field}",
+        template_tag(template),
+        model=_llm_model,
+        max_entries=settings.MEMO_CACHE_MAX_ENTRIES,
+        collection_getter=memo_collection,
+    )
+    for field, template in EXTRACTION_PROMPTS.items()
+}
+
+
+async def extract_completion(field: str, user_message: str, profile: str = "extraction") -> str:
+    """Raw LLM extraction for ``field``, memoized on the candidate's message.
+
+    The prompt is built from the normalized message so a cached answer is
+    exactly what any message with the same key would have produced.
+    """
+    prompt = EXTRACTION_PROMPTS[field].format(user_message=normalize(user_message))
+
+    def generate() -> Awaitable[str]:
+        return llama2.generate_response(prompt, profile=profile)
+
+    if not settings.MEMO_CACHE_ENABLED:
+        return await generate()
+    return await extraction_memos[field].get_or_compute(
+        user_message, generate, cacheable=lambda text: not is_unavailable(text) and _answered_by_keyed_model()
+    )
+
+
+def score_answer_in_background(session_id: str, answer: str) -> None:
+    """Score a technical answer between turns and record it in the session store."""
+
+    async def score() -> None:
+        answer_metrics = await scoring_queue.score_answer(answer)
+        await sessions.record_answer(
+            session_id, answer_key(answer), answer_metrics.to_dict(), answer_metrics.score
+        )
+
+    task = asyncio.ensure_future(score())
+    pending = _answer_scoring.setdefault(session_id, set())
+    pending.add(task)
+
+    def finished(done: asyncio.Future) -> None:
+        pending.discard(done)
+        # The interview may finish on another worker; do not keep an empty entry around
+        if not pending and _answer_scoring.get(session_id) is pending:
+            del _answer_scoring[session_id]
+        # Cancelled when the interview ended first; nothing to report
+        if not done.cancelled() and done.exception() is not None:
+            logging.error(f"Answer scoring failed: {done.exception()}")
+
+    task.add_done_callback(finished)
+
+
+async def collect_answer_scores(session_id: str, answers: List[str]) -> Tuple[Optional[float], Dict[str, Dict]]:
+    """Aggregate score and per-answer metrics (by ``answer_key``); the score is None on a gap.
+
+    Usually only the final answer is still in flight. Answers whose scoring
+    was lost (a restart, an evicted session) leave a gap, and the caller
+    falls back to a background scoring job.
+    """
+    pending = _answer_scoring.pop(session_id, set())
+    if pending:
+        await asyncio.wait(pending, timeout=5)
+    # Reload: answers may have been scored since this turn began, possibly by other workers
+    stored = await sessions.load(session_id)
+    if stored is None:
+        return None, {}
+    count = stored.scored_answers
+    if count != len(answers) or any(answer_key(a) not in stored.answer_metrics for a in answers):
+        return None, stored.answer_metrics
+    return round(stored.score_total / count, 2), stored.answer_metrics
+
+
+async def end_session(session_id: str, reason: str) -> None:
+    """Release a finished interview's state (``completed`` or ``rejected``)."""
+    await sessions.discard(session_id, reason)
+    _forget_answer_scoring(session_id)
+
+
+async def ask(prompt: str, prepared: Optional[str] = None) -> str:
+    """Return the bot's wording for a constant prompt.
+
+    Uses ``prepared`` when a structured turn already phrased it, then the
+    phrasing pool, and only then a live completion.
+    """
+    if prepared:
+        await emit(prepared)
+        return prepared
+    if settings.PHRASING_CACHE_ENABLED:
+        cached = phrasing.get(prompt)
+        if cached:
+            await emit(cached)
+            return cached
+    return await _generate_phrasing(prompt)
 
 def clean_llm_output(text, value_type="text"):
     """Remove extra sentences, instructions, or context from LLM output"""
@@ -196,29 +443,210 @@ def order_skills_by_user_input(user_message: str, skills):
     return ordered
 
 
+async def llm_extract_name(user_message: str) -> str:
+    """LLM extraction path for the name stage, used when the rule-based parse is unsure."""
+    return normalize_name(await extract_completion("name", user_message))
+
+
+def normalize_name(name_raw: str) -> str:
+    """Strip model commentary, self-introductions and punctuation from an extracted name"""
+    name = clean_llm_output(name_raw)
+    name = re.sub(r"\(.*?\)", "", name)
+    commentary_phrases = [
+        "Assuming the candidate's full name is", "Assuming", 
+        "It seems", "Probably", "Likely", "The candidate's name is"
+    ]
+    for phrase in commentary_phrases:
+        if phrase.lower() in name.lower():
+            name = name.split(phrase)[-1].strip()
+    
+    name = name.strip().split("\n")[0]
+    # Remove common prefixes like "I'm", "I am", "My name is"
+    name = re.sub(r"^(i\s*am|i'm|im|my name is|this is|name is|the name is)\s+",
+                  "", name, flags=re.IGNORECASE)
+    name = name.replace(".", "").replace(",", "").strip()
+    return name
+
+
+async def llm_extract_email(user_message: str) -> str:
+    email_raw = await extract_completion("email", user_message)
+    
+    match = re.search(r"[\w\.-]+@[\w\.-]+", email_raw)
+    email = match.group(0) if match else ""
+    
+    if not email or email.startswith('_') or email.count('@') != 1 or email.startswith('.'):
+        match = re.search(r"[\w\.-]+@[\w\.-]+", user_message)
+        email = match.group(0) if match else ""
+    return email
+
+
+async def llm_extract_phone(user_message: str) -> str:
+    return clean_llm_output(await extract_completion("phone", user_message), value_type="phone")
+
+
+async def llm_extract_experience(user_message: str) -> int:
+    years_raw = await extract_completion("experience", user_message)
+    return extract_years_from_message(user_message, years_raw)
+
+
+async def llm_extract_position(user_message: str) -> str:
+    return clean_llm_output(await extract_completion("position", user_message))
+
+
+async def llm_extract_location(user_message: str) -> str:
+    location_raw = await extract_completion("location", user_message)
+    return clean_llm_output(location_raw, value_type="location")
+
+
+# Cleanup the extraction completions get, applied to structured-turn values too
+# so a field is stored the same way whichever completion produced it
+LLM_VALUE_NORMALIZERS: Dict[str, Callable[[str], Any]] = {
+    "name": normalize_name,
+    "position": clean_llm_output,
+    "location": partial(clean_llm_output, value_type="location"),
+}
+
+
+def clean_location(location: str) -> str:
+    """Strip model commentary and punctuation from an extracted location"""
+    commentary_phrases = [
+        "The candidate's location is", "Location is", 
+        "It seems", "Probably", "Likely", "Assuming"
+    ]
+    for phrase in commentary_phrases:
+        if phrase.lower() in location.lower():
+            location = location.split(phrase)[-1].strip()
+    
+    return location.replace('"', '').replace("'", '').replace('.', '').replace(',', '').strip()
+
+
+async def extract_field(field: str, user_message: str, llm_extract, next_prompt: str) -> Tuple[Any, Optional[str]]:
+    """Resolve an intake field, returning (value, next_message or None).
+
+    Tries the rule-based fast path first. Otherwise, when the next question
+    is not already in the phrasing pool, a single structured completion
+    extracts the value and phrases the next question together; if that reply
+    fails validation we fall back to the separate extraction call.
+    """
+    if field in EXTRACTORS:
+        fast = fast_extract(field, user_message)
+        if fast.confident:
+            return fast.value, None
+    next_is_cached = settings.PHRASING_CACHE_ENABLED and phrasing.has(next_prompt)
+    if settings.STRUCTURED_TURN_ENABLED and not next_is_cached:
+        generate = partial(llama2.generate_response, profile="structured")
+        result = await structured_turn(generate, field, user_message, next_prompt)
+        if result is not None:
+            value, next_message = result
+            normalize = LLM_VALUE_NORMALIZERS.get(field)
+            return (normalize(value) if normalize else value), next_message
+    return await llm_extract(user_message), None
+
+
 @router.post("/conversation/message", response_model=SendMessageResponse)
 async def conversation_message(payload: SendMessageRequest):
     """
     Main conversation endpoint for the AI interview chatbot.
     Handles all stages of the interview process.
+
+    Compatibility mode: the client resends the whole candidateInfo and its
+    own stage every turn. New clients should use /conversation/turn.
     """
-    user_message = payload.userMessage.strip()
     candidate_info = payload.candidateInfo
-    current_stage = payload.currentStage
-    current_tech_question_index = payload.currentTechQuestionIndex
-
-    session_id = candidate_info.get("email", "default_session")
-    if session_id not in sessions:
-        sessions[session_id] = {
-            "stage": current_stage,
-            "data": candidate_info,
-            "qa_pairs": [],
-            "question_count": 0,
-            "skill_index": -1,  # server-authoritative pointer to current skill index
-        }
-    session = sessions[session_id]
-    session["stage"] = current_stage
-    session["data"] = candidate_info
+    # Nothing needs keeping server-side until the email identifies the interview
+    session_id = candidate_info.get("email") or None
+    session = (await sessions.load(session_id) if session_id else None) or InterviewSession(
+        session_id or "", payload.currentStage
+    )
+    return await run_turn(
+        session,
+        payload.userMessage,
+        candidate_info,
+        payload.currentStage,
+        payload.currentTechQuestionIndex,
+        persist=session_id is not None,
+    )
+
+
+def candidate_delta(before: Dict, after: Dict) -> Tuple[Dict, Dict]:
+    """Fields of ``after`` that differ from ``before``, and items appended to list fields."""
+    changes: Dict[str, Any] = {}
+    appended: Dict[str, List[Any]] = {}
+    for key, value in after.items():
+        old = before.get(key)
+        if key in before and old == value:
+            continue
+        if isinstance(old, list) and isinstance(value, list) and value[:len(old)] == old:
+            appended[key] = value[len(old):]
+        else:
+            changes[key] = value
+    return changes, appended
+
+
+@router.post("/conversation/turn", response_model=TurnResponse)
+async def conversation_turn(payload: TurnRequest):
+    """
+    Server-authoritative conversation endpoint.
+
+    The client sends its session token (none on the first turn) and the new
+    message; the stage, candidate data and question pointers live in the
+    session store. The reply carries only the candidate fields this turn
+    changed and the session's new version, which the client echoes back so
+    a stale or repeated submission is refused with 409.
+    """
+    if payload.sessionToken:
+        session = await sessions.load(payload.sessionToken)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired interview session.")
+        if payload.version is not None and payload.version != session.version:
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "This interview has moved on; refresh its state.", "version": session.version},
+            )
+    else:
+        session = InterviewSession(secrets.token_urlsafe(16))
+    before = {k: list(v) if isinstance(v, list) else v for k, v in session.candidate.items()}
+    response = await run_turn(
+        session,
+        payload.userMessage,
+        session.candidate,
+        session.stage,
+        max(session.skill_index, 0),
+        authoritative=True,
+    )
+    changes, appended = candidate_delta(before, response.updatedCandidateInfo)
+    return TurnResponse(
+        sessionToken=session.session_id,
+        version=session.version,
+        message=response.message,
+        stage=response.nextStage,
+        changes=changes,
+        appended=appended,
+        technicalQuestion=response.technicalQuestion,
+        isComplete=response.isComplete,
+    )
+
+
+async def run_turn(
+    session: InterviewSession,
+    user_message: str,
+    candidate_info: Dict,
+    current_stage: str,
+    current_tech_question_index: int,
+    persist: bool = True,
+    authoritative: bool = False,
+) -> SendMessageResponse:
+    """Advance the interview by one candidate message and save the session.
+
+    ``authoritative`` keeps the updated candidate fields in the session (for
+    /conversation/turn); otherwise the client holds them. Sessions without
+    ``persist`` (intake turns before the email is known) are not saved.
+    """
+    user_message = user_message.strip()
+    session_id = session.session_id
+    session.stage = current_stage
+    # Scored only once this turn's state is saved, so a refused duplicate is not counted
+    answer_to_score = None
 
     next_stage = current_stage
     technical_question = ""
@@ -228,120 +656,77 @@ async def conversation_message(payload: SendMessageRequest):
 
     # === GREETING STAGE ===
     if current_stage == "greeting":
-        message = clean_llm_output(llama2.generate_response(GREETING_PROMPT))
+        message = await ask(GREETING_PROMPT)
         next_stage = "name"
-        return SendMessageResponse(
-            message=message,
-            nextStage=next_stage,
-            updatedCandidateInfo=updated_candidate_info,
-            technicalQuestion=technical_question,
-            isComplete=is_complete
-        )
 
     # === NAME STAGE ===
     elif current_stage == "name":
-        name_prompt = NAME_EXTRACTION_PROMPT.format(user_message=user_message)
-        name_raw = llama2.generate_response(name_prompt)
-        name = clean_llm_output(name_raw)
-       
-        name = re.sub(r"\(.*?\)", "", name)
-        commentary_phrases = [
-            "Assuming the candidate's full name is", "Assuming", 
-            "It seems", "Probably", "Likely", "The candidate's name is"
-        ]
-        for phrase in commentary_phrases:
-            if phrase.lower() in name.lower():
-                name = name.split(phrase)[-1].strip()
-        
-        name = name.strip().split("\n")[0]
-        # Remove common prefixes like "I'm", "I am", "My name is"
-        name = re.sub(r"^(i\s*am|i'm|im|my name is|this is|name is|the name is)\s+",
-                      "", name, flags=re.IGNORECASE)
-        name = name.replace(".", "").replace(",", "").strip()
-        
+        name, next_message = await extract_field("name", user_message, llm_extract_name, ASK_EMAIL_PROMPT)
+
         if name and name.lower() not in ["", "your name", "full name", "candidate", "talentbot"]:
             updated_candidate_info["fullName"] = name
-            message = clean_llm_output(llama2.generate_response(ASK_EMAIL_PROMPT))
+            message = await ask(ASK_EMAIL_PROMPT, prepared=next_message)
             next_stage = "email"
         else:
-            message = clean_llm_output(llama2.generate_response(REPEAT_NAME_PROMPT))
+            message = await ask(REPEAT_NAME_PROMPT)
             next_stage = "name"
 
     # === EMAIL STAGE ===
     elif current_stage == "email":
-        email_prompt = EMAIL_EXTRACTION_PROMPT.format(user_message=user_message)
-        email_raw = llama2.generate_response(email_prompt)
-        
-        match = re.search(r"[\w\.-]+@[\w\.-]+", email_raw)
-        email = match.group(0) if match else ""
-        
-        if not email or email.startswith('_') or email.count('@') != 1 or email.startswith('.'):
-            match = re.search(r"[\w\.-]+@[\w\.-]+", user_message)
-            email = match.group(0) if match else ""
-        
+        email, next_message = await extract_field("email", user_message, llm_extract_email, ASK_PHONE_PROMPT)
+
         if not email or "@" not in email:
-            message = clean_llm_output(llama2.generate_response(RETRY_EMAIL_PROMPT))
+            message = await ask(RETRY_EMAIL_PROMPT)
             next_stage = "email"
         else:
             updated_candidate_info["email"] = email
-            message = clean_llm_output(llama2.generate_response(ASK_PHONE_PROMPT))
+            message = await ask(ASK_PHONE_PROMPT, prepared=next_message)
             next_stage = "phone"
 
     # === PHONE STAGE ===
     elif current_stage == "phone":
-        phone_prompt = PHONE_EXTRACTION_PROMPT.format(user_message=user_message)
-        phone = clean_llm_output(llama2.generate_response(phone_prompt), value_type="phone")
+        phone, next_message = await extract_field("phone", user_message, llm_extract_phone, ASK_EXPERIENCE_PROMPT)
         
         if not phone or len(phone) < 8:
-            message = clean_llm_output(llama2.generate_response(RETRY_PHONE_PROMPT))
+            message = await ask(RETRY_PHONE_PROMPT)
             next_stage = "phone"
         else:
             updated_candidate_info["phone"] = phone
-            message = clean_llm_output(llama2.generate_response(ASK_EXPERIENCE_PROMPT))
+            message = await ask(ASK_EXPERIENCE_PROMPT, prepared=next_message)
             next_stage = "experience"
 
     # === EXPERIENCE STAGE ===
     elif current_stage == "experience":
-        exp_prompt = EXPERIENCE_EXTRACTION_PROMPT.format(user_message=user_message)
-        years_raw = llama2.generate_response(exp_prompt)
-        years = extract_years_from_message(user_message, years_raw)
+        years, next_message = await extract_field(
+            "experience", user_message, llm_extract_experience, ASK_POSITION_PROMPT
+        )
         
         updated_candidate_info["yearsExperience"] = years
-        message = clean_llm_output(llama2.generate_response(ASK_POSITION_PROMPT))
+        message = await ask(ASK_POSITION_PROMPT, prepared=next_message)
         next_stage = "position"
 
     # === POSITION STAGE ===
     elif current_stage == "position":
-        pos_prompt = POSITION_EXTRACTION_PROMPT.format(user_message=user_message)
-        position = clean_llm_output(llama2.generate_response(pos_prompt))
+        position, next_message = await extract_field(
+            "position", user_message, llm_extract_position, ASK_LOCATION_PROMPT
+        )
         
         updated_candidate_info["desiredPosition"] = position
-        message = clean_llm_output(llama2.generate_response(ASK_LOCATION_PROMPT))
+        message = await ask(ASK_LOCATION_PROMPT, prepared=next_message)
         next_stage = "location"
 
     # === LOCATION STAGE ===
     elif current_stage == "location":
-        loc_prompt = LOCATION_EXTRACTION_PROMPT.format(user_message=user_message)
-        location_raw = llama2.generate_response(loc_prompt)
-        location = clean_llm_output(location_raw, value_type="location")
-        
-        commentary_phrases = [
-            "The candidate's location is", "Location is", 
-            "It seems", "Probably", "Likely", "Assuming"
-        ]
-        for phrase in commentary_phrases:
-            if phrase.lower() in location.lower():
-                location = location.split(phrase)[-1].strip()
-        
-        location = location.replace('"', '').replace("'", '').replace('.', '').replace(',', '').strip()
-        updated_candidate_info["location"] = location
-        message = clean_llm_output(llama2.generate_response(ASK_TECH_STACK_PROMPT))
+        location, next_message = await extract_field(
+            "location", user_message, llm_extract_location, ASK_TECH_STACK_PROMPT
+        )
+        updated_candidate_info["location"] = clean_location(location)
+        message = await ask(ASK_TECH_STACK_PROMPT, prepared=next_message)
         next_stage = "techStack"
 
     # === TECH STACK STAGE ===
     elif current_stage == "techStack":
-        tech_prompt = TECH_STACK_EXTRACTION_PROMPT.format(user_message=user_message)
-        raw_skills = llama2.generate_response(tech_prompt)
+        raw_skills = await extract_completion("skills", user_message, profile="skills")
         tech_skills = extract_skills_from_message(user_message, raw_skills)
         # Ensure ordering respects candidate's original message order
         tech_skills = order_skills_by_user_input(user_message, tech_skills)
@@ -353,23 +738,22 @@ async def conversation_message(payload: SendMessageRequest):
         
         tech_skills_str = ', '.join(tech_skills) if tech_skills else "your skills"
         tech_q_intro_prompt = TECH_QUESTIONS_INTRO_PROMPT.format(tech_skills=tech_skills_str)
-        tech_q_intro = clean_llm_output(llama2.generate_response(tech_q_intro_prompt))
+        tech_q_intro = clean_llm_output(await visible_completion(tech_q_intro_prompt, "intro"))
         
         if tech_skills:
             first_valid_index = get_next_valid_skill_index(tech_skills, 0)
             if first_valid_index is not None:
                 first_skill = tech_skills[first_valid_index]
-                tech_question_prompt = TECHNICAL_QUESTION_PROMPT.format(skill=first_skill)
-                question = clean_llm_output(llama2.generate_response(tech_question_prompt))
-                technical_question = clean_technical_question(question)
+                await emit(f"\n\nQuestion 1 about {first_skill}:\n")
+                technical_question = await next_technical_question(session, first_skill)
                 
                 # Start sequential question numbering (avoid confusion when skipping invalid skills)
-                session["question_count"] = 1
-                session["skill_index"] = first_valid_index
-                session["last_question"] = technical_question  # Store the question for next answer
+                session.question_count = 1
+                session.skill_index = first_valid_index
+                session.last_question = technical_question  # Store the question for next answer
                 message = (
                     f"{tech_q_intro}\n\n"
-                    f"Question {session['question_count']} about {first_skill}:\n{technical_question}"
+                    f"Question {session.question_count} about {first_skill}:\n{technical_question}"
                 )
                 next_stage = "technicalQuestions"
                 current_tech_question_index = first_valid_index
@@ -383,12 +767,12 @@ async def conversation_message(payload: SendMessageRequest):
 
     # === TECHNICAL QUESTIONS STAGE ===
     elif current_stage == "technicalQuestions":
-        if "technicalQA" not in updated_candidate_info:
-            updated_candidate_info["technicalQA"] = []
+        # A new list, so the previous turn's state (or a refused save) is never modified in place
+        updated_candidate_info["technicalQA"] = list(updated_candidate_info.get("technicalQA") or [])
         
         tech_stack = updated_candidate_info.get("techStack", [])
         # Use server-authoritative index if available to avoid client desync
-        idx_pointer = session.get("skill_index")
+        idx_pointer = session.skill_index
         effective_index = (
             idx_pointer if isinstance(idx_pointer, int) and 0 <= idx_pointer < len(tech_stack)
             else current_tech_question_index
@@ -398,7 +782,7 @@ async def conversation_message(payload: SendMessageRequest):
         if effective_index < len(tech_stack):
             current_skill = tech_stack[effective_index]
             answer = user_message.strip()
-            last_question = session.get("last_question", f"Question about {current_skill}")
+            last_question = session.last_question or f"Question about {current_skill}"
             
             if answer:
                 # Append as a proper Q&A pair
@@ -406,22 +790,22 @@ async def conversation_message(payload: SendMessageRequest):
                     "question": last_question,
                     "answer": answer
                 })
+                answer_to_score = answer
         
         next_index = effective_index + 1
         next_valid_index = get_next_valid_skill_index(tech_stack, next_index)
         
         if next_valid_index is not None:
             next_skill = tech_stack[next_valid_index]
-            tech_question_prompt = TECHNICAL_QUESTION_PROMPT.format(skill=next_skill)
-            technical_question = clean_llm_output(llama2.generate_response(tech_question_prompt))
-            technical_question = clean_technical_question(technical_question)
+            await emit(f"Question {session.question_count + 1} about {next_skill}:\n")
+            technical_question = await next_technical_question(session, next_skill)
             
             # Increment sequential question counter for display
-            session["question_count"] = session.get("question_count", 0) + 1
-            session["skill_index"] = next_valid_index
-            session["last_question"] = technical_question  # Store for next iteration
+            session.question_count += 1
+            session.skill_index = next_valid_index
+            session.last_question = technical_question  # Store for next iteration
             message = (
-                f"Question {session['question_count']} about {next_skill}:\n{technical_question}"
+                f"Question {session.question_count} about {next_skill}:\n{technical_question}"
             )
             next_stage = "technicalQuestions"
             current_tech_question_index = next_valid_index
@@ -435,8 +819,20 @@ async def conversation_message(payload: SendMessageRequest):
         message = INTERVIEW_ALREADY_COMPLETE_MESSAGE
         is_complete = True
 
+    if authoritative:
+        session.stage = next_stage
+        session.candidate = updated_candidate_info
+    # A concurrent submission for this interview saved first; refuse rather than interleave
+    if persist and not await sessions.save(session):
+        raise HTTPException(
+            status_code=409, detail="This interview was updated by another request. Please retry."
+        )
+    if answer_to_score:
+        score_answer_in_background(session_id, answer_to_score)
+
     # === SAVE TO MONGODB IF COMPLETE ===
-    if is_complete:
+    # Only on the turn that finishes the interview
+    if is_complete and current_stage != "complete":
         import json
         
         candidate_id = str(uuid.uuid4())
@@ -471,9 +867,18 @@ async def conversation_message(payload: SendMessageRequest):
             match = re.search(r"\d+", years_experience)
             years_experience = int(match.group(0)) if match else 0
 
-        # Calculate English proficiency score using ScoringService
+        # Answers were scored as they arrived; a background job covers any that were not
         answer_texts = [item["answer"] for item in qa_responses_list if item.get("answer")]
-        english_proficiency_score = scorer.calculate_proficiency(answer_texts) if answer_texts else 0.0
+        english_proficiency_score, answer_metrics = (
+            await collect_answer_scores(session_id, answer_texts) if answer_texts else (0.0, {})
+        )
+        # New dicts: the items are shared with updatedCandidateInfo, which goes back to the candidate
+        qa_responses_list = [
+            {**item, "metrics": answer_metrics[answer_key(item["answer"])]}
+            if item.get("answer") and answer_key(item["answer"]) in answer_metrics
+            else dict(item)
+            for item in qa_responses_list
+        ]
 
         candidate = Candidate(
             id=candidate_id,
@@ -486,10 +891,50 @@ async def conversation_message(payload: SendMessageRequest):
             tech_skills=tech_skills,
             qa_responses=qa_responses_list,
             english_proficiency_score=english_proficiency_score,
+            score_status="pending" if english_proficiency_score is None else "scored",
             status="completed"
         )
-        candidates_collection = get_candidates_collection()
-        candidates_collection.insert_one(candidate.dict())
+        # Insert-only on the unique email: a retried completion cannot store the candidate twice,
+        # give it a new id or queue its scoring again, and cannot turn a rejection into "completed"
+        record = candidate.dict()
+        # Identifies this interview, so a resent completion is recognised as the same one
+        record["attempt_key"] = hashlib.sha1(
+            json.dumps(
+                [session_id, [(item.get("question"), item.get("answer")) for item in qa_responses_list]], default=str
+            ).encode("utf-8")
+        ).hexdigest()
+        if await candidates.insert_by_email(record):
+            if english_proficiency_score is None:
+                await scoring_queue.enqueue(candidate.id, answer_texts)
+        else:
+            # Rejected mid-interview: keep the rejection, but fill in the profile its placeholder lacks
+            profile_fields = ("name", "phone", "years_experience", "desired_position", "location", "tech_skills")
+            await candidates.update_by_email(
+                candidate.email,
+                {**{k: record[k] for k in profile_fields}, "updated_at": candidate.updated_at},
+                where={"status": "rejected", "qa_responses": {"$exists": False}},
+            )
+            # Keep this interview's transcript and score next to the existing record
+            attempt_fields = (
+                "attempt_key", "id", "years_experience", "desired_position", "location", "tech_skills",
+                "qa_responses", "english_proficiency_score", "created_at",
+            )
+            attempt = {k: record[k] for k in attempt_fields}
+            # Background scoring only updates candidates, so a gap here stays unscored
+            attempt["score_status"] = "unscored" if english_proficiency_score is None else "scored"
+            if await candidates.add_attempt(candidate.email, attempt):
+                metrics.incr("candidate_attempts_appended")
+                logging.warning(
+                    f"Candidate {candidate.email} already has a stored interview; "
+                    f"saved this one as attempt {candidate.id}"
+                )
+            else:
+                metrics.incr("candidate_completions_duplicate")
+                logging.info(f"Completion for {candidate.email} was already stored; ignoring the resend")
+        await end_session(session_id, "completed")
+    elif is_complete:
+        # Already saved when the interview finished; just drop any state this message recreated
+        await end_session(session_id, "completed")
 
     return SendMessageResponse(
         message=message,
@@ -497,4 +942,72 @@ async def conversation_message(payload: SendMessageRequest):
         updatedCandidateInfo=updated_candidate_info,
         technicalQuestion=technical_question,
         isComplete=is_complete
-    )
\ No newline at end of file
+    )
+
+
+def _sse(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _stream_turn(turn: Callable[[], Awaitable[Any]]) -> StreamingResponse:
+    """Run ``turn`` with candidate-visible text forwarded as SSE ``token`` events, then ``done``."""
+    queue: "asyncio.Queue[tuple]" = asyncio.Queue()
+
+    async def sink(text: str) -> None:
+        await queue.put(("token", text))
+
+    async def drive() -> None:
+        _stream_sink.set(sink)
+        try:
+            response = await turn()
+            await queue.put(("done", response))
+        except Exception as e:
+            logging.error(f"Streamed conversation turn failed: {e}")
+            await queue.put(("error", e.detail if isinstance(e, HTTPException) else str(e)))
+
+    async def events():
+        task = asyncio.create_task(drive())
+        streamed = False
+        try:
+            while True:
+                kind, data = await queue.get()
+                if kind == "token":
+                    streamed = True
+                    yield _sse("token", {"text": data})
+                elif kind == "done":
+                    if not streamed and data.message:
+                        # Fixed messages (e.g. completion) never pass through the model
+                        yield _sse("token", {"text": data.message})
+                    yield _sse("done", data.dict())
+                    break
+                else:
+                    yield _sse("error", {"detail": data})
+                    break
+        finally:
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/conversation/message/stream")
+async def conversation_message_stream(payload: SendMessageRequest):
+    """
+    Streaming variant of /conversation/message using Server-Sent Events.
+
+    Emits ``token`` events with text as the model produces it, then a single
+    ``done`` event carrying the full SendMessageResponse (stage transition and
+    updatedCandidateInfo). The ``message`` in ``done`` is authoritative, since
+    streamed text is not post-processed.
+    """
+    return _stream_turn(lambda: conversation_message(payload))
+
+
+@router.post("/conversation/turn/stream")
+async def conversation_turn_stream(payload: TurnRequest):
+    """Streaming variant of /conversation/turn; the ``done`` event carries the TurnResponse."""
+    return _stream_turn(lambda: conversation_turn(payload))
@@ -1,52 +1,165 @@
-from fastapi import APIRouter
-from fastapi.responses import StreamingResponse
-from ..mongodb import get_candidates_collection
-import pandas as pd
-import io
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import AsyncIterator, Callable, Dict, List, Literal, Optional, Tuple
+from ..config import settings
+from ..services import candidate_export
+from .chat import candidates, export_snapshots
+import hashlib
+import importlib.util
+import json
 
 router = APIRouter()
 
-@router.get("/export/csv")
-async def export_csv():
-    candidates_collection = get_candidates_collection()
-    candidates = list(candidates_collection.find())
-
-    data = []
-    for c in candidates:
-        # Format Q&A responses as readable text
-        qa_responses = c.get("qa_responses", [])
-        qa_text = ""
-        if qa_responses:
-            qa_pairs = []
-            for idx, qa in enumerate(qa_responses, 1):
-                question = qa.get("question", "")
-                answer = qa.get("answer", "")
-                qa_pairs.append(f"Q{idx}: {question}\nA{idx}: {answer}")
-            qa_text = "\n\n".join(qa_pairs)
-        
-        data.append({
-            "ID": c.get("id"),
-            "Name": c.get("name"),
-            "Email": c.get("email"),
-            "Phone": c.get("phone"),
-            "Years Experience": c.get("years_experience"),
-            "Position": c.get("desired_position"),
-            "Location": c.get("location"),
-            "Tech Skills": ", ".join(c.get("tech_skills", [])) if c.get("tech_skills") else "",
-            "Technical Q&A": qa_text,
-            "English Score": c.get("english_proficiency_score"),
-            "Created At": c.get("created_at")
-        })
-
-    df = pd.DataFrame(data)
-
-    # Create CSV in memory
-    stream = io.StringIO()
-    df.to_csv(stream, index=False)
-    stream.seek(0)
+# Columns of the dashboard CSV and their header labels
+DASHBOARD_COLUMNS = {
+    "id": "ID", "name": "Name", "email": "Email", "phone": "Phone", "years_experience": "Years Experience",
+    "desired_position": "Position", "location": "Location", "tech_skills": "Tech Skills",
+    "qa_responses": "Technical Q&A", "english_proficiency_score": "English Score", "created_at": "Created At",
+}
+# Only the fields the CSV needs come over the wire (not _id, per-answer metrics, etc.)
+DASHBOARD_PROJECTION = candidate_export.build_projection(list(DASHBOARD_COLUMNS))
+
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return etag in tags or "*" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).astimezone(timezone.utc).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole-second precision
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+async def conditional_export(
+    request: Request,
+    variant: Dict,
+    query: Dict,
+    since: Optional[str],
+    render: Callable[[Dict, Optional[List[Tuple[str, int]]]], AsyncIterator],
+    media_type: str,
+    filename: str,
+) -> Response:
+    """
+    Serve an export with conditional GET and incremental ``since`` support.
+
+    The ETag is the candidates change counter plus the request variant
+    (format, filters, columns, since) and the cursor this export hands out,
+    so an unchanged collection answers 304 and a repeated download is served
+    from the snapshot cache. The response carries ``X-Export-Cursor``;
+    passing it back as ``since`` returns only the candidates changed after
+    this export.
+
+    The cursor stops short of writes from the last few seconds, which may
+    still be landing. Once such a write settles the cursor moves, and with
+    it the ETag, so a client holding the earlier response still receives
+    the row. Until every write has settled there is no Last-Modified, as
+    the write time alone cannot tell those two responses apart.
+    """
+    try:
+        since_key = candidate_export.decode_cursor(since) if since else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Read before the counter: a write after this point cannot leave its snapshot cached
+    generation = export_snapshots.generation
+    version, last_modified = await candidates.change_state()
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.EXPORT_CURSOR_SETTLE_SECONDS)
+    latest = await candidates.latest_change(
+        {"$and": [candidate_export.window_query(query, since_key), {"updated_at": {"$lte": cutoff}}]}
+    )
+    next_cursor = candidate_export.encode_cursor(latest) if latest else since
+    if last_modified is not None and last_modified > cutoff:
+        # Writes still inside the settle window; only the ETag (which includes the cursor) identifies this body
+        last_modified = None
+
+    digest = hashlib.sha1(
+        json.dumps([variant, since, next_cursor], sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    etag = f'"{version}-{digest[:16]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
 
+    headers["Content-Disposition"] = f"attachment; filename={filename}"
+    cached = export_snapshots.get(etag)
+    if cached is not None:
+        body, data_headers = cached
+        return Response(content=body, media_type=media_type, headers={**headers, **data_headers})
+
+    if since_key is not None:
+        # Incremental: exactly the changes between the two cursors, in cursor order
+        query = candidate_export.window_query(query, since_key, latest or since_key)
+        sort = candidate_export.CURSOR_SORT
+    else:
+        sort = None
+    data_headers = {"X-Export-Cursor": next_cursor} if next_cursor else {}
     return StreamingResponse(
-        iter([stream.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=candidates.csv"}
-    )
\ No newline at end of file
+        export_snapshots.capture(etag, render(query, sort), data_headers, generation),
+        media_type=media_type,
+        headers={**headers, **data_headers},
+    )
+
+
+@router.get("/export/csv")
+async def export_csv(request: Request, since: Optional[str] = None):
+    return await conditional_export(
+        request,
+        {"endpoint": "csv"},
+        {},
+        since,
+        lambda query, sort: candidate_export.csv_chunks(
+            candidates.iter_all(DASHBOARD_PROJECTION, batch_size=settings.EXPORT_BATCH_SIZE, query=query, sort=sort),
+            list(DASHBOARD_COLUMNS),
+            settings.EXPORT_CHUNK_ROWS,
+            header=list(DASHBOARD_COLUMNS.values()),
+        ),
+        "text/csv",
+        "candidates.csv",
+    )
+
+
+@router.get("/export")
+async def export_candidates(
+    request: Request,
+    format: Literal["csv", "ndjson", "parquet"] = "csv",
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    skill: Optional[List[str]] = Query(None),
+    min_score: Optional[float] = None,
+    columns: Optional[str] = None,
+    since: Optional[str] = None,
+):
+    """
+    Export candidates for analytics. Filters run in Mongo and only the selected
+    columns (comma-separated, all by default) are read and written. Pass the
+    previous response's ``X-Export-Cursor`` as ``since`` for just the changes.
+    """
+    try:
+        selected = candidate_export.parse_columns(columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise HTTPException(status_code=501, detail="Parquet export requires the pyarrow package")
+
+    query = candidate_export.build_query(status, created_from, created_to, skill, min_score)
+    projection = candidate_export.build_projection(selected)
+    rows = settings.EXPORT_PARQUET_ROW_GROUP_ROWS if format == "parquet" else settings.EXPORT_CHUNK_ROWS
+    media_type, extension = candidate_export.FORMATS[format]
+    variant = {"format": format, "query": query, "columns": selected}
+
+    def render(window: Dict, sort: Optional[List[Tuple[str, int]]]) -> AsyncIterator:
+        docs = candidates.iter_all(projection, batch_size=settings.EXPORT_BATCH_SIZE, query=window, sort=sort)
+        return candidate_export.encoder(format)(docs, selected, rows)
+
+    return await conditional_export(request, variant, query, since, render, media_type, f"candidates.{extension}")
@@ -16,6 +16,25 @@ class SendMessageResponse(BaseModel):
     technicalQuestion: str = ""
     isComplete: bool = False
 
+class TurnRequest(BaseModel):
+    # Issued by the server on the first turn; omit it to start an interview
+    sessionToken: Optional[str] = None
+    userMessage: str = ""
+    # Session version from the previous reply; a mismatch is refused with 409
+    version: Optional[int] = None
+
+class TurnResponse(BaseModel):
+    sessionToken: str
+    version: int
+    message: str
+    stage: str
+    # Candidate fields set or replaced this turn
+    changes: Dict[str, Any] = {}
+    # Items added to list fields this turn (e.g. one technicalQA pair)
+    appended: Dict[str, List[Any]] = {}
+    technicalQuestion: str = ""
+    isComplete: bool = False
+
 class ChatResponse(BaseModel):
     response: str
     stage: str
@@ -36,6 +55,8 @@ class CandidateData(BaseModel):
 class RejectCandidateRequest(BaseModel):
     email: str
     reason: str = "malpractice_fullscreen_exit"
+    # Set by clients of /conversation/turn, whose sessions are keyed by token
+    sessionToken: Optional[str] = None
 
 class RejectCandidateResponse(BaseModel):
     success: bool
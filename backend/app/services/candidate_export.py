@@ -0,0 +1,305 @@
+"""Candidate exports for analytics: CSV, NDJSON and Parquet, filtered and projected in Mongo.
+
+Filters (status, creation date range, skills, minimum score) become the
+cursor's query and the selected columns become its projection, so only the
+matching documents and the requested fields leave the database. Each
+encoder consumes the cursor as it arrives and yields the encoded output a
+chunk (CSV/NDJSON) or a row group (Parquet) at a time.
+
+Incremental exports pass a ``since`` cursor: an opaque token for the
+``(updated_at, _id)`` of the last change the client has seen. Candidates
+are ordered by that pair, so the next export resumes exactly after it.
+
+NDJSON and Parquet keep the nested fields structured (``tech_skills`` as a
+list, ``qa_responses`` as a list of question/answer records); CSV flattens
+them to text. The dashboard's ``/export/csv`` uses the same CSV encoder
+with its own column labels.
+
+Parquet uses ``pyarrow`` (in requirements.txt); it is imported on the first
+Parquet export, and the endpoint answers 501 if it is missing.
+"""
+
+import base64
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from bson import ObjectId  # type: ignore
+from bson.errors import InvalidId  # type: ignore
+
+# Media type and file extension per export format
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# Exportable columns and the Mongo fields each one needs
+COLUMNS: Dict[str, List[str]] = {
+    "id": ["id"],
+    "name": ["name"],
+    "email": ["email"],
+    "phone": ["phone"],
+    "years_experience": ["years_experience"],
+    "desired_position": ["desired_position"],
+    "location": ["location"],
+    "tech_skills": ["tech_skills"],
+    "qa_responses": ["qa_responses.question", "qa_responses.answer"],
+    "english_proficiency_score": ["english_proficiency_score"],
+    "score_status": ["score_status"],
+    "status": ["status"],
+    "rejection_reason": ["rejection_reason"],
+    "created_at": ["created_at"],
+    "updated_at": ["updated_at"],
+}
+
+
+def parse_columns(spec: Optional[str]) -> List[str]:
+    """Columns from a comma-separated list, in the order given; all columns when empty."""
+    if not spec:
+        return list(COLUMNS)
+    columns = [name.strip() for name in spec.split(",") if name.strip()]
+    unknown = [name for name in columns if name not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown export columns: {', '.join(unknown)}. Available: {', '.join(COLUMNS)}")
+    return list(dict.fromkeys(columns))
+
+
+def build_query(
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    skills: Optional[List[str]] = None,
+    min_score: Optional[float] = None,
+) -> Dict:
+    """Mongo filter for the export; every condition can use one of the candidate indexes."""
+    query: Dict = {}
+    if status:
+        query["status"] = status
+    if created_from or created_to:
+        query["created_at"] = {}
+        if created_from:
+            query["created_at"]["$gte"] = created_from
+        if created_to:
+            query["created_at"]["$lt"] = created_to
+    if skills:
+        # Candidates with any of the skills, matched exactly as stored
+        query["tech_skills"] = {"$in": skills}
+    if min_score is not None:
+        query["english_proficiency_score"] = {"$gte": min_score}
+    return query
+
+
+# Order of an incremental export; matches the (updated_at, _id) index
+CURSOR_SORT = [("updated_at", 1), ("_id", 1)]
+
+ChangeKey = Tuple[datetime, ObjectId]
+
+
+def encode_cursor(key: ChangeKey) -> str:
+    updated_at, doc_id = key
+    raw = json.dumps({"u": updated_at.isoformat(), "i": str(doc_id)})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> ChangeKey:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return datetime.fromisoformat(data["u"]), ObjectId(data["i"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError(f"Invalid since cursor: {e}")
+
+
+def window_query(query: Dict, since: Optional[ChangeKey] = None, until: Optional[ChangeKey] = None) -> Dict:
+    """``query`` narrowed to candidates changed after ``since`` and up to and including ``until``."""
+    conditions = [query] if query else []
+    if since is not None:
+        conditions.append({"$or": [
+            {"updated_at": {"$gt": since[0]}},
+            {"updated_at": since[0], "_id": {"$gt": since[1]}},
+        ]})
+    if until is not None:
+        conditions.append({"$or": [
+            {"updated_at": {"$lt": until[0]}},
+            {"updated_at": until[0], "_id": {"$lte": until[1]}},
+        ]})
+    if len(conditions) > 1:
+        return {"$and": conditions}
+    return conditions[0] if conditions else {}
+
+
+def build_projection(columns: List[str]) -> Dict:
+    projection = {"_id": 0}
+    for name in columns:
+        projection.update({field: 1 for field in COLUMNS[name]})
+    return projection
+
+
+def _as_int(value) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_float(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def export_row(doc: Dict, columns: List[str]) -> Dict:
+    """The selected columns of a candidate document, with consistent types for every format."""
+    row = {}
+    for name in columns:
+        value = doc.get(name)
+        if name == "tech_skills":
+            value = [str(skill) for skill in value or []]
+        elif name == "qa_responses":
+            value = [{"question": qa.get("question"), "answer": qa.get("answer")} for qa in value or []]
+        elif name == "years_experience":
+            value = _as_int(value)
+        elif name == "english_proficiency_score":
+            value = _as_float(value)
+        elif name not in ("created_at", "updated_at") and value is not None:
+            value = str(value)
+        row[name] = value
+    return row
+
+
+def _csv_value(name: str, value):
+    if value is None:
+        return ""
+    if name == "tech_skills":
+        return ", ".join(value)
+    if name == "qa_responses":
+        return "\n\n".join(
+            f"Q{idx}: {qa['question'] or ''}\nA{idx}: {qa['answer'] or ''}" for idx, qa in enumerate(value, 1)
+        )
+    return value
+
+
+async def csv_chunks(
+    docs: AsyncIterator[Dict], columns: List[str], chunk_rows: int, header: Optional[List[str]] = None
+) -> AsyncIterator[str]:
+    """CSV of ``columns``, ``chunk_rows`` rows per chunk; ``header`` labels the columns (their names by default).
+
+    The header goes out before the first cursor batch arrives. Missing values
+    are empty cells. Each value is written as stored, so unlike the old
+    pandas export a whole numeric column is not turned into floats because
+    one candidate lacks a value.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(header or columns)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    rows = 0
+    async for doc in docs:
+        row = export_row(doc, columns)
+        writer.writerow([_csv_value(name, row[name]) for name in columns])
+        rows += 1
+        if rows % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+async def ndjson_chunks(docs: AsyncIterator[Dict], columns: List[str], chunk_rows: int) -> AsyncIterator[str]:
+    lines: List[str] = []
+    async for doc in docs:
+        lines.append(json.dumps(export_row(doc, columns), default=_json_default, ensure_ascii=False))
+        if len(lines) == chunk_rows:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def parquet_schema(columns: List[str]):
+    import pyarrow as pa  # type: ignore
+
+    types = {
+        "years_experience": pa.int64(),
+        "tech_skills": pa.list_(pa.string()),
+        "qa_responses": pa.list_(pa.struct([("question", pa.string()), ("answer", pa.string())])),
+        "english_proficiency_score": pa.float64(),
+        "created_at": pa.timestamp("ms"),
+        "updated_at": pa.timestamp("ms"),
+    }
+    return pa.schema([(name, types.get(name, pa.string())) for name in columns])
+
+
+class _ChunkSink:
+    """Write-only file for ``ParquetWriter`` whose bytes are taken out after each row group."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        # Parquet offsets come from tell(), so it keeps counting across drains
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+async def parquet_chunks(docs: AsyncIterator[Dict], columns: List[str], group_rows: int) -> AsyncIterator[bytes]:
+    """One Parquet row group per ``group_rows`` candidates, yielded as soon as it is encoded."""
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+
+    schema = parquet_schema(columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    rows: List[Dict] = []
+    try:
+        async for doc in docs:
+            rows.append(export_row(doc, columns))
+            if len(rows) == group_rows:
+                writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=schema))
+                rows = []
+                yield sink.drain()
+        if rows:
+            writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=schema))
+    finally:
+        writer.close()
+    # Footer with the schema and row group offsets
+    yield sink.drain()
+
+
+def encoder(fmt: str):
+    """Encoder for ``fmt``: an async generator taking (docs, columns, batch rows)."""
+    return {"csv": csv_chunks, "ndjson": ndjson_chunks, "parquet": parquet_chunks}[fmt]
@@ -0,0 +1,191 @@
+"""Async access to the ``candidates`` collection for request handlers.
+
+Handlers run on the event loop, so they must not call the synchronous
+pymongo client directly: every round trip would stall every other request
+for its duration. This repository goes through motor instead, with the
+pool, timeouts and write concern from ``Settings`` (see ``mongodb.client_options``).
+Background services that already run their Mongo work in threads keep the
+sync client.
+
+Candidates are keyed by email: ``ensure_indexes`` makes it unique, and the
+completion and rejection writes are single upserts on it, so two racing
+requests for the same candidate end in one document. A completion only ever
+inserts, so it cannot undo a rejection or re-create a stored candidate; a
+later interview by the same email (a retake) is appended to the candidate's
+``attempts`` instead.
+
+Every write also bumps the ``candidates`` document in ``change_counters``.
+Exports derive their ETag and Last-Modified from it, so an unchanged
+collection can be answered with 304 by any worker.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel  # type: ignore
+from pymongo.errors import DuplicateKeyError, OperationFailure  # type: ignore
+
+from ..metrics import metrics
+
+INDEXES = [
+    IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    # Background scoring looks candidates up by their generated id
+    IndexModel([("id", ASCENDING)], name="id"),
+    # Dashboard queries: newest first, optionally by status or skill
+    IndexModel([("created_at", DESCENDING)], name="created_at"),
+    IndexModel([("status", ASCENDING), ("created_at", DESCENDING)], name="status_created_at"),
+    IndexModel([("tech_skills", ASCENDING)], name="tech_skills"),
+    # Analytics exports filtered by minimum score
+    IndexModel([("english_proficiency_score", DESCENDING)], name="english_proficiency_score"),
+    # Incremental exports page on (updated_at, _id)
+    IndexModel([("updated_at", ASCENDING), ("_id", ASCENDING)], name="updated_at_id"),
+]
+
+CHANGE_COUNTER_ID = "candidates"
+
+
+def change_counter_update() -> Dict:
+    """Update for the ``change_counters`` document; apply with upsert after any candidate write."""
+    return {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}}
+
+
+class CandidateRepository:
+    def __init__(
+        self,
+        collection_getter: Callable,
+        counters_getter: Optional[Callable] = None,
+        on_change: Optional[Callable[[], None]] = None,
+    ):
+        # Return AsyncIOMotorCollections; resolved per call so the client is created lazily
+        self.collection_getter = collection_getter
+        self.counters_getter = counters_getter
+        # Called after every write in this process (e.g. to drop cached exports)
+        self.on_change = on_change
+
+    async def _changed(self) -> None:
+        if self.on_change is not None:
+            self.on_change()
+        if self.counters_getter is not None:
+            await self.counters_getter().update_one({"_id": CHANGE_COUNTER_ID}, change_counter_update(), upsert=True)
+
+    async def change_state(self) -> Tuple[int, Optional[datetime]]:
+        """Change counter and time of the last write; ``(0, None)`` before the first counted write."""
+        if self.counters_getter is None:
+            return 0, None
+        doc = await self.counters_getter().find_one({"_id": CHANGE_COUNTER_ID})
+        if doc is None:
+            return 0, None
+        return doc.get("version", 0), doc.get("updated_at")
+
+    async def ping(self) -> None:
+        await self.collection_getter().database.command("ping")
+
+    async def ensure_indexes(self) -> None:
+        """Create the candidate indexes; a no-op for those that already exist."""
+        collection = self.collection_getter()
+        try:
+            await collection.create_indexes(INDEXES)
+        except OperationFailure as e:
+            # Usually duplicate emails written before the index existed; keep a plain index so lookups stay fast
+            logging.warning(f"Could not create all candidate indexes ({e}); "
+                            "remove duplicate emails and the plain 'email' index, then restart")
+            try:
+                await collection.create_indexes([IndexModel([("email", ASCENDING)], name="email")] + INDEXES[1:])
+            except Exception as e:
+                logging.warning(f"Could not create candidate indexes: {e}")
+        except Exception as e:
+            logging.warning(f"Could not create candidate indexes: {e}")
+
+    async def create(self, candidate: Dict) -> None:
+        started = time.perf_counter()
+        await self.collection_getter().insert_one(candidate)
+        metrics.observe("mongo_write_seconds", time.perf_counter() - started, op="insert")
+        await self._changed()
+
+    async def find_by_email(self, email: str, projection: Optional[Dict] = None) -> Optional[Dict]:
+        return await self.collection_getter().find_one({"email": email}, projection)
+
+    async def upsert_by_email(self, email: str, fields: Dict, on_insert: Optional[Dict] = None) -> bool:
+        """Set ``fields`` on the candidate with ``email``, creating it with ``on_insert`` as well if
+        there is none, in one round trip. Returns True when a new document was created."""
+        update = {"$set": fields}
+        if on_insert:
+            update["$setOnInsert"] = on_insert
+        collection = self.collection_getter()
+        started = time.perf_counter()
+        try:
+            result = await collection.update_one({"email": email}, update, upsert=True)
+        except DuplicateKeyError:
+            # Lost an insert race on the unique email; the other document exists now, so this updates it
+            result = await collection.update_one({"email": email}, update, upsert=True)
+        metrics.observe("mongo_write_seconds", time.perf_counter() - started, op="upsert")
+        await self._changed()
+        return result.upserted_id is not None
+
+    async def insert_by_email(self, document: Dict) -> bool:
+        """Create ``document`` unless a candidate with its email exists, in one round trip.
+        Returns True when it was created; an existing candidate is left untouched."""
+        collection = self.collection_getter()
+        fields = {k: v for k, v in document.items() if k != "email"}
+        started = time.perf_counter()
+        try:
+            result = await collection.update_one({"email": document["email"]}, {"$setOnInsert": fields}, upsert=True)
+        except DuplicateKeyError:
+            # Lost an insert race on the unique email; the other document wins
+            return False
+        metrics.observe("mongo_write_seconds", time.perf_counter() - started, op="upsert")
+        if result.upserted_id is None:
+            return False
+        await self._changed()
+        return True
+
+    async def update_by_email(self, email: str, fields: Dict, where: Optional[Dict] = None) -> bool:
+        """Set ``fields`` on the candidate with ``email`` if it also matches ``where``; never inserts."""
+        started = time.perf_counter()
+        result = await self.collection_getter().update_one({**(where or {}), "email": email}, {"$set": fields})
+        metrics.observe("mongo_write_seconds", time.perf_counter() - started, op="update")
+        if not result.modified_count:
+            return False
+        await self._changed()
+        return True
+
+    async def add_attempt(self, email: str, attempt: Dict) -> bool:
+        """Append ``attempt`` to the ``attempts`` of the candidate with ``email``.
+
+        Keyed by ``attempt["attempt_key"]``: an interview already stored, as the
+        candidate itself or as an earlier attempt, is not added again.
+        Returns True when the attempt was added.
+        """
+        key = attempt["attempt_key"]
+        started = time.perf_counter()
+        result = await self.collection_getter().update_one(
+            {"email": email, "attempt_key": {"$ne": key}, "attempts.attempt_key": {"$ne": key}},
+            {"$push": {"attempts": attempt}, "$set": {"updated_at": attempt["created_at"]}},
+        )
+        metrics.observe("mongo_write_seconds", time.perf_counter() - started, op="update")
+        if not result.modified_count:
+            return False
+        await self._changed()
+        return True
+
+    async def latest_change(self, query: Optional[Dict] = None) -> Optional[Tuple[datetime, object]]:
+        """``(updated_at, _id)`` of the most recently updated candidate matching ``query``."""
+        doc = await self.collection_getter().find_one(
+            query or {}, {"updated_at": 1}, sort=[("updated_at", DESCENDING), ("_id", DESCENDING)]
+        )
+        if doc is None or doc.get("updated_at") is None:
+            return None
+        return doc["updated_at"], doc["_id"]
+
+    async def iter_all(
+        self,
+        projection: Optional[Dict] = None,
+        batch_size: int = 500,
+        query: Optional[Dict] = None,
+        sort: Optional[List[Tuple[str, int]]] = None,
+    ) -> AsyncIterator[Dict]:
+        cursor = self.collection_getter().find(query or {}, projection, batch_size=batch_size, sort=sort)
+        async for doc in cursor:
+            yield doc
@@ -0,0 +1,80 @@
+"""Rendered candidate exports kept in memory, keyed by their ETag.
+
+Dashboards re-download the same export over and over. The first request
+renders it as usual and, while streaming, keeps a copy; later requests for
+the same ETag get those bytes without touching the candidates collection.
+The ETag contains the collection's change counter, so a write from any
+worker makes the old snapshots unreachable. Writes in this process also
+call ``invalidate`` to free them straight away.
+
+Exports bigger than the byte budget are streamed but not kept.
+"""
+
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Optional, Tuple, Union
+
+from ..metrics import metrics
+
+
+class ExportSnapshotCache:
+    def __init__(self, max_bytes: int = 64 * 2**20):
+        self.max_bytes = max_bytes
+        # ETag -> (body, response headers that depend on the data, e.g. the next since-cursor)
+        self._entries: "OrderedDict[str, Tuple[bytes, Dict[str, str]]]" = OrderedDict()
+        self._size = 0
+        # Bumped by invalidate, so a render that started before a write is not stored afterwards
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, etag: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        entry = self._entries.get(etag)
+        if entry is None:
+            metrics.incr("export_snapshot_misses")
+            return None
+        self._entries.move_to_end(etag)
+        metrics.incr("export_snapshot_hits")
+        return entry
+
+    def put(self, etag: str, body: bytes, headers: Dict[str, str]) -> None:
+        if len(body) > self.max_bytes:
+            return
+        if etag in self._entries:
+            self._size -= len(self._entries.pop(etag)[0])
+        self._entries[etag] = (body, headers)
+        self._size += len(body)
+        while self._size > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+        metrics.set_gauge("export_snapshot_bytes", self._size)
+
+    async def capture(
+        self, etag: str, chunks: AsyncIterator[Union[str, bytes]], headers: Dict[str, str], generation: int
+    ) -> AsyncIterator[bytes]:
+        """Pass ``chunks`` through, storing the whole body once it has been produced completely.
+
+        ``generation`` is ``self.generation`` as read before the change counter behind ``etag``.
+        """
+        parts: Optional[list] = []
+        size = 0
+        async for chunk in chunks:
+            data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+            if parts is not None:
+                size += len(data)
+                if size <= self.max_bytes:
+                    parts.append(data)
+                else:
+                    # Too big to keep; stop copying but keep streaming
+                    parts = None
+            yield data
+        if parts is not None and generation == self.generation:
+            self.put(etag, b"".join(parts), headers)
+
+    def invalidate(self) -> None:
+        if self._entries:
+            metrics.incr("export_snapshot_invalidations")
+        self._entries.clear()
+        self._size = 0
+        self.generation += 1
+        metrics.set_gauge("export_snapshot_bytes", 0)
@@ -0,0 +1,149 @@
+"""Rule-based extraction for the intake stages.
+
+Each extractor parses the candidate's raw message locally and reports a
+confidence in [0, 1]. ``conversation_message`` only falls back to the LLM
+extraction prompt when the confidence is below
+``settings.FAST_EXTRACTION_MIN_CONFIDENCE``.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from ..config import settings
+from ..metrics import metrics
+
+EMAIL_RE = re.compile(r"[\w\.\+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"\+?\d[\d\s\-\.\(\)]{6,}\d")
+NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+NAME_PREFIX_RE = re.compile(
+    r"^(hi|hello|hey|sure|ok|okay|yes)?[\s,!]*(i\s*am|i'm|im|my name is|my full name is|this is|name is|the name is|it's|it is)\s+",
+    flags=re.IGNORECASE,
+)
+NAME_TOKEN_RE = re.compile(r"^[A-Za-zÀ-ÖØ-öø-ÿ][A-Za-zÀ-ÖØ-öø-ÿ'\-]*$")
+NON_NAME_WORDS = {
+    "hi", "hello", "hey", "yes", "no", "ok", "okay", "sure", "thanks", "thank",
+    "you", "name", "my", "is", "the", "a", "an", "and", "not", "dont", "don't",
+    "know", "candidate", "talentbot", "full", "your", "what", "why",
+    "good", "morning", "afternoon", "evening", "fine", "well",
+}
+
+WORD_TO_NUM = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4,
+    "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9,
+    "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+    "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17,
+    "eighteen": 18, "nineteen": 19, "twenty": 20,
+}
+NO_EXPERIENCE_RE = re.compile(
+    r"\b(fresher|fresh graduate|no experience|none|zero|not any|no prior)\b", flags=re.IGNORECASE
+)
+
+
+@dataclass
+class Extraction:
+    value: Any
+    confidence: float
+
+    @property
+    def confident(self) -> bool:
+        return self.confidence >= settings.FAST_EXTRACTION_MIN_CONFIDENCE
+
+
+def extract_email(message: str) -> Extraction:
+    matches = EMAIL_RE.findall(message)
+    unique = list(dict.fromkeys(m.strip(".").lower() for m in matches))
+    if len(unique) == 1:
+        return Extraction(unique[0], 0.99)
+    if unique:
+        return Extraction(unique[0], 0.4)
+    return Extraction("", 0.0)
+
+
+def extract_phone(message: str) -> Extraction:
+    candidates = []
+    for match in PHONE_RE.findall(message):
+        digits = re.sub(r"\D", "", match)
+        if 8 <= len(digits) <= 15:
+            candidates.append(digits)
+    if len(candidates) == 1:
+        return Extraction(candidates[0], 0.95)
+    if candidates:
+        return Extraction(candidates[0], 0.4)
+    return Extraction("", 0.0)
+
+
+def extract_experience(message: str) -> Extraction:
+    text = message.strip().lower()
+    numbers = NUMBER_RE.findall(text)
+    words = [WORD_TO_NUM[w] for w in re.findall(r"[a-z]+", text) if w in WORD_TO_NUM]
+    if len(numbers) == 1 and not words:
+        return Extraction(int(float(numbers[0])), 0.95)
+    if len(words) == 1 and not numbers:
+        return Extraction(words[0], 0.9)
+    if not numbers and not words and NO_EXPERIENCE_RE.search(text):
+        return Extraction(0, 0.9)
+    # Ranges ("3-4 years") or several figures are left to the LLM path
+    return Extraction(None, 0.0)
+
+
+def extract_name(message: str) -> Extraction:
+    text = message.strip().strip(".!")
+    stripped = NAME_PREFIX_RE.sub("", text).strip()
+    introduced = stripped != text
+    text = stripped
+    text = re.split(r"[,\n]|\s+and\s+", text, maxsplit=1)[0].strip().strip(".!")
+    tokens = text.split()
+    if not tokens or len(tokens) > 4:
+        return Extraction("", 0.0)
+    if not all(NAME_TOKEN_RE.match(t) for t in tokens):
+        return Extraction("", 0.0)
+    if any(t.lower() in NON_NAME_WORDS for t in tokens):
+        return Extraction("", 0.1)
+    capitalized = all(t[0].isupper() for t in tokens)
+    if text.islower() or text.isupper():
+        text = " ".join(t.capitalize() for t in tokens)
+    # Only an explicit introduction or a capitalized full name is trusted; "Software engineer",
+    # "I am fine" or a bare single token could as well be a job title, a reply or a stray word
+    if capitalized and (introduced or len(tokens) >= 2):
+        confidence = 0.9
+    elif introduced or len(tokens) >= 2:
+        confidence = 0.6
+    else:
+        confidence = 0.5
+    return Extraction(text, confidence)
+
+
+EXTRACTORS = {
+    "name": extract_name,
+    "email": extract_email,
+    "phone": extract_phone,
+    "experience": extract_experience,
+}
+
+
+def fast_extract(field: str, message: str) -> Extraction:
+    """Run the rule-based extractor for ``field`` and record whether the LLM is still needed."""
+    result = EXTRACTORS[field](message)
+    metrics.incr("extraction_total", field=field)
+    if not result.confident:
+        metrics.incr("extraction_llm_calls", field=field)
+    return result
+
+
+def llm_call_rate(field: Optional[str] = None) -> float:
+    """Share of extractions that fell back to the LLM, overall or for one field."""
+    if field is None:
+        total = metrics.total("extraction_total")
+        llm = metrics.total("extraction_llm_calls")
+    else:
+        total = metrics.get("extraction_total", field=field)
+        llm = metrics.get("extraction_llm_calls", field=field)
+    return llm / total if total else 0.0
+
+
+def llm_call_rates() -> Dict[str, float]:
+    rates = {field: round(llm_call_rate(field), 4) for field in EXTRACTORS}
+    rates["overall"] = round(llm_call_rate(), 4)
+    return rates
@@ -0,0 +1,92 @@
+"""In-process fake LLM used for local development and benchmarks.
+
+Returns canned answers after an artificial delay so the conversation flow
+can be exercised without network access or model weights.
+"""
+
+import asyncio
+import random
+import re
+import time
+from typing import AsyncIterator, Optional
+
+from ..system_prompt import TECHNICAL_QUESTION_PROMPT
+from .generation_profiles import get_profile, record_generation
+
+
+class FakeLLMService:
+    name = "fake"
+
+    def __init__(
+        self,
+        delay: float = 0.05,
+        blocking: bool = False,
+        name: str = "fake",
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = None,
+    ):
+        # When ``blocking`` is set the delay is a time.sleep, mimicking a
+        # synchronous client called from inside the event loop.
+        self.delay = delay
+        self.blocking = blocking
+        self.name = name
+        # Extra latency drawn uniformly from [0, jitter] and the share of calls
+        # that fail, for exercising routing and hedging
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.calls = 0
+
+    def _latency(self) -> float:
+        return self.delay + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def _fails(self) -> bool:
+        return self.failure_rate > 0 and self.random.random() < self.failure_rate
+
+    def _answer(self, prompt: str) -> str:
+        if "technical interview question" in prompt:
+            skill = re.search(r"question about (.+?)\.", prompt)
+            return f"What is a key feature of {skill.group(1) if skill else 'this technology'}?"
+        quoted = re.search(r"message: '(.*?)'\.", prompt, flags=re.DOTALL)
+        if quoted:
+            return quoted.group(1)
+        return "Could you tell me a bit more?"
+
+    async def generate_response(
+        self, prompt: str, context: Optional[str] = None, profile: Optional[str] = None
+    ) -> str:
+        self.calls += 1
+        started = time.perf_counter()
+        if self.blocking:
+            time.sleep(self._latency())
+        else:
+            await asyncio.sleep(self._latency())
+        if self._fails():
+            return "Sorry, the AI assistant is currently unavailable due to a technical issue."
+        text = self._answer(prompt)
+        # One "token" per word is close enough for a fake
+        record_generation(
+            get_profile(profile), self.name, time.perf_counter() - started, len(text.split()), text=text
+        )
+        return text
+
+    async def stream_response(
+        self, prompt: str, context: Optional[str] = None, profile: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        self.calls += 1
+        if self._fails():
+            yield "Sorry, the AI assistant is currently unavailable due to a technical issue."
+            return
+        words = self._answer(prompt).split(" ")
+        latency = self._latency()
+        for i, word in enumerate(words):
+            await asyncio.sleep(latency / max(len(words), 1))
+            yield word if i == 0 else " " + word
+
+    async def generate_question(self, skill: str, difficulty: str = "intermediate") -> str:
+        prompt = TECHNICAL_QUESTION_PROMPT.format(skill=skill)
+        return await self.generate_response(prompt, profile="question")
+
+    async def aclose(self) -> None:
+        return None
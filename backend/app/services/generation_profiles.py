@@ -0,0 +1,114 @@
+"""Per-prompt-type generation settings.
+
+Every LLM call names a profile (extraction, skills, structured, ask, intro,
+question) that sets its token budget, stop sequences and sampling temperature, plus a
+cheap validator for the output. Extractions whose answer is a name or a
+number no longer decode up to 512 tokens only for ``clean_llm_output`` to
+keep the first line. Providers report token usage and latency per profile so
+/metrics shows where generation time goes.
+
+Individual fields can be overridden with ``GENERATION_PROFILE_OVERRIDES``, a
+JSON object such as ``{"question": {"max_tokens": 200}}``.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Optional, Tuple
+
+from ..config import settings
+from ..metrics import metrics
+from .llm_provider import is_unavailable
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    name: str
+    max_tokens: int
+    temperature: float
+    top_p: float = 0.9
+    stop: Tuple[str, ...] = ()
+    # Returns False for output that is useless for this prompt type
+    validator: Optional[Callable[[str], bool]] = None
+
+
+def _single_line(text: str) -> bool:
+    return bool(text.strip()) and "\n" not in text.strip()
+
+
+def _non_empty(text: str) -> bool:
+    return bool(text.strip())
+
+
+def _has_json_object(text: str) -> bool:
+    return "{" in text and "}" in text
+
+
+def _is_question(text: str) -> bool:
+    return len(text.strip()) > 10
+
+
+PROFILES: Dict[str, GenerationProfile] = {
+    # Historical settings, for callers that do not name a profile
+    "default": GenerationProfile("default", max_tokens=512, temperature=0.7),
+    # Name, email, phone, years, position, location: a few tokens, deterministic
+    "extraction": GenerationProfile(
+        "extraction", max_tokens=48, temperature=0.0, stop=("\n",), validator=_single_line
+    ),
+    # Comma-separated skill list
+    "skills": GenerationProfile("skills", max_tokens=96, temperature=0.0, stop=("\n",), validator=_single_line),
+    # JSON {value, next_message} from a structured turn
+    "structured": GenerationProfile(
+        "structured", max_tokens=160, temperature=0.2, validator=_has_json_object
+    ),
+    # Short greeting or question to the candidate
+    "ask": GenerationProfile("ask", max_tokens=96, temperature=0.7, stop=("\n\n",), validator=_non_empty),
+    # Transition into the technical questions
+    "intro": GenerationProfile("intro", max_tokens=96, temperature=0.7, stop=("\n\n",)),
+    # A single technical interview question
+    "question": GenerationProfile(
+        "question", max_tokens=160, temperature=0.7, stop=("\n\n",), validator=_is_question
+    ),
+}
+
+
+def _apply_overrides() -> None:
+    raw = settings.GENERATION_PROFILE_OVERRIDES
+    if not raw:
+        return
+    try:
+        overrides = json.loads(raw)
+        for name, fields in overrides.items():
+            if "stop" in fields:
+                fields["stop"] = tuple(fields["stop"])
+            base = PROFILES.get(name, PROFILES["default"])
+            PROFILES[name] = replace(base, name=name, **fields)
+    except Exception as e:
+        logging.error(f"Ignoring invalid GENERATION_PROFILE_OVERRIDES: {e}")
+
+
+_apply_overrides()
+
+
+def get_profile(name: Optional[str]) -> GenerationProfile:
+    return PROFILES.get(name or "default", PROFILES["default"])
+
+
+def record_generation(
+    profile: GenerationProfile,
+    provider: str,
+    seconds: float,
+    completion_tokens: Optional[int] = None,
+    prompt_tokens: Optional[int] = None,
+    text: Optional[str] = None,
+) -> None:
+    """Record latency, token usage and output validity for one completion."""
+    labels = {"profile": profile.name, "provider": provider}
+    metrics.incr("generation_calls", **labels)
+    metrics.observe("generation_latency", seconds, **labels)
+    if completion_tokens is not None:
+        metrics.incr("generation_completion_tokens", completion_tokens, **labels)
+    if prompt_tokens is not None:
+        metrics.incr("generation_prompt_tokens", prompt_tokens, **labels)
+    if text is not None and not is_unavailable(text) and profile.validator and not profile.validator(text):
+        metrics.incr("generation_invalid_outputs", **labels)
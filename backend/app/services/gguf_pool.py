@@ -0,0 +1,334 @@
+"""Pool of GGUF model worker processes behind a bounded priority queue.
+
+One ``Llama`` instance serves one completion at a time, so a single process
+cannot use more than one request's worth of CPU however many threads it has.
+``GGUFWorkerPool`` runs ``GGUF_POOL_WORKERS`` processes, each with its own
+``GGUFService`` (weights are mmap'd, so the OS page cache shares them across
+processes) and ``GGUF_POOL_THREADS_PER_WORKER`` threads.
+
+Requests wait in an asyncio priority queue (live turns before background
+work) bounded by ``GGUF_POOL_QUEUE_DEPTH``; when it is full, callers get the
+usual "unavailable" reply immediately instead of queueing forever.
+llama-cpp-python's high-level API evaluates one sequence per context, so
+short prompts (extractions) are micro-batched instead: up to
+``GGUF_POOL_BATCH_SIZE`` of them are dispatched to a worker as one job and
+run back to back on the already-restored system prefix, saving a
+queue/IPC round trip and prefix restore per prompt.
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing as mp
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional
+
+from ..config import settings
+from ..metrics import metrics
+from ..system_prompt import TECHNICAL_QUESTION_PROMPT
+from .llm_provider import current_priority
+
+UNAVAILABLE_MESSAGE = "Sorry, the AI assistant is currently unavailable. Please try again in a moment."
+# A worker that keeps dying (e.g. model file missing) is not restarted forever
+MAX_RESTARTS = 5
+
+
+def _worker_main(worker_id: int, threads: int, tasks, results) -> None:
+    """Entry point of a worker process: load the model, then serve jobs until told to stop."""
+    import os
+
+    os.environ["GGUF_THREADS"] = str(threads)
+    from .gguf_service import GGUFService
+
+    service = GGUFService()
+    results.put(("ready", worker_id, None, service.llm is not None))
+    while True:
+        job = tasks.get()
+        if job is None:
+            break
+        for request_id, kind, prompt, context, profile in job:
+            try:
+                if kind == "stream":
+                    service._stream_sync(
+                        prompt,
+                        context,
+                        lambda token, rid=request_id: results.put(("token", worker_id, rid, token)),
+                        profile,
+                    )
+                else:
+                    results.put(("result", worker_id, request_id, service._generate_sync(prompt, context, profile)))
+            except Exception as e:
+                results.put(("error", worker_id, request_id, str(e)))
+        results.put(("idle", worker_id, None, None))
+
+
+@dataclass
+class PoolRequest:
+    id: int
+    kind: str  # "complete" or "stream"
+    prompt: str
+    context: Optional[str]
+    profile: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    future: Optional[asyncio.Future] = None
+    tokens: Optional[asyncio.Queue] = None
+    cancelled: bool = False
+
+    @property
+    def batchable(self) -> bool:
+        return self.kind == "complete" and len(self.prompt) <= settings.GGUF_POOL_BATCH_MAX_PROMPT_CHARS
+
+
+class PoolBusy(Exception):
+    """Raised when the request queue is at ``GGUF_POOL_QUEUE_DEPTH``."""
+
+
+class GGUFWorkerPool:
+    name = "gguf_pool"
+
+    def __init__(
+        self,
+        workers: int = None,
+        threads_per_worker: int = None,
+        queue_depth: int = None,
+        timeout: float = None,
+        batch_size: int = None,
+    ):
+        self.workers = workers or settings.GGUF_POOL_WORKERS
+        self.threads_per_worker = threads_per_worker or settings.GGUF_POOL_THREADS_PER_WORKER
+        self.queue_depth = queue_depth or settings.GGUF_POOL_QUEUE_DEPTH
+        self.timeout = timeout or settings.GGUF_POOL_TIMEOUT_SECONDS
+        self.batch_size = max(1, batch_size or settings.GGUF_POOL_BATCH_SIZE)
+
+        self._ctx = mp.get_context("spawn")
+        self._results = self._ctx.Queue()
+        self._processes: Dict[int, mp.Process] = {}
+        self._task_queues: Dict[int, "mp.Queue"] = {}
+        self._inflight: Dict[int, List[int]] = {}
+        self._restarts: Dict[int, int] = {}
+        self._requests: Dict[int, PoolRequest] = {}
+        self._ids = itertools.count()
+        self._seq = itertools.count()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._carry: Optional[tuple] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._reader: Optional[threading.Thread] = None
+        self._closing = False
+
+    # -- lifecycle -------------------------------------------------------------
+
+    def _spawn(self, worker_id: int) -> None:
+        tasks = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self.threads_per_worker, tasks, self._results),
+            name=f"gguf-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        self._processes[worker_id] = process
+        self._task_queues[worker_id] = tasks
+        self._inflight[worker_id] = []
+
+    def _ensure_started(self) -> None:
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.PriorityQueue(maxsize=self.queue_depth)
+        self._idle = asyncio.Queue()
+        for worker_id in range(self.workers):
+            self._spawn(worker_id)
+        self._reader = threading.Thread(target=self._read_results, name="gguf-pool-results", daemon=True)
+        self._reader.start()
+        self._tasks = [
+            asyncio.create_task(self._dispatch()),
+            asyncio.create_task(self._monitor()),
+        ]
+        logging.info(
+            f"Started GGUF worker pool: {self.workers} workers x {self.threads_per_worker} threads"
+        )
+
+    async def aclose(self) -> None:
+        if self._loop is None:
+            return
+        self._closing = True
+        for task in self._tasks:
+            task.cancel()
+        for tasks in self._task_queues.values():
+            tasks.put(None)
+        for process in self._processes.values():
+            await asyncio.to_thread(process.join, 5)
+            if process.is_alive():
+                process.terminate()
+        self._results.put(None)
+        for request in list(self._requests.values()):
+            self._finish(request, error="pool closed")
+
+    # -- result handling -------------------------------------------------------
+
+    def _read_results(self) -> None:
+        """Blocking reader thread; hands every worker message to the event loop."""
+        while True:
+            message = self._results.get()
+            if message is None:
+                return
+            self._loop.call_soon_threadsafe(self._on_message, *message)
+
+    def _on_message(self, kind: str, worker_id: int, request_id: Optional[int], payload) -> None:
+        if kind == "ready":
+            if not payload:
+                logging.error(f"GGUF worker {worker_id} failed to load the model")
+            self._idle.put_nowait(worker_id)
+            return
+        if kind == "idle":
+            self._inflight[worker_id] = []
+            self._idle.put_nowait(worker_id)
+            return
+        request = self._requests.get(request_id)
+        if request is None:
+            return
+        if kind == "token":
+            if payload is None:
+                self._finish(request)
+            elif request.tokens is not None:
+                request.tokens.put_nowait(payload)
+        elif kind == "result":
+            self._finish(request, result=payload)
+        else:
+            self._finish(request, error=payload)
+
+    def _finish(self, request: PoolRequest, result: Optional[str] = None, error: Optional[str] = None) -> None:
+        self._requests.pop(request.id, None)
+        if request.future is not None and not request.future.done():
+            if error is not None:
+                request.future.set_exception(RuntimeError(error))
+            else:
+                request.future.set_result(result)
+        if request.tokens is not None:
+            if error is not None:
+                logging.error(f"GGUF pool stream failed: {error}")
+            request.tokens.put_nowait(None)
+
+    # -- scheduling ------------------------------------------------------------
+
+    async def _next(self) -> PoolRequest:
+        if self._carry is not None:
+            item, self._carry = self._carry, None
+            return item[2]
+        return (await self._queue.get())[2]
+
+    async def _dispatch(self) -> None:
+        while True:
+            worker_id = await self._idle.get()
+            # Skip dead workers and duplicate idle notices (e.g. "ready" after a restart)
+            if not self._processes[worker_id].is_alive() or self._inflight[worker_id]:
+                continue
+            first = await self._next()
+            if first.cancelled:
+                self._idle.put_nowait(worker_id)
+                continue
+            job = [first]
+            # Micro-batch further short prompts that are already waiting
+            while first.batchable and len(job) < self.batch_size and not self._queue.empty():
+                item = self._queue.get_nowait()
+                request = item[2]
+                if request.cancelled:
+                    continue
+                if not request.batchable:
+                    self._carry = item
+                    break
+                job.append(request)
+            now = time.perf_counter()
+            for request in job:
+                metrics.observe("gguf_pool_queue_wait", now - request.enqueued_at)
+            metrics.incr("gguf_pool_jobs")
+            metrics.incr("gguf_pool_requests", len(job))
+            metrics.set_gauge("gguf_pool_queue_depth", self._queue.qsize())
+            self._inflight[worker_id] = [r.id for r in job]
+            self._task_queues[worker_id].put([(r.id, r.kind, r.prompt, r.context, r.profile) for r in job])
+
+    async def _monitor(self) -> None:
+        """Fail the in-flight work of crashed workers and replace them."""
+        while True:
+            await asyncio.sleep(1.0)
+            if self._closing:
+                return
+            for worker_id, process in list(self._processes.items()):
+                if process.is_alive() or process.exitcode is None:
+                    continue
+                for request_id in self._inflight.get(worker_id, []):
+                    request = self._requests.get(request_id)
+                    if request is not None:
+                        self._finish(request, error="worker crashed")
+                self._inflight[worker_id] = []
+                restarts = self._restarts.get(worker_id, 0)
+                if restarts >= MAX_RESTARTS:
+                    continue
+                logging.error(f"GGUF worker {worker_id} exited with code {process.exitcode}; restarting")
+                metrics.incr("gguf_pool_worker_restarts")
+                self._restarts[worker_id] = restarts + 1
+                self._spawn(worker_id)
+
+    def _submit(self, kind: str, prompt: str, context: Optional[str], profile: Optional[str] = None) -> PoolRequest:
+        self._ensure_started()
+        if self._queue.full():
+            metrics.incr("gguf_pool_rejected")
+            raise PoolBusy()
+        request = PoolRequest(id=next(self._ids), kind=kind, prompt=prompt, context=context, profile=profile)
+        if kind == "stream":
+            request.tokens = asyncio.Queue()
+        else:
+            request.future = self._loop.create_future()
+        self._requests[request.id] = request
+        self._queue.put_nowait((int(current_priority.get()), next(self._seq), request))
+        metrics.set_gauge("gguf_pool_queue_depth", self._queue.qsize())
+        return request
+
+    # -- provider interface ----------------------------------------------------
+
+    async def generate_response(self, prompt: str, context: str = None, profile: Optional[str] = None) -> str:
+        try:
+            request = self._submit("complete", prompt, context, profile)
+        except PoolBusy:
+            return UNAVAILABLE_MESSAGE
+        try:
+            return await asyncio.wait_for(asyncio.shield(request.future), self.timeout)
+        except asyncio.TimeoutError:
+            request.cancelled = True
+            self._requests.pop(request.id, None)
+            metrics.incr("gguf_pool_timeouts")
+            logging.error("GGUF pool request timed out")
+        except Exception as e:
+            logging.error(f"GGUF pool generation error: {e}")
+        return UNAVAILABLE_MESSAGE
+
+    async def stream_response(
+        self, prompt: str, context: str = None, profile: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        try:
+            request = self._submit("stream", prompt, context, profile)
+        except PoolBusy:
+            yield UNAVAILABLE_MESSAGE
+            return
+        deadline = time.perf_counter() + self.timeout
+        try:
+            while True:
+                remaining = deadline - time.perf_counter()
+                token = await asyncio.wait_for(request.tokens.get(), max(remaining, 0.001))
+                if token is None:
+                    break
+                yield token
+        except asyncio.TimeoutError:
+            metrics.incr("gguf_pool_timeouts")
+            logging.error("GGUF pool stream timed out")
+        finally:
+            request.cancelled = True
+            self._requests.pop(request.id, None)
+
+    async def generate_question(self, skill: str, difficulty: str = "intermediate") -> str:
+        prompt = TECHNICAL_QUESTION_PROMPT.format(skill=skill)
+        return await self.generate_response(prompt, profile="question")
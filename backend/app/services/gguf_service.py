@@ -1,13 +1,33 @@
+import asyncio
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Optional
 from llama_cpp import Llama
 from ..config import settings
+from ..metrics import metrics
+from .generation_profiles import get_profile, record_generation
+from .prefix_cache import PrefixStateCache, prefix_key
 from ..system_prompt import SYSTEM_PROMPT, TECHNICAL_QUESTION_PROMPT
 
 import os
 from dotenv import load_dotenv
 load_dotenv()
 
+BUSY_MESSAGE = "Sorry, the AI assistant is currently unavailable. Please try again in a moment."
+
 class GGUFService:
+    """Local llama.cpp backend.
+
+    Inference is CPU-bound and blocking, so it is offloaded to a small thread
+    pool. At most ``GGUF_MAX_PENDING`` requests may be running or waiting on
+    it; beyond that a request gets the "unavailable" reply at once instead of
+    queueing unbounded work behind the model.
+    """
+
+    name = "gguf"
+
     def __init__(self):
         self.model_path = os.getenv("GGUF_MODEL_PATH")
         self.model_name = os.getenv("GGUF_MODEL_NAME", "local-llm")
@@ -20,48 +40,217 @@ class GGUFService:
             threads = "4"
         self.n_threads = int(threads)
         self.n_gpu_layers = int(os.getenv("GGUF_GPU_LAYERS", "0"))
-        
-        try:
-            self.llm = Llama(
-                model_path=self.model_path,
-                n_ctx=self.n_ctx,
-                n_threads=self.n_threads,
-                n_gpu_layers=self.n_gpu_layers,
-                verbose=False
-            )
-            logging.info(f"Loaded GGUF model: {self.model_name} from {self.model_path}")
-        except Exception as e:
-            logging.error(f"Failed to load GGUF model: {e}")
-            self.llm = None
+        # A single Llama instance is not thread-safe; keep one executor worker
+        # unless several model instances are configured elsewhere.
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gguf")
+        self._pending = asyncio.Semaphore(settings.GGUF_MAX_PENDING)
+        self.prefix_cache = (
+            PrefixStateCache(settings.GGUF_PREFIX_CACHE_ENTRIES, settings.GGUF_PREFIX_CACHE_DIR)
+            if settings.GGUF_PREFIX_CACHE_ENTRIES > 0 else None
+        )
+        # Key of the prefix whose evaluated state is currently loaded in the model
+        self._active_prefix: Optional[str] = None
+        # Weights are loaded on first use (or by the startup warmup), not at import
+        self._llm: Optional[Llama] = None
+        self._load_attempted = False
+        self._load_lock = threading.Lock()
+
+    @property
+    def llm(self) -> Optional[Llama]:
+        if not self._load_attempted:
+            self.load()
+        return self._llm
+
+    def load(self) -> Optional[Llama]:
+        """Load the weights once; blocking, so call it off the event loop."""
+        with self._load_lock:
+            if self._load_attempted:
+                return self._llm
+            try:
+                self._llm = Llama(
+                    model_path=self.model_path,
+                    n_ctx=self.n_ctx,
+                    n_threads=self.n_threads,
+                    n_gpu_layers=self.n_gpu_layers,
+                    verbose=False
+                )
+                logging.info(f"Loaded GGUF model: {self.model_name} from {self.model_path}")
+            except Exception as e:
+                logging.error(f"Failed to load GGUF model: {e}")
+                self._llm = None
+            self._load_attempted = True
+        return self._llm
     
-    def generate_response(self, prompt: str, context: str = None) -> str:
-        if not self.llm:
-            return "Sorry, the AI assistant is currently unavailable. Model failed to load."
-        
+    def _prefix(self, context: str = None) -> str:
+        """Leading part of every prompt for ``context``; identical across calls."""
         system_context = context if context else SYSTEM_PROMPT
         
-        formatted_prompt = f"""<|system|>
+        return f"""<|system|>
                                 {system_context}
                                 
                                 <|user|>
-                                {prompt}
+                                """
+
+    def _format_prompt(self, prompt: str, context: str = None) -> str:
+        return f"""{self._prefix(context)}{prompt}
                                 <|assistant|>"""
+
+    def _restore_prefix(self, prefix: str) -> None:
+        """Make the evaluated ``prefix`` state current so only the suffix is evaluated.
+
+        llama.cpp already reuses the longest matching token prefix of whatever
+        is loaded, so a snapshot is only restored when the prefix changed since
+        the previous call (or on the first call after a restart).
+        """
+        if self.prefix_cache is None:
+            return
+        key = prefix_key(self.model_name, prefix)
+        if key == self._active_prefix:
+            metrics.incr("gguf_prefix_cache_hits", tier="resident")
+            return
+        try:
+            state = self.prefix_cache.get(key)
+            if state is None:
+                started = time.perf_counter()
+                tokens = self.llm.tokenize(prefix.encode("utf-8"), special=True)
+                self.llm.reset()
+                self.llm.eval(tokens)
+                metrics.observe("gguf_prefix_eval", time.perf_counter() - started)
+                self.prefix_cache.put(key, self.llm.save_state())
+            else:
+                self.llm.load_state(state)
+            self._active_prefix = key
+        except Exception as e:
+            self._active_prefix = None
+            logging.warning(f"GGUF prefix cache unavailable, evaluating full prompt: {e}")
+
+    def _complete_sync(
+        self,
+        prompt: str,
+        context: str = None,
+        emit: Optional[Callable[[str], None]] = None,
+        profile: Optional[str] = None,
+    ) -> str:
+        """Run one completion on the executor thread, optionally forwarding tokens to ``emit``.
+
+        Tokens are always pulled from llama.cpp's stream so the time to the
+        first token (prompt evaluation) can be recorded separately.
+        """
+        gen = get_profile(profile)
+        self._restore_prefix(self._prefix(context))
+        started = time.perf_counter()
+        first_token_at = None
+        parts = []
+        tokens = 0
+        for chunk in self.llm(
+            self._format_prompt(prompt, context),
+            max_tokens=gen.max_tokens,
+            temperature=gen.temperature,
+            top_p=gen.top_p,
+            stop=["<|user|>", "<|system|>", *gen.stop],
+            echo=False,
+            stream=True,
+        ):
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+                metrics.observe("gguf_prompt_eval", first_token_at - started)
+            # llama.cpp streams exactly one token per chunk
+            tokens += 1
+            text = chunk["choices"][0]["text"]
+            if text:
+                parts.append(text)
+                if emit is not None:
+                    emit(text)
+        elapsed = time.perf_counter() - started
+        metrics.observe("gguf_completion", elapsed)
+        result = "".join(parts).strip()
+        record_generation(gen, self.name, elapsed, completion_tokens=tokens, text=result)
+        return result
+
+    def _generate_sync(self, prompt: str, context: str = None, profile: Optional[str] = None) -> str:
+        if not self.llm:
+            return "Sorry, the AI assistant is currently unavailable. Model failed to load."
         
         try:
-            response = self.llm(
-                formatted_prompt,
-                max_tokens=512,
-                temperature=0.7,
-                top_p=0.9,
-                stop=["<|user|>", "<|system|>"],
-                echo=False
-            )
-            
-            return response["choices"][0]["text"].strip()
+            return self._complete_sync(prompt, context, profile=profile)
         except Exception as e:
+            self._active_prefix = None
             logging.error(f"GGUF model generation error: {e}")
             return "Sorry, the AI assistant encountered an error. Please try again."
     
-    def generate_question(self, skill: str, difficulty: str = "intermediate") -> str:
+    def _busy(self) -> bool:
+        """True when ``GGUF_MAX_PENDING`` requests are already in flight.
+
+        Checked right before ``async with self._pending``, which then never
+        waits: nothing can take a slot in between on the event loop.
+        """
+        if self._pending.locked():
+            metrics.incr("gguf_rejected")
+            return True
+        return False
+
+    async def generate_response(self, prompt: str, context: str = None, profile: Optional[str] = None) -> str:
+        if self._busy():
+            return BUSY_MESSAGE
+        async with self._pending:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self._generate_sync, prompt, context, profile)
+
+    def _stream_sync(
+        self,
+        prompt: str,
+        context: str,
+        emit: Callable[[Optional[str]], None],
+        profile: Optional[str] = None,
+    ) -> None:
+        """Run a streaming completion in the executor, handing each token to ``emit``.
+
+        ``emit(None)`` always signals the end of the stream. A failure before
+        the first token yields the same apology as ``_generate_sync``.
+        """
+        produced = []
+
+        def forward(token: str) -> None:
+            produced.append(token)
+            emit(token)
+
+        try:
+            if not self.llm:
+                emit("Sorry, the AI assistant is currently unavailable. Model failed to load.")
+                return
+            self._complete_sync(prompt, context, forward, profile)
+        except Exception as e:
+            self._active_prefix = None
+            logging.error(f"GGUF model streaming error: {e}")
+            if not produced:
+                emit("Sorry, the AI assistant encountered an error. Please try again.")
+        finally:
+            emit(None)
+
+    async def stream_response(
+        self, prompt: str, context: str = None, profile: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        if self._busy():
+            yield BUSY_MESSAGE
+            return
+        async with self._pending:
+            loop = asyncio.get_running_loop()
+            queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+
+            def emit(token: Optional[str]) -> None:
+                loop.call_soon_threadsafe(queue.put_nowait, token)
+
+            future = loop.run_in_executor(self.executor, self._stream_sync, prompt, context, emit, profile)
+            while True:
+                token = await queue.get()
+                if token is None:
+                    break
+                yield token
+            await future
+
+    async def generate_question(self, skill: str, difficulty: str = "intermediate") -> str:
         prompt = TECHNICAL_QUESTION_PROMPT.format(skill=skill)
-        return self.generate_response(prompt)
\ No newline at end of file
+        return await self.generate_response(prompt, profile="question")
+
+    async def aclose(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
\ No newline at end of file
@@ -1,23 +1,40 @@
 import logging
 import os
-from typing import Optional, List
+import time
+from typing import AsyncIterator, Optional, List
 from dotenv import load_dotenv
 
-from groq import Groq  # type: ignore
+from groq import AsyncGroq, RateLimitError  # type: ignore
 
+from ..config import settings
 from ..system_prompt import SYSTEM_PROMPT, TECHNICAL_QUESTION_PROMPT
+from .generation_profiles import GenerationProfile, get_profile, record_generation
+from .model_catalog import ModelCatalog
+from .rate_limiter import RateLimited, RateLimitScheduler, estimate_tokens, parse_duration
 
 load_dotenv()
 
+RATE_LIMITED_MESSAGE = "Sorry, the AI assistant is busy right now. Please try again in a moment."
+
+
+def _retry_after(error: RateLimitError) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    return parse_duration(headers.get("retry-after") or headers.get("x-ratelimit-reset-tokens"))
+
 
 class GroqService:
     """LLM service backed by Groq's hosted models.
 
+    Uses the native async Groq client so a slow completion only suspends the
+    awaiting request instead of blocking the whole event loop.
+
     Expects environment variables:
       - GROQ_API: API key string
                     - GROQ_MODEL: Optional model name (auto-selected if not set)
     """
 
+    name = "groq"
+
     def __init__(self):
         self.api_key = os.getenv("GROQ_API")
         if not self.api_key:
@@ -25,32 +42,70 @@ class GroqService:
 
         # If model not provided, will auto-select from available Groq models
         env_model = os.getenv("GROQ_MODEL") or "llama-3.1-8b-instant"
-        self.model: Optional[str] = env_model if env_model and env_model.strip() else None
+        configured: Optional[str] = env_model if env_model and env_model.strip() else None
+        self.catalog = ModelCatalog(
+            self._list_models,
+            self._rank_models,
+            configured=configured,
+            ttl_seconds=settings.GROQ_MODEL_CATALOG_TTL_SECONDS,
+            path=settings.GROQ_MODEL_CATALOG_PATH,
+        )
+        self.scheduler = RateLimitScheduler(
+            rpm=settings.GROQ_RATE_LIMIT_RPM,
+            tpm=settings.GROQ_RATE_LIMIT_TPM,
+            degraded_model=settings.GROQ_DEGRADED_MODEL,
+            interactive_max_wait=settings.GROQ_RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS,
+            background_max_wait=settings.GROQ_RATE_LIMIT_BACKGROUND_MAX_WAIT_SECONDS,
+            reserve=settings.GROQ_RATE_LIMIT_BACKGROUND_RESERVE,
+            enabled=settings.GROQ_RATE_LIMIT_ENABLED,
+        )
 
         try:
-            self.client = Groq(api_key=self.api_key)
+            self.client = AsyncGroq(api_key=self.api_key)
         except Exception as e:
             logging.error(f"Failed to initialize Groq client: {e}")
             self.client = None
 
-    def _complete(self, model: str, prompt: str, system_context: str) -> str:
-        completion = self.client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_context},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.7,
-            max_tokens=512,
-            top_p=0.9,
-            stream=False,
-        )
+    async def _complete(self, model: str, prompt: str, system_context: str, gen: GenerationProfile) -> str:
+        """One completion once the rate-limit scheduler admits it (possibly on the degraded model)."""
+        estimate = estimate_tokens(system_context, prompt, max_tokens=gen.max_tokens)
+        model = await self.scheduler.admit(model, estimate)
+        started = time.perf_counter()
+        try:
+            raw = await self.client.chat.completions.with_raw_response.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_context},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=gen.temperature,
+                max_tokens=gen.max_tokens,
+                top_p=gen.top_p,
+                stop=list(gen.stop) or None,
+                stream=False,
+            )
+        except RateLimitError as e:
+            self.scheduler.penalize(model, _retry_after(e))
+            raise
+        self.scheduler.observe(model, raw.headers)
+        completion = await raw.parse()
         text = completion.choices[0].message.content if completion.choices else ""
-        return (text or "").strip()
+        text = (text or "").strip()
+        usage = getattr(completion, "usage", None)
+        self.scheduler.settle(model, estimate, getattr(usage, "total_tokens", None))
+        record_generation(
+            gen,
+            self.name,
+            time.perf_counter() - started,
+            completion_tokens=getattr(usage, "completion_tokens", None),
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            text=text,
+        )
+        return text
 
-    def _list_models(self) -> List[str]:
+    async def _list_models(self) -> List[str]:
         try:
-            models = self.client.models.list()
+            models = await self.client.models.list()
             # SDK returns object with .data similar to OpenAI; be defensive
             ids: List[str] = []
             data = getattr(models, "data", None) or []
@@ -64,22 +119,14 @@ class GroqService:
             logging.error(f"GroqService failed to list models: {e}")
             return []
 
-    def _pick_supported_model(self, available: Optional[List[str]] = None) -> Optional[str]:
-        if available is None:
-            available = self._list_models()
-        if not available:
-            return None
+    @property
+    def model(self) -> Optional[str]:
+        return self.catalog.selected
 
-        # Prefer up-to-date Llama or Gemma chat-capable models
-        preferences = [
-            # Newer Llama variants first
-            "llama-\d", "llama3", "llama-", "llama",
-            # Then Gemma
-            "gemma", "gemma2",
-            # As a broad fallback, anything else
-            ""
-        ]
+    def _rank_models(self, available: List[str]) -> List[str]:
+        """Order available model ids best-first; run once per catalog fetch."""
 
+        # Prefer up-to-date Llama or Gemma chat-capable models
         def score(model_id: str) -> int:
             s = 0
             lower = model_id.lower()
@@ -100,10 +147,11 @@ class GroqService:
                     s += 5
             return s
 
-        ranked = sorted(available, key=score, reverse=True)
-        return ranked[0] if ranked else None
+        return sorted(available, key=score, reverse=True)
 
-    def generate_response(self, prompt: str, context: Optional[str] = None) -> str:
+    async def generate_response(
+        self, prompt: str, context: Optional[str] = None, profile: Optional[str] = None
+    ) -> str:
         """Generate a completion using Groq Chat Completions API with fallbacks."""
         if not self.client:
             return (
@@ -112,40 +160,39 @@ class GroqService:
             )
 
         system_context = context if context else SYSTEM_PROMPT
+        gen = get_profile(profile)
+
+        self.catalog.start()
 
         # Ensure we have a current model id; auto-select if missing
-        if not self.model:
-            selected = self._pick_supported_model()
-            if selected:
-                logging.info(f"GroqService auto-selected model: {selected}")
-                self.model = selected
-            else:
-                return (
-                    "Sorry, the AI assistant is currently unavailable due to a configuration issue. "
-                    "No supported Groq models were found."
-                )
+        model = await self.catalog.ensure_selected()
+        if not model:
+            return (
+                "Sorry, the AI assistant is currently unavailable due to a configuration issue. "
+                "No supported Groq models were found."
+            )
 
         # Try the configured/selected model first
         try:
-            return self._complete(self.model, prompt, system_context)
+            return await self._complete(model, prompt, system_context, gen)
+        except (RateLimited, RateLimitError) as e:
+            # Out of budget is not a model problem: shed the call instead of rediscovering models
+            logging.warning(f"Groq call for model '{model}' shed: {e}")
+            return RATE_LIMITED_MESSAGE
         except Exception as e:
             msg = str(e)
-            logging.error(f"Groq generate_response error with model '{self.model}': {msg}")
+            logging.error(f"Groq generate_response error with model '{model}': {msg}")
 
-            # If the model is decommissioned or invalid, query models and retry with best candidate
+            # If the model is decommissioned or invalid, switch to the catalog's best alternative
             decommissioned = "model_decommissioned" in msg or "decommissioned" in msg.lower()
             invalid = "invalid_request_error" in msg or "not found" in msg.lower()
 
             if decommissioned or invalid:
-                available = self._list_models()
-                # Remove current model if present
-                available = [m for m in available if m != self.model]
-                alt = self._pick_supported_model(available)
-                if alt:
+                alt = await self.catalog.replace(model)
+                if alt and alt != model:
                     try:
                         logging.info(f"GroqService retrying with discovered model: {alt}")
-                        self.model = alt
-                        return self._complete(alt, prompt, system_context)
+                        return await self._complete(alt, prompt, system_context, gen)
                     except Exception as e2:
                         logging.error(f"Groq discovered model '{alt}' failed: {e2}")
 
@@ -155,6 +202,74 @@ class GroqService:
             "Please try again in a moment."
         )
 
-    def generate_question(self, skill: str, difficulty: str = "intermediate") -> str:
+    async def stream_response(
+        self, prompt: str, context: Optional[str] = None, profile: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Stream completion tokens as Groq produces them.
+
+        If the stream fails before the first token, falls back to
+        ``generate_response`` so the model-discovery retry still applies.
+        """
+        model = self.model
+        if not self.client or not model:
+            yield await self.generate_response(prompt, context, profile)
+            return
+
+        system_context = context if context else SYSTEM_PROMPT
+        gen = get_profile(profile)
+        estimate = estimate_tokens(system_context, prompt, max_tokens=gen.max_tokens)
+        try:
+            model = await self.scheduler.admit(model, estimate)
+        except RateLimited as e:
+            logging.warning(f"Groq stream for model '{model}' shed: {e}")
+            yield RATE_LIMITED_MESSAGE
+            return
+        produced = False
+        chunks = 0
+        parts = []
+        started = time.perf_counter()
+        try:
+            raw = await self.client.chat.completions.with_raw_response.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_context},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=gen.temperature,
+                max_tokens=gen.max_tokens,
+                top_p=gen.top_p,
+                stop=list(gen.stop) or None,
+                stream=True,
+            )
+            self.scheduler.observe(model, raw.headers)
+            stream = await raw.parse()
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    produced = True
+                    # Streamed chunks carry roughly one token each
+                    chunks += 1
+                    parts.append(delta)
+                    yield delta
+            record_generation(
+                gen, self.name, time.perf_counter() - started, completion_tokens=chunks, text="".join(parts)
+            )
+            # No usage block in the stream: the prompt estimate plus the tokens actually produced
+            self.scheduler.settle(model, estimate, estimate - gen.max_tokens + chunks)
+        except RateLimitError as e:
+            self.scheduler.penalize(model, _retry_after(e))
+            if not produced:
+                yield RATE_LIMITED_MESSAGE
+        except Exception as e:
+            logging.error(f"Groq stream_response error with model '{model}': {e}")
+            if not produced:
+                yield await self.generate_response(prompt, context, profile)
+
+    async def generate_question(self, skill: str, difficulty: str = "intermediate") -> str:
         prompt = TECHNICAL_QUESTION_PROMPT.format(skill=skill)
-        return self.generate_response(prompt)
+        return await self.generate_response(prompt, profile="question")
+
+    async def aclose(self) -> None:
+        await self.catalog.stop()
+        if self.client is not None:
+            await self.client.close()
@@ -0,0 +1,103 @@
+"""Common interface implemented by every LLM backend.
+
+Routes depend on this protocol rather than a concrete service so the
+backend (Groq, Ollama, local GGUF, or a fake for benchmarks) can be
+swapped without touching the conversation flow.
+"""
+
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import AsyncIterator, Optional, Protocol, runtime_checkable
+
+# Every backend reports failures as a reply starting with this text rather
+# than raising, so the conversation always has something to show.
+UNAVAILABLE_PREFIX = "Sorry, the AI assistant"
+
+
+def is_unavailable(text: Optional[str]) -> bool:
+    """True for empty replies and the backends' apology fallbacks."""
+    return not text or text.startswith(UNAVAILABLE_PREFIX)
+
+
+@runtime_checkable
+class LLMProvider(Protocol):
+    """Awaitable text-completion provider."""
+
+    name: str
+
+    async def generate_response(
+        self, prompt: str, context: Optional[str] = None, profile: Optional[str] = None
+    ) -> str:
+        """Return the completion for ``prompt`` using ``context`` as system prompt.
+
+        ``profile`` names a generation profile (token budget, stop sequences,
+        temperature); see ``generation_profiles``.
+        """
+        ...
+
+    def stream_response(
+        self, prompt: str, context: Optional[str] = None, profile: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Yield completion text incrementally as the backend produces it."""
+        ...
+
+    async def generate_question(self, skill: str, difficulty: str = "intermediate") -> str:
+        """Return a technical interview question about ``skill``."""
+        ...
+
+    async def aclose(self) -> None:
+        """Release pooled connections / executors held by the provider."""
+        ...
+
+
+class Priority(IntEnum):
+    """Scheduling class of an LLM call; lower values are served first."""
+
+    INTERACTIVE = 0  # live candidate turn
+    BACKGROUND = 10  # prefetch, cache refresh, re-scoring
+
+
+# Priority of LLM calls made from the current task. Background workers set it
+# once at start-up; request handlers inherit the interactive default.
+current_priority: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+
+# The ``provider_id`` of the backend that produced the last reply in this
+# context. Set by providers that pick a backend per call (the router), so
+# callers can tell a failover or hedged reply from one by the preferred backend.
+answered_by: ContextVar[Optional[str]] = ContextVar("llm_answered_by", default=None)
+
+
+def provider_id(provider) -> str:
+    """Backend and model a provider answers with, e.g. ``groq:llama-3.1-8b-instant``."""
+    name = getattr(provider, "name", provider.__class__.__name__)
+    model = getattr(provider, "model", None) or getattr(provider, "model_name", None)
+    return f"{name}:{model or ''}"
+
+
+def build_provider(name: str) -> LLMProvider:
+    """Instantiate the provider configured by ``LLM_PROVIDER``.
+
+    Backends are imported lazily so optional dependencies (llama.cpp) are
+    only needed when that backend is selected.
+    """
+    name = (name or "groq").strip().lower()
+    if name == "groq":
+        from .groq_service import GroqService
+        return GroqService()
+    if name == "ollama":
+        from .ollama_service import OllamaService
+        return OllamaService()
+    if name == "gguf":
+        from .gguf_service import GGUFService
+        return GGUFService()
+    if name == "gguf_pool":
+        from .gguf_pool import GGUFWorkerPool
+        return GGUFWorkerPool()
+    if name == "router":
+        from .llm_router import LLMRouter
+        return LLMRouter.from_settings()
+    if name == "fake":
+        from .fake_service import FakeLLMService
+        return FakeLLMService()
+    raise ValueError(f"Unknown LLM_PROVIDER '{name}'")
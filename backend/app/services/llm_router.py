@@ -0,0 +1,321 @@
+"""Latency-aware router over several LLM providers.
+
+Keeps an exponentially weighted moving average of each provider's latency
+plus a rolling error-rate circuit breaker, and sends every call to the
+fastest provider whose breaker is closed. For live candidate turns it can
+hedge: if the chosen provider has not answered by its recent p95 latency, a
+second provider is asked as well and the first successful reply wins.
+
+A call counts as failed if it raises, times out, or returns the backends'
+"Sorry, the AI assistant ..." fallback text.
+
+``model`` names the provider calls would go to right now, and each
+successful ``generate_response`` sets ``answered_by`` to the one that
+actually replied, so memoized results can be keyed on the real backend.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator, List, Optional, Tuple
+
+from ..config import settings
+from ..metrics import metrics
+from ..system_prompt import TECHNICAL_QUESTION_PROMPT
+from .llm_provider import (
+    LLMProvider,
+    Priority,
+    answered_by,
+    build_provider,
+    current_priority,
+    is_unavailable,
+    provider_id,
+)
+
+UNAVAILABLE_MESSAGE = (
+    "Sorry, the AI assistant is currently unavailable due to a technical issue. "
+    "Please try again in a moment."
+)
+
+
+class CircuitBreaker:
+    """Closed -> open when the windowed error rate is too high; half-open after a cooldown."""
+
+    def __init__(self, window: int = 20, min_calls: int = 5, error_rate: float = 0.5, cooldown: float = 30.0):
+        self.window = deque(maxlen=window)
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.cooldown = cooldown
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            # Let exactly one probe through to test recovery
+            self._probing = True
+            return True
+        return False
+
+    def release(self) -> None:
+        """End a call that was neither a success nor a failure (e.g. cancelled), freeing the probe slot."""
+        self._probing = False
+
+    def record(self, ok: bool) -> None:
+        if self.opened_at is not None:
+            self._probing = False
+            if ok:
+                self.opened_at = None
+                self.window.clear()
+            else:
+                self.opened_at = time.monotonic()
+            return
+        self.window.append(ok)
+        failures = self.window.count(False)
+        if len(self.window) >= self.min_calls and failures / len(self.window) >= self.error_rate:
+            self.opened_at = time.monotonic()
+
+
+class ProviderState:
+    def __init__(self, provider: LLMProvider, alpha: float, breaker: CircuitBreaker):
+        self.provider = provider
+        self.name = getattr(provider, "name", provider.__class__.__name__)
+        self.alpha = alpha
+        self.breaker = breaker
+        self.ewma: Optional[float] = None
+        self.recent = deque(maxlen=50)
+
+    def observe(self, seconds: Optional[float], ok: bool) -> None:
+        """Record an outcome; ``seconds`` is None when the duration is not comparable (streams)."""
+        self.breaker.record(ok)
+        metrics.incr("llm_router_calls", provider=self.name, outcome="ok" if ok else "error")
+        metrics.set_gauge("llm_router_breaker_open", int(self.breaker.state != "closed"), provider=self.name)
+        if ok and seconds is not None:
+            self.observe_latency(seconds)
+
+    def observe_latency(self, seconds: float) -> None:
+        self.recent.append(seconds)
+        self.ewma = seconds if self.ewma is None else self.alpha * seconds + (1 - self.alpha) * self.ewma
+        metrics.set_gauge("llm_router_latency_ewma_ms", round(self.ewma * 1000, 1), provider=self.name)
+
+    def p95(self) -> Optional[float]:
+        if len(self.recent) < 5:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class LLMRouter:
+    name = "router"
+
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        timeout: float = 20.0,
+        hedge: bool = True,
+        hedge_min_delay: float = 0.3,
+        alpha: float = 0.2,
+        breaker_window: int = 20,
+        breaker_min_calls: int = 5,
+        breaker_error_rate: float = 0.5,
+        breaker_cooldown: float = 30.0,
+    ):
+        if not providers:
+            raise ValueError("LLMRouter needs at least one provider")
+        self.states = [
+            ProviderState(
+                p, alpha, CircuitBreaker(breaker_window, breaker_min_calls, breaker_error_rate, breaker_cooldown)
+            )
+            for p in providers
+        ]
+        self.timeout = timeout
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+
+    @classmethod
+    def from_settings(cls) -> "LLMRouter":
+        providers = []
+        for name in settings.LLM_ROUTER_PROVIDERS.split(","):
+            if not name.strip():
+                continue
+            try:
+                providers.append(build_provider(name))
+            except Exception as e:
+                logging.error(f"LLM router skipping provider '{name}': {e}")
+        return cls(
+            providers,
+            timeout=settings.LLM_ROUTER_TIMEOUT_SECONDS,
+            hedge=settings.LLM_ROUTER_HEDGE,
+            hedge_min_delay=settings.LLM_ROUTER_HEDGE_MIN_DELAY_MS / 1000,
+            alpha=settings.LLM_ROUTER_EWMA_ALPHA,
+            breaker_window=settings.LLM_ROUTER_BREAKER_WINDOW,
+            breaker_min_calls=settings.LLM_ROUTER_BREAKER_MIN_CALLS,
+            breaker_error_rate=settings.LLM_ROUTER_BREAKER_ERROR_RATE,
+            breaker_cooldown=settings.LLM_ROUTER_BREAKER_COOLDOWN_SECONDS,
+        )
+
+    @property
+    def model(self) -> Optional[str]:
+        """``provider_id`` of the provider the next call would go to first."""
+        for state in self._ranked():
+            if state.breaker.state == "closed" or not state.breaker._probing:
+                return provider_id(state.provider)
+        return None
+
+    def _ranked(self) -> List[ProviderState]:
+        """Providers with a closed (or probing) breaker, fastest first.
+
+        Providers without a latency sample yet sort first so each one gets
+        measured; ties keep the configured preference order.
+        """
+        candidates = [s for s in self.states if s.breaker.state != "open"]
+        return sorted(candidates, key=lambda s: -1.0 if s.ewma is None else s.ewma)
+
+    async def _call(
+        self, state: ProviderState, prompt: str, context: Optional[str], profile: Optional[str] = None
+    ) -> Optional[str]:
+        started = time.perf_counter()
+        try:
+            text = await asyncio.wait_for(state.provider.generate_response(prompt, context, profile), self.timeout)
+            ok = not is_unavailable(text)
+        except asyncio.CancelledError:
+            # Lost a hedge race: says nothing about health, but the provider
+            # was at least this slow. Only a lower bound, so it may raise the
+            # estimate (or seed an untested provider) but never lower it.
+            elapsed = time.perf_counter() - started
+            if state.ewma is None or elapsed > state.ewma:
+                state.observe_latency(elapsed)
+            # If this was the half-open probe, let the next call probe instead
+            state.breaker.release()
+            raise
+        except Exception as e:
+            logging.error(f"LLM router: provider '{state.name}' failed: {e}")
+            text, ok = None, False
+        state.observe(time.perf_counter() - started, ok)
+        return text if ok else None
+
+    async def _hedged(
+        self,
+        primary: ProviderState,
+        backup: ProviderState,
+        prompt: str,
+        context: Optional[str],
+        profile: Optional[str] = None,
+    ) -> Tuple[Optional[str], ProviderState]:
+        """The first successful reply and the provider that gave it."""
+        delay = max(primary.p95() or 0.0, self.hedge_min_delay)
+        first = asyncio.create_task(self._call(primary, prompt, context, profile))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            result = first.result()
+            if result is not None:
+                return result, primary
+            # The primary failed fast; fall back without waiting further
+            if not backup.breaker.allow():
+                return None, primary
+            return await self._call(backup, prompt, context, profile), backup
+        if not backup.breaker.allow():
+            return await first, primary
+        metrics.incr("llm_router_hedges")
+        second = asyncio.create_task(self._call(backup, prompt, context, profile))
+        pending = {first, second}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result is not None:
+                        winner = primary if task is first else backup
+                        metrics.incr("llm_router_hedge_wins", provider=winner.name)
+                        return result, winner
+            return None, primary
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def generate_response(
+        self, prompt: str, context: Optional[str] = None, profile: Optional[str] = None
+    ) -> str:
+        ranked = self._ranked()
+        hedge = self.hedge and current_priority.get() == Priority.INTERACTIVE
+        answered_by.set(None)
+        i = 0
+        while i < len(ranked):
+            state = ranked[i]
+            if not state.breaker.allow():
+                i += 1
+                continue
+            backup = ranked[i + 1] if hedge and i + 1 < len(ranked) else None
+            if backup is not None:
+                result, answered = await self._hedged(state, backup, prompt, context, profile)
+                i += 2
+            else:
+                result, answered = await self._call(state, prompt, context, profile), state
+                i += 1
+            if result is not None:
+                answered_by.set(provider_id(answered.provider))
+                return result
+        metrics.incr("llm_router_exhausted")
+        return UNAVAILABLE_MESSAGE
+
+    async def stream_response(
+        self, prompt: str, context: Optional[str] = None, profile: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Stream from the fastest healthy provider, moving on if it fails before the first token."""
+        for state in self._ranked():
+            if not state.breaker.allow():
+                continue
+            produced = []
+            finished = False
+            try:
+                async for token in state.provider.stream_response(prompt, context, profile):
+                    if not produced and is_unavailable(token):
+                        break
+                    produced.append(token)
+                    yield token
+                finished = True
+            except Exception as e:
+                logging.error(f"LLM router: provider '{state.name}' stream failed: {e}")
+                finished = True
+            finally:
+                if not finished:
+                    # Closed or cancelled by the consumer: no verdict, but free a half-open probe
+                    state.breaker.release()
+            state.observe(None, bool(produced))
+            if produced:
+                return
+        metrics.incr("llm_router_exhausted")
+        yield UNAVAILABLE_MESSAGE
+
+    async def generate_question(self, skill: str, difficulty: str = "intermediate") -> str:
+        prompt = TECHNICAL_QUESTION_PROMPT.format(skill=skill)
+        return await self.generate_response(prompt, profile="question")
+
+    async def aclose(self) -> None:
+        for state in self.states:
+            try:
+                await state.provider.aclose()
+            except Exception as e:
+                logging.warning(f"LLM router: closing '{state.name}' failed: {e}")
+
+    def status(self) -> List[dict]:
+        return [
+            {
+                "provider": s.name,
+                "breaker": s.breaker.state,
+                "latency_ewma_ms": round(s.ewma * 1000, 1) if s.ewma is not None else None,
+                "latency_p95_ms": round(s.p95() * 1000, 1) if s.p95() is not None else None,
+            }
+            for s in self.states
+        ]
@@ -0,0 +1,166 @@
+"""Content-addressed memoization for deterministic per-answer work.
+
+The same short replies ("I don't know", "5 years", "Python, Django") show up
+across thousands of candidates, and each one used to be re-parsed by spaCy
+or re-extracted by the LLM. ``MemoCache`` keys results by a hash of the
+whitespace-normalised input plus a version tag, keeps them in a bounded
+in-process LRU, and can share them across workers through an optional
+``memo_cache`` Mongo collection.
+
+The version tag has two parts. ``tag`` is fixed for the process (a prompt
+template's hash, the scorer version; a callable is resolved lazily), so
+editing one prompt in ``system_prompt.py`` only invalidates that prompt's
+namespace, and stale Mongo entries can be purged at start-up. ``model`` is resolved per call (the selected LLM can change at
+runtime) and is only part of the key.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from ..metrics import metrics
+
+
+def normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def template_tag(template: str) -> str:
+    """Short stable hash of a prompt template."""
+    return hashlib.sha1(template.encode("utf-8")).hexdigest()[:12]
+
+
+class MemoCache:
+    def __init__(
+        self,
+        namespace: str,
+        tag: Union[str, Callable[[], str]],
+        model: Union[str, Callable[[], str]] = "",
+        max_entries: int = 10000,
+        collection_getter: Optional[Callable] = None,
+        encode: Callable[[Any], Any] = lambda value: value,
+        decode: Callable[[Any], Any] = lambda value: value,
+    ):
+        self.namespace = namespace
+        self.tag = tag
+        self.model = model
+        self.max_entries = max_entries
+        # Shared tier; None keeps the cache process-local
+        self.collection_getter = collection_getter
+        self.encode = encode
+        self.decode = decode
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+
+    def _tag(self) -> str:
+        return self.tag() if callable(self.tag) else self.tag
+
+    def key(self, text: str) -> str:
+        model = self.model() if callable(self.model) else self.model
+        raw = "\0".join([self.namespace, self._tag(), model or "", normalize(text)])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, text: str) -> Optional[Any]:
+        key = self.key(text)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            metrics.incr("memo_cache_hits", ns=self.namespace, tier="memory")
+            return self._entries[key]
+        if self.collection_getter is not None:
+            try:
+                doc = await asyncio.to_thread(lambda: self.collection_getter().find_one({"_id": key}))
+            except Exception as e:
+                logging.warning(f"Memo cache lookup failed for '{self.namespace}': {e}")
+                doc = None
+            if doc is not None:
+                value = self.decode(doc["value"])
+                self._remember(key, value)
+                metrics.incr("memo_cache_hits", ns=self.namespace, tier="mongo")
+                return value
+        metrics.incr("memo_cache_misses", ns=self.namespace)
+        return None
+
+    async def put(self, text: str, value: Any) -> None:
+        key = self.key(text)
+        self._remember(key, value)
+        if self.collection_getter is None:
+            return
+        doc = {
+            "_id": key,
+            "ns": self.namespace,
+            "tag": self._tag(),
+            "value": self.encode(value),
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            await asyncio.to_thread(lambda: self.collection_getter().replace_one({"_id": key}, doc, upsert=True))
+        except Exception as e:
+            logging.warning(f"Memo cache write failed for '{self.namespace}': {e}")
+
+    async def get_or_compute(
+        self,
+        text: str,
+        compute: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        cached = await self.get(text)
+        if cached is not None:
+            return cached
+        value = await compute()
+        if value is not None and cacheable(value):
+            await self.put(text, value)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def purge_stale(self) -> int:
+        """Delete this namespace's shared entries written under another tag (an edited prompt)."""
+        if self.collection_getter is None:
+            return 0
+        try:
+            result = await asyncio.to_thread(
+                lambda: self.collection_getter().delete_many({"ns": self.namespace, "tag": {"$ne": self._tag()}})
+            )
+            return result.deleted_count
+        except Exception as e:
+            logging.warning(f"Memo cache purge failed for '{self.namespace}': {e}")
+            return 0
+
+
+def hit_rates() -> Dict[str, float]:
+    """Share of lookups answered from either tier, per namespace."""
+    snapshot = metrics.snapshot()["counters"]
+    totals: Dict[str, Dict[str, float]] = {}
+    for name, value in snapshot.items():
+        match = re.match(r"memo_cache_(hits|misses)\{(.*)\}", name)
+        if not match:
+            continue
+        labels = dict(part.split("=", 1) for part in match.group(2).split(","))
+        entry = totals.setdefault(labels["ns"], {"hits": 0, "misses": 0})
+        entry[match.group(1)] += value
+    return {
+        ns: round(t["hits"] / (t["hits"] + t["misses"]), 4) if t["hits"] + t["misses"] else 0.0
+        for ns, t in totals.items()
+    }
+
+
+async def ensure_indexes(collection_getter: Callable, ttl_days: int) -> None:
+    try:
+        await asyncio.to_thread(lambda: collection_getter().create_index([("ns", 1), ("tag", 1)]))
+        if ttl_days > 0:
+            await asyncio.to_thread(
+                lambda: collection_getter().create_index("created_at", expireAfterSeconds=ttl_days * 86400)
+            )
+    except Exception as e:
+        logging.warning(f"Could not create memo cache indexes: {e}")
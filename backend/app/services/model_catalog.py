@@ -0,0 +1,199 @@
+"""Cached catalog of available hosted models and the currently selected one.
+
+``GroqService`` used to list models inside the request path on every
+decommission/invalid-model error and re-rank them each time. The catalog
+fetches the list at most once per TTL, collapses concurrent refreshes into a
+single in-flight fetch, ranks once per fetch, refreshes in the background,
+and persists the last-known-good selection to disk. Other worker processes
+pick a new selection up from that file, so a model switch made by one
+worker reaches all of them.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Awaitable, Callable, List, Optional, Set
+
+from ..metrics import metrics
+
+# Forced refreshes closer together than this reuse the previous fetch
+MIN_REFRESH_INTERVAL = 5.0
+# How often the persisted selection is checked for changes by other workers
+DISK_SYNC_INTERVAL = 5.0
+
+
+class ModelCatalog:
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[List[str]]],
+        rank: Callable[[List[str]], List[str]],
+        configured: Optional[str] = None,
+        ttl_seconds: float = 3600,
+        path: Optional[str] = None,
+    ):
+        self.fetch = fetch
+        self.rank = rank
+        self.configured = configured
+        self.ttl_seconds = ttl_seconds
+        self.path = path or None
+        self._models: List[str] = []
+        self._fetched_at = 0.0
+        self._selected: Optional[str] = configured
+        self._failed: Set[str] = set()
+        self._inflight: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+        self._disk_mtime = 0.0
+        self._disk_checked_at = 0.0
+        self._load()
+
+    # -- persistence -----------------------------------------------------------
+
+    def _load(self) -> bool:
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable model catalog {self.path}: {e}")
+            return False
+        self._disk_mtime = mtime
+        # A record made for a different GROQ_MODEL is stale configuration
+        if record.get("configured") != self.configured:
+            return False
+        if record.get("selected"):
+            self._selected = record["selected"]
+        self._models = record.get("models") or self._models
+        self._fetched_at = record.get("fetched_at", self._fetched_at)
+        self._failed.update(record.get("failed") or [])
+        return True
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        record = {
+            "configured": self.configured,
+            "selected": self._selected,
+            "models": self._models,
+            "fetched_at": self._fetched_at,
+            "failed": sorted(self._failed),
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(record, f, indent=2)
+            os.replace(tmp_path, self.path)
+            self._disk_mtime = os.path.getmtime(self.path)
+        except Exception as e:
+            logging.warning(f"Failed to persist model catalog to {self.path}: {e}")
+
+    def _sync_from_disk(self) -> None:
+        now = time.monotonic()
+        if not self.path or now - self._disk_checked_at < DISK_SYNC_INTERVAL:
+            return
+        self._disk_checked_at = now
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime != self._disk_mtime and self._load():
+            logging.info(f"Model catalog picked up selection from another worker: {self._selected}")
+
+    # -- selection -------------------------------------------------------------
+
+    @property
+    def selected(self) -> Optional[str]:
+        self._sync_from_disk()
+        return self._selected
+
+    def _select(self, model: str) -> None:
+        # Single assignment, so concurrent readers see the old or new model, never a mix
+        previous, self._selected = self._selected, model
+        if previous != model:
+            logging.info(f"Model catalog switched model: {previous} -> {model}")
+            metrics.incr("model_catalog_switches")
+        self._save()
+
+    def _best(self) -> Optional[str]:
+        return next((m for m in self._models if m not in self._failed), None)
+
+    async def refresh(self, force: bool = False) -> List[str]:
+        """Return the ranked model list, fetching it if stale; concurrent callers share one fetch."""
+        age = time.time() - self._fetched_at
+        if self._models and age < (MIN_REFRESH_INTERVAL if force else self.ttl_seconds):
+            return self._models
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._fetch())
+        else:
+            metrics.incr("model_catalog_coalesced")
+        return await asyncio.shield(self._inflight)
+
+    async def _fetch(self) -> List[str]:
+        metrics.incr("model_catalog_fetches")
+        models = await self.fetch()
+        if models:
+            self._models = self.rank(models)
+            self._fetched_at = time.time()
+            self._save()
+        # On an empty/failed listing the last-known-good list is kept
+        return self._models
+
+    async def ensure_selected(self) -> Optional[str]:
+        """Current model, auto-selecting the best available one if none is configured."""
+        if self.selected:
+            return self._selected
+        await self.refresh()
+        best = self._best()
+        if best:
+            self._select(best)
+        return best
+
+    async def replace(self, failed_model: str) -> Optional[str]:
+        """Switch away from a model the API rejected; returns the model to retry with.
+
+        Requests that fail on the same model at the same time share a single
+        catalog fetch, and all of them get the one replacement it chose.
+        """
+        if self.selected and self._selected != failed_model:
+            return self._selected
+        self._failed.add(failed_model)
+        await self.refresh(force=True)
+        if self._selected != failed_model:
+            return self._selected
+        alt = self._best()
+        if alt:
+            self._select(alt)
+        return alt
+
+    # -- background refresh ----------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.ttl_seconds)
+            try:
+                models = await self.refresh(force=True)
+                # Move off a model that vanished from the catalog before a request trips on it
+                if models and self._selected and self._selected not in models:
+                    self._failed.add(self._selected)
+                    best = self._best()
+                    if best:
+                        self._select(best)
+            except Exception as e:
+                logging.error(f"Model catalog background refresh failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
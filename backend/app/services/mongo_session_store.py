@@ -0,0 +1,99 @@
+"""Interview sessions in the ``sessions`` Mongo collection, shared by every worker.
+
+One document per interview. A turn's save is an update filtered on the
+version it loaded (or an insert for a new session, which the unique ``_id``
+makes atomic), so only one of two racing turns can win. Background scores
+are merged with ``$set``/``$inc`` on their own fields. Abandoned sessions
+are removed by a TTL index on ``updated_at``.
+
+Goes through the async motor client (``collection_getter`` returns an
+``AsyncIOMotorCollection``), like the candidate repository.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from pymongo.errors import DuplicateKeyError  # type: ignore
+
+from ..metrics import metrics
+from .session_store import TURN_FIELDS, InterviewSession
+
+
+class MongoSessionStore:
+    name = "mongo"
+
+    def __init__(self, collection_getter: Callable, ttl_seconds: float = 7200):
+        self.collection_getter = collection_getter
+        self.ttl_seconds = ttl_seconds
+
+    async def load(self, session_id: str) -> Optional[InterviewSession]:
+        doc = await self.collection_getter().find_one({"_id": session_id})
+        if doc is None:
+            return None
+        # The TTL monitor only runs once a minute; drop an expired document now so it can be recreated
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+        if doc.get("updated_at") and doc["updated_at"] < cutoff:
+            await self.collection_getter().delete_one({"_id": session_id, "updated_at": {"$lt": cutoff}})
+            metrics.incr("sessions_evicted", reason="idle")
+            return None
+        return InterviewSession.from_dict(session_id, doc)
+
+    async def save(self, session: InterviewSession) -> bool:
+        now = datetime.utcnow()
+        fields = {name: getattr(session, name) for name in TURN_FIELDS}
+        collection = self.collection_getter()
+        if session.version == 0:
+            doc = {
+                "_id": session.session_id,
+                **fields,
+                "version": 1,
+                "answer_metrics": {},
+                "score_total": 0.0,
+                "scored_answers": 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            try:
+                await collection.insert_one(doc)
+                saved = True
+            except DuplicateKeyError:
+                saved = False
+        else:
+            result = await collection.update_one(
+                {"_id": session.session_id, "version": session.version},
+                {"$set": {**fields, "updated_at": now}, "$inc": {"version": 1}},
+            )
+            saved = result.matched_count == 1
+        if not saved:
+            metrics.incr("session_cas_conflicts", backend=self.name)
+            return False
+        session.version += 1
+        return True
+
+    async def record_answer(self, session_id: str, key: str, answer_metrics: Dict, score: float) -> None:
+        await self.collection_getter().update_one(
+            {"_id": session_id},
+            {
+                "$set": {f"answer_metrics.{key}": answer_metrics},
+                "$inc": {"score_total": score, "scored_answers": 1},
+            },
+        )
+
+    async def discard(self, session_id: str, reason: str) -> bool:
+        result = await self.collection_getter().delete_one({"_id": session_id})
+        if result.deleted_count:
+            metrics.incr("sessions_evicted", reason=reason)
+        return bool(result.deleted_count)
+
+    async def ensure_indexes(self) -> None:
+        try:
+            await self.collection_getter().create_index("updated_at", expireAfterSeconds=int(self.ttl_seconds))
+        except Exception as e:
+            logging.warning(f"Could not create session TTL index: {e}")
+
+    def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
@@ -4,43 +4,122 @@ This file is retained for reference only after migrating to Groq.
 Prefer using `GroqService` in `groq_service.py`.
 """
 
-import requests
+import httpx
+import json
 import logging
+import time
+from typing import AsyncIterator, Optional
 from ..config import settings
 from ..system_prompt import SYSTEM_PROMPT, TECHNICAL_QUESTION_PROMPT
+from .generation_profiles import GenerationProfile, get_profile, record_generation
 
 import os
 from dotenv import load_dotenv
 load_dotenv()
 
 class OllamaService:
+    name = "ollama"
+
     def __init__(self):
         self.base_url = os.getenv("OLLAMA_BASE_URL")
         self.model = os.getenv("OLLAMA_MODEL")
+        # One pooled async client per service so keep-alive connections are
+        # reused across interview turns instead of reconnecting per call.
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url or settings.OLLAMA_BASE_URL,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=settings.OLLAMA_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OLLAMA_MAX_CONNECTIONS,
+            ),
+        )
     
-    def generate_response(self, prompt: str, context: str = None) -> str:
+    def _options(self, gen: GenerationProfile) -> dict:
+        options = {"num_predict": gen.max_tokens, "temperature": gen.temperature, "top_p": gen.top_p}
+        if gen.stop:
+            options["stop"] = list(gen.stop)
+        return options
+
+    async def generate_response(self, prompt: str, context: str = None, profile: Optional[str] = None) -> str:
         system_context = context if context else SYSTEM_PROMPT
+        gen = get_profile(profile)
         
         payload = {
             "model": self.model,
             "prompt": prompt,
             "system": system_context,
+            "options": self._options(gen),
             "stream": False
         }
         
         try:
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=30
-            )
+            started = time.perf_counter()
+            response = await self.client.post("/api/generate", json=payload)
             response.raise_for_status()
             data = response.json()
-            return data.get("response", "")
+            text = data.get("response", "")
+            record_generation(
+                gen,
+                self.name,
+                time.perf_counter() - started,
+                completion_tokens=data.get("eval_count"),
+                prompt_tokens=data.get("prompt_eval_count"),
+                text=text,
+            )
+            return text
         except Exception as e:
             logging.error(f"Ollama Llama2 error: {e}")
             return "Sorry, the AI assistant is currently unavailable due to a technical issue. Please try again in a moment."
     
-    def generate_question(self, skill: str, difficulty: str = "intermediate") -> str:
+    async def stream_response(
+        self, prompt: str, context: str = None, profile: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        system_context = context if context else SYSTEM_PROMPT
+        gen = get_profile(profile)
+
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "system": system_context,
+            "options": self._options(gen),
+            "stream": True
+        }
+
+        produced = False
+        parts = []
+        started = time.perf_counter()
+        try:
+            # Ollama streams one JSON object per line until "done" is true
+            async with self.client.stream("POST", "/api/generate", json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    token = data.get("response", "")
+                    if token:
+                        produced = True
+                        parts.append(token)
+                        yield token
+                    if data.get("done"):
+                        # The final object carries the usage counters
+                        record_generation(
+                            gen,
+                            self.name,
+                            time.perf_counter() - started,
+                            completion_tokens=data.get("eval_count"),
+                            prompt_tokens=data.get("prompt_eval_count"),
+                            text="".join(parts),
+                        )
+                        break
+        except Exception as e:
+            logging.error(f"Ollama Llama2 streaming error: {e}")
+            if not produced:
+                yield "Sorry, the AI assistant is currently unavailable due to a technical issue. Please try again in a moment."
+    
+    async def generate_question(self, skill: str, difficulty: str = "intermediate") -> str:
         prompt = TECHNICAL_QUESTION_PROMPT.format(skill=skill)
-        return self.generate_response(prompt)
\ No newline at end of file
+        return await self.generate_response(prompt, profile="question")
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,153 @@
+"""Pre-generated phrasings for the constant "ask" prompts.
+
+Prompts such as ``ASK_EMAIL_PROMPT`` take no input, so their completions can
+be generated ahead of time. ``PhrasingCache`` keeps N variants per prompt,
+serves them round-robin or at random, regenerates them once they are older
+than the TTL, and persists them to disk so a restart begins warm.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from ..metrics import metrics
+from .llm_provider import Priority, current_priority, is_unavailable
+
+Generator = Callable[[str], Awaitable[str]]
+
+
+def prompt_key(prompt: str) -> str:
+    """Stable key for a prompt; editing the prompt text invalidates its variants."""
+    return hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+class PhrasingCache:
+    def __init__(
+        self,
+        generate: Generator,
+        prompts: Iterable[str],
+        variants: int = 5,
+        ttl_seconds: float = 86400,
+        path: Optional[str] = None,
+        mode: str = "round_robin",
+        concurrency: int = 4,
+    ):
+        self.generate = generate
+        self.prompts = {prompt_key(p): p for p in prompts}
+        self.variants = variants
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.mode = mode
+        self.concurrency = concurrency
+        # key -> {"created_at": epoch seconds, "variants": [...]}
+        self._entries: Dict[str, Dict] = {}
+        self._cursors: Dict[str, itertools.count] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._load()
+
+    def get(self, prompt: str) -> Optional[str]:
+        """Return a cached phrasing for ``prompt`` or None if the pool is empty."""
+        key = prompt_key(prompt)
+        entry = self._entries.get(key)
+        if not entry or not entry["variants"]:
+            metrics.incr("phrasing_cache_misses")
+            return None
+        metrics.incr("phrasing_cache_hits")
+        choices: List[str] = entry["variants"]
+        if self.mode == "random":
+            return random.choice(choices)
+        cursor = self._cursors.setdefault(key, itertools.count())
+        return choices[next(cursor) % len(choices)]
+
+    def has(self, prompt: str) -> bool:
+        entry = self._entries.get(prompt_key(prompt))
+        return bool(entry and entry["variants"])
+
+    def is_stale(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return not entry or time.time() - entry["created_at"] > self.ttl_seconds
+
+    async def _fill(self, key: str, semaphore: asyncio.Semaphore) -> None:
+        prompt = self.prompts[key]
+
+        async def one() -> Optional[str]:
+            async with semaphore:
+                try:
+                    return await self.generate(prompt)
+                except Exception as e:
+                    logging.warning(f"Phrasing generation failed: {e}")
+                    return None
+
+        results = await asyncio.gather(*(one() for _ in range(self.variants)))
+        variants = list(dict.fromkeys(r for r in results if self._is_valid(r)))
+        if variants:
+            # Swap the whole entry so readers never observe a partial pool
+            self._entries[key] = {"created_at": time.time(), "variants": variants}
+            metrics.incr("phrasing_cache_refreshes")
+
+    @staticmethod
+    def _is_valid(text: Optional[str]) -> bool:
+        return not is_unavailable(text)
+
+    async def refresh(self, force: bool = False) -> None:
+        """Regenerate every prompt whose pool is missing or older than the TTL."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        keys = [k for k in self.prompts if force or self.is_stale(k)]
+        if not keys:
+            return
+        await asyncio.gather(*(self._fill(k, semaphore) for k in keys))
+        self._save()
+
+    async def _run(self) -> None:
+        current_priority.set(Priority.BACKGROUND)
+        interval = max(min(self.ttl_seconds / 4, 3600), 1)
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logging.error(f"Phrasing cache refresh failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self) -> None:
+        """Warm and keep refreshing the pool in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable phrasing cache {self.path}: {e}")
+            return
+        # Entries for prompts that changed or were removed are dropped here
+        self._entries = {k: v for k, v in stored.items() if k in self.prompts}
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logging.warning(f"Failed to persist phrasing cache to {self.path}: {e}")
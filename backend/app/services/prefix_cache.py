@@ -0,0 +1,69 @@
+"""Two-tier cache for evaluated llama.cpp prompt-prefix states.
+
+``GGUFService`` evaluates the system-prompt prefix once, snapshots the model
+state with ``Llama.save_state()`` and stores it here. Later calls restore the
+snapshot so llama.cpp only evaluates the per-call suffix. States live in an
+in-memory LRU and, when a directory is configured, are also pickled to disk
+so a restarted worker can skip the first prefix evaluation.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+from collections import OrderedDict
+from typing import Any, Optional
+
+from ..metrics import metrics
+
+
+def prefix_key(model_name: str, prefix: str) -> str:
+    return hashlib.sha1(f"{model_name}\x00{prefix}".encode("utf-8")).hexdigest()
+
+
+class PrefixStateCache:
+    def __init__(self, max_entries: int = 8, disk_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir or None
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.state")
+
+    def get(self, key: str) -> Optional[Any]:
+        state = self._memory.get(key)
+        if state is not None:
+            self._memory.move_to_end(key)
+            metrics.incr("gguf_prefix_cache_hits", tier="memory")
+            return state
+        if self.disk_dir and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), "rb") as f:
+                    state = pickle.load(f)
+                self._remember(key, state)
+                metrics.incr("gguf_prefix_cache_hits", tier="disk")
+                return state
+            except Exception as e:
+                logging.warning(f"Discarding unreadable prefix state {key}: {e}")
+        metrics.incr("gguf_prefix_cache_misses")
+        return None
+
+    def put(self, key: str, state: Any) -> None:
+        self._remember(key, state)
+        if self.disk_dir:
+            try:
+                tmp_path = f"{self._path(key)}.tmp"
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self._path(key))
+            except Exception as e:
+                logging.warning(f"Failed to persist prefix state {key}: {e}")
+
+    def _remember(self, key: str, state: Any) -> None:
+        self._memory[key] = state
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+        metrics.set_gauge("gguf_prefix_cache_entries", len(self._memory))
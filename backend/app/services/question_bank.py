@@ -0,0 +1,211 @@
+"""Per-skill bank of pre-generated technical questions.
+
+Questions are stored in the ``question_bank`` Mongo collection keyed by a
+canonical skill name, with an in-process LRU of skill pools in front. A
+background worker tops a skill's pool up whenever a candidate has fewer than
+``low_watermark`` unseen questions left, and popular skills are pre-warmed
+at startup, so the next question is usually a cache lookup.
+"""
+
+import asyncio
+import logging
+import random
+import re
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Iterable, List, Optional, Set
+
+from ..metrics import metrics
+from .llm_provider import Priority, current_priority, is_unavailable
+
+Generator = Callable[[str], Awaitable[str]]
+
+SKILL_ALIASES = {
+    "js": "javascript",
+    "py": "python",
+    "golang": "go",
+    "ts": "typescript",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "postgres": "postgresql",
+    "k8s": "kubernetes",
+    "mongo": "mongodb",
+}
+
+
+def canonical_skill(skill: str) -> str:
+    """Normalise a skill name so "JS", "js " and "JavaScript" share one pool."""
+    key = re.sub(r"\s+", " ", (skill or "").strip().lower())
+    return SKILL_ALIASES.get(key, key)
+
+
+class QuestionBank:
+    def __init__(
+        self,
+        generate: Generator,
+        collection_getter: Callable,
+        lru_size: int = 256,
+        low_watermark: int = 5,
+        target_size: int = 20,
+    ):
+        self.generate = generate
+        self.collection_getter = collection_getter
+        self.lru_size = lru_size
+        self.low_watermark = low_watermark
+        self.target_size = target_size
+        self._pools: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._queued: Set[str] = set()
+        self._grow: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def _remember(self, key: str, questions: List[str]) -> None:
+        self._pools[key] = questions
+        self._pools.move_to_end(key)
+        while len(self._pools) > self.lru_size:
+            self._pools.popitem(last=False)
+
+    async def _pool(self, key: str) -> List[str]:
+        if key in self._pools:
+            self._pools.move_to_end(key)
+            metrics.incr("question_bank_lru_hits")
+            return self._pools[key]
+        metrics.incr("question_bank_lru_misses")
+        try:
+            docs = await asyncio.to_thread(
+                lambda: list(self.collection_getter().find({"skill": key}, {"_id": 0, "question": 1}))
+            )
+            questions = [d["question"] for d in docs if d.get("question")]
+        except Exception as e:
+            logging.error(f"Question bank load failed for '{key}': {e}")
+            questions = []
+        self._remember(key, questions)
+        return questions
+
+    async def draw(self, skill: str, exclude: Iterable[str] = ()) -> Optional[str]:
+        """Return a banked question for ``skill`` the candidate has not seen yet."""
+        key = canonical_skill(skill)
+        pool = await self._pool(key)
+        seen = set(exclude)
+        unseen = [q for q in pool if q not in seen]
+        if len(unseen) <= self.low_watermark:
+            # Candidates are exhausting this pool; grow it past the target size
+            self.schedule_refill(key, grow=True)
+        elif len(pool) < self.target_size:
+            self.schedule_refill(key)
+        if not unseen:
+            metrics.incr("question_bank_misses")
+            return None
+        metrics.incr("question_bank_hits")
+        return random.choice(unseen)
+
+    async def add(self, skill: str, question: str) -> None:
+        """Bank a question generated on the request path."""
+        if not self._is_valid(question):
+            return
+        key = canonical_skill(skill)
+        pool = await self._pool(key)
+        if question in pool:
+            return
+        pool.append(question)
+        await self._persist(key, [question])
+
+    @staticmethod
+    def _is_valid(question: Optional[str]) -> bool:
+        return not is_unavailable(question)
+
+    async def _persist(self, key: str, questions: List[str]) -> None:
+        now = datetime.utcnow()
+        docs = [{"skill": key, "question": q, "created_at": now} for q in questions]
+        try:
+            await asyncio.to_thread(lambda: self.collection_getter().insert_many(docs, ordered=False))
+        except Exception as e:
+            logging.error(f"Question bank persist failed for '{key}': {e}")
+
+    def schedule_refill(self, skill: str, grow: bool = False) -> None:
+        key = canonical_skill(skill)
+        if grow:
+            self._grow.add(key)
+        if key and key not in self._queued:
+            self._queued.add(key)
+            self._queue.put_nowait(key)
+
+    async def refill(self, key: str) -> int:
+        """Generate questions for ``key`` up to the target size, or one watermark more if growing."""
+        pool = await self._pool(key)
+        missing = self.target_size - len(pool)
+        if key in self._grow:
+            self._grow.discard(key)
+            missing = max(missing, self.low_watermark)
+        if missing <= 0:
+            return 0
+        # Duplicates and failures are dropped; a later draw schedules another round
+        results = await asyncio.gather(
+            *(self.generate(key) for _ in range(missing)), return_exceptions=True
+        )
+        fresh = []
+        for q in results:
+            if isinstance(q, str) and self._is_valid(q) and q not in pool and q not in fresh:
+                fresh.append(q)
+        if fresh:
+            pool.extend(fresh)
+            await self._persist(key, fresh)
+            metrics.incr("question_bank_refilled", len(fresh))
+        return len(fresh)
+
+    async def _run(self) -> None:
+        current_priority.set(Priority.BACKGROUND)
+        while True:
+            key = await self._queue.get()
+            try:
+                await self.refill(key)
+            except Exception as e:
+                logging.error(f"Question bank refill failed for '{key}': {e}")
+            finally:
+                self._queued.discard(key)
+                self._queue.task_done()
+
+    async def popular_skills(self, limit: int) -> List[str]:
+        """Most common skills across stored candidates."""
+        pipeline = [
+            {"$unwind": "$tech_skills"},
+            {"$group": {"_id": {"$toLower": "$tech_skills"}, "n": {"$sum": 1}}},
+            {"$sort": {"n": -1}},
+            {"$limit": limit},
+        ]
+        from ..mongodb import get_candidates_collection
+
+        try:
+            rows = await asyncio.to_thread(lambda: list(get_candidates_collection().aggregate(pipeline)))
+            return [r["_id"] for r in rows if r.get("_id")]
+        except Exception as e:
+            logging.warning(f"Could not compute popular skills: {e}")
+            return []
+
+    async def prewarm(self, skills: Iterable[str], top_n: int = 0) -> None:
+        wanted = [canonical_skill(s) for s in skills if s and s.strip()]
+        if top_n:
+            wanted.extend(await self.popular_skills(top_n))
+        for key in dict.fromkeys(wanted):
+            self.schedule_refill(key)
+
+    async def ensure_indexes(self) -> None:
+        try:
+            await asyncio.to_thread(lambda: self.collection_getter().create_index("skill"))
+        except Exception as e:
+            logging.warning(f"Could not create question bank index: {e}")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
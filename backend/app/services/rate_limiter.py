@@ -0,0 +1,315 @@
+"""Client-side rate limiting for hosted LLM APIs.
+
+Groq enforces per-model requests-per-minute, tokens-per-minute and
+requests-per-day limits and answers 429 once one is exhausted. Without
+knowing about them, a burst of interviews turns into a burst of failures.
+``RateLimitScheduler`` keeps token buckets per model, refilled at the
+configured rates and re-synchronised from the ``x-ratelimit-*`` response
+headers, and admits calls in priority order: live candidate turns before
+background work (question prefetch, phrasing refresh, re-scoring).
+
+Background calls must leave a reserve of every bucket for live turns. A
+live turn that would wait longer than ``interactive_max_wait`` is offered to
+the degraded (cheaper) model instead, and failing that is rejected with
+``RateLimited`` so the caller can answer immediately rather than queue.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import re
+import time
+from typing import Dict, List, Mapping, Optional
+
+from ..metrics import metrics
+from .llm_provider import Priority, current_priority
+
+_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+# Response headers (x-ratelimit-{limit,remaining,reset}-<suffix>) -> bucket.
+# Groq's request headers describe the daily quota, its token headers the
+# per-minute one.
+HEADER_BUCKETS = {"tokens": "tokens", "requests": "requests_day"}
+
+
+class RateLimited(Exception):
+    """The call cannot be admitted within its priority's wait budget."""
+
+    def __init__(self, wait: float):
+        super().__init__(f"rate limited; estimated wait {wait:.1f}s")
+        self.wait = wait
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse reset durations such as ``"7.66s"``, ``"2m59.56s"``, ``"120ms"`` or ``"3"``."""
+    if not value:
+        return None
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|h|m|s)", value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(amount) * _UNITS[unit] for amount, unit in parts)
+
+
+def estimate_tokens(*texts: str, max_tokens: int = 0) -> int:
+    """Rough prompt size (~4 characters per token) plus the completion budget."""
+    return sum(len(t or "") for t in texts) // 4 + max_tokens
+
+
+class TokenBucket:
+    """Continuously refilling budget; ``capacity`` may be infinite until headers are seen."""
+
+    def __init__(self, capacity: float = math.inf, per_seconds: float = 60.0):
+        self.capacity = capacity
+        self.period = per_seconds
+        self.rate = capacity / per_seconds
+        self.level = capacity
+        self.updated = time.monotonic()
+        # Set by a 429 with retry-after: nothing is admitted before this
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        if self.level < self.capacity:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` can be taken (0 when it can be taken now)."""
+        self._refill(now)
+        wait = max(0.0, self.blocked_until - now)
+        deficit = amount - self.level
+        if deficit > 0:
+            wait = max(wait, deficit / self.rate if self.rate > 0 else math.inf)
+        return wait
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+    def give(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+    def sync(self, limit: Optional[float], remaining: Optional[float], reset: Optional[float]) -> None:
+        """Adopt the server's view of this limit.
+
+        The local level only ever moves down to the reported remaining budget:
+        it already accounts for calls still in flight, which the server has
+        not counted yet, and other workers may share the same API key.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        if limit:
+            if math.isinf(self.capacity):
+                self.level = limit
+            self.capacity = limit
+            if math.isinf(self.rate):
+                self.rate = limit / self.period
+        if remaining is not None:
+            self.level = min(self.level, remaining)
+        if limit and remaining is not None and reset and remaining < limit:
+            # The server refills to the full limit over ``reset`` seconds
+            self.rate = (limit - remaining) / reset
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "tokens", "future")
+
+    def __init__(self, priority: int, seq: int, tokens: int, future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+        self.future = future
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class ModelLimiter:
+    """Buckets and priority wait queue for one model."""
+
+    def __init__(self, model: str, rpm: float, tpm: float, reserve: float, period: float = 60.0):
+        self.model = model
+        self.reserve = reserve
+        self.buckets: Dict[str, TokenBucket] = {
+            "requests": TokenBucket(rpm or math.inf, period),
+            "tokens": TokenBucket(tpm or math.inf, period),
+            "requests_day": TokenBucket(per_seconds=86400.0),
+        }
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def _costs(self, tokens: int) -> Dict[str, float]:
+        return {"requests": 1, "tokens": tokens, "requests_day": 1}
+
+    def _time_until(self, costs: Dict[str, float], priority: int, now: float) -> float:
+        wait = 0.0
+        for name, bucket in self.buckets.items():
+            amount = costs[name]
+            if priority > Priority.INTERACTIVE and not math.isinf(bucket.capacity):
+                amount += self.reserve * bucket.capacity
+            wait = max(wait, bucket.time_until(amount, now))
+        return wait
+
+    def eta(self, tokens: int, priority: int) -> float:
+        """Estimated wait for a new call, counting everything queued ahead of it."""
+        costs = self._costs(tokens)
+        for waiter in self._waiters:
+            if waiter.priority <= priority and not waiter.future.done():
+                for name, amount in self._costs(waiter.tokens).items():
+                    costs[name] += amount
+        return self._time_until(costs, priority, time.monotonic())
+
+    async def acquire(self, tokens: int, priority: int, max_wait: float) -> None:
+        eta = self.eta(tokens, priority)
+        if eta > max_wait:
+            raise RateLimited(eta)
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, _Waiter(int(priority), next(self._seq), tokens, future))
+        self._wake()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait({future}, timeout=max_wait)
+        except asyncio.CancelledError:
+            # Do not let an abandoned waiter consume budget later
+            future.cancel()
+            raise
+        if not future.done():
+            future.cancel()
+            raise RateLimited(max_wait)
+        metrics.observe(
+            "llm_rate_limit_wait", time.perf_counter() - started, priority=Priority(priority).name.lower()
+        )
+
+    def _wake(self) -> None:
+        """Admit waiters in priority order for as long as the buckets allow."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        while self._waiters:
+            head = self._waiters[0]
+            if head.future.done():
+                heapq.heappop(self._waiters)
+                continue
+            costs = self._costs(head.tokens)
+            wait = self._time_until(costs, head.priority, now)
+            if wait > 0:
+                if not math.isinf(wait):
+                    self._timer = asyncio.get_running_loop().call_later(wait, self._wake)
+                return
+            heapq.heappop(self._waiters)
+            for name, amount in costs.items():
+                self.buckets[name].take(amount)
+            head.future.set_result(None)
+        metrics.set_gauge("llm_rate_limit_tokens_available", round(self.buckets["tokens"].level), model=self.model)
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        for suffix, name in HEADER_BUCKETS.items():
+            limit = headers.get(f"x-ratelimit-limit-{suffix}")
+            remaining = headers.get(f"x-ratelimit-remaining-{suffix}")
+            if limit is None and remaining is None:
+                continue
+            try:
+                self.buckets[name].sync(
+                    float(limit) if limit is not None else None,
+                    float(remaining) if remaining is not None else None,
+                    parse_duration(headers.get(f"x-ratelimit-reset-{suffix}")),
+                )
+            except ValueError:
+                logging.warning(f"Ignoring malformed rate-limit headers for {self.model}: {suffix}")
+
+    def settle(self, estimated: int, actual: Optional[int]) -> None:
+        """Return the unused part of a call's token estimate (or charge the overrun)."""
+        if actual is None:
+            return
+        bucket = self.buckets["tokens"]
+        if actual < estimated:
+            bucket.give(estimated - actual)
+        else:
+            bucket.take(actual - estimated)
+
+    def penalize(self, retry_after: Optional[float]) -> None:
+        """After a 429, admit nothing until the server says so."""
+        until = time.monotonic() + (retry_after if retry_after is not None else 1.0)
+        for bucket in self.buckets.values():
+            bucket.blocked_until = max(bucket.blocked_until, until)
+        self._wake()
+
+
+class RateLimitScheduler:
+    def __init__(
+        self,
+        rpm: float,
+        tpm: float,
+        degraded_model: Optional[str] = None,
+        interactive_max_wait: float = 5.0,
+        background_max_wait: float = 120.0,
+        reserve: float = 0.2,
+        enabled: bool = True,
+        period: float = 60.0,
+        headroom: float = 0.9,
+    ):
+        # ``period`` is the length of a rate-limit "minute" (shortened by the simulation script)
+        self.period = period
+        # Aim slightly below the configured limits: calls admitted back to back
+        # reach the server with jitter, and a 429 costs more than a short wait
+        self.rpm = rpm * headroom
+        self.tpm = tpm * headroom
+        self.degraded_model = degraded_model or None
+        self.interactive_max_wait = interactive_max_wait
+        self.background_max_wait = background_max_wait
+        self.reserve = reserve
+        self.enabled = enabled
+        self._limiters: Dict[str, ModelLimiter] = {}
+
+    def limiter(self, model: str) -> ModelLimiter:
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limiter = self._limiters[model] = ModelLimiter(
+                model, self.rpm, self.tpm, self.reserve, self.period
+            )
+        return limiter
+
+    async def admit(self, model: str, tokens: int) -> str:
+        """Wait for budget and return the model to call (``model`` or the degraded one).
+
+        Raises ``RateLimited`` when neither can take the call within the
+        caller's wait budget.
+        """
+        if not self.enabled:
+            return model
+        priority = current_priority.get()
+        interactive = priority == Priority.INTERACTIVE
+        max_wait = self.interactive_max_wait if interactive else self.background_max_wait
+        try:
+            await self.limiter(model).acquire(tokens, priority, max_wait)
+            return model
+        except RateLimited:
+            # Background work waits its turn; only live turns are worth a weaker answer
+            if not interactive or not self.degraded_model or self.degraded_model == model:
+                metrics.incr("llm_rate_limit_rejected", priority=priority.name.lower())
+                raise
+        try:
+            await self.limiter(self.degraded_model).acquire(tokens, priority, max_wait)
+        except RateLimited:
+            metrics.incr("llm_rate_limit_rejected", priority=priority.name.lower())
+            raise
+        metrics.incr("llm_rate_limit_degraded", model=self.degraded_model)
+        return self.degraded_model
+
+    def observe(self, model: str, headers: Mapping[str, str]) -> None:
+        if self.enabled:
+            self.limiter(model).observe(headers)
+
+    def settle(self, model: str, estimated: int, actual: Optional[int]) -> None:
+        if self.enabled:
+            self.limiter(model).settle(estimated, actual)
+
+    def penalize(self, model: str, retry_after: Optional[float]) -> None:
+        metrics.incr("llm_rate_limit_429", model=model)
+        if self.enabled:
+            self.limiter(model).penalize(retry_after)
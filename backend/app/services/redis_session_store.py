@@ -0,0 +1,96 @@
+"""Interview sessions in Redis (or anything speaking its protocol), shared by every worker.
+
+Each interview is a JSON string at ``<prefix><id>`` holding the turn fields
+and their version, plus a hash at ``<prefix><id>:scores`` that background
+scoring updates with ``HSET``/``HINCRBYFLOAT``. A turn's save is a
+``WATCH``/``MULTI``/``EXEC`` on the session key, so it is refused if another
+turn saved in between. Both keys expire after the idle TTL.
+
+Uses the ``redis`` package (in requirements.txt); it is only imported when
+``SESSION_BACKEND=redis`` selects this store.
+"""
+
+import json
+from typing import Dict, Optional
+
+from redis import asyncio as aioredis  # type: ignore
+from redis.exceptions import WatchError  # type: ignore
+
+from ..metrics import metrics
+from .session_store import TURN_FIELDS, InterviewSession
+
+
+class RedisSessionStore:
+    name = "redis"
+
+    def __init__(self, url: str, ttl_seconds: float = 7200, prefix: str = "talentscout:session:"):
+        self.client = aioredis.from_url(url, decode_responses=True)
+        self.ttl_ms = int(ttl_seconds * 1000)
+        self.prefix = prefix
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    def _scores_key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}:scores"
+
+    async def load(self, session_id: str) -> Optional[InterviewSession]:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.get(self._key(session_id))
+            pipe.hgetall(self._scores_key(session_id))
+            raw, scores = await pipe.execute()
+        if raw is None:
+            return None
+        session = InterviewSession.from_dict(session_id, json.loads(raw))
+        session.answer_metrics = {
+            field[2:]: json.loads(value) for field, value in scores.items() if field.startswith("m:")
+        }
+        session.score_total = float(scores.get("score_total", 0.0))
+        session.scored_answers = int(scores.get("scored_answers", 0))
+        return session
+
+    async def save(self, session: InterviewSession) -> bool:
+        key = self._key(session.session_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                raw = await pipe.get(key)
+                current = json.loads(raw)["version"] if raw is not None else 0
+                if current != session.version:
+                    await pipe.unwatch()
+                    metrics.incr("session_cas_conflicts", backend=self.name)
+                    return False
+                value = {name: getattr(session, name) for name in TURN_FIELDS}
+                value["version"] = current + 1
+                pipe.multi()
+                pipe.set(key, json.dumps(value), px=self.ttl_ms)
+                pipe.pexpire(self._scores_key(session.session_id), self.ttl_ms)
+                await pipe.execute()
+            except WatchError:
+                metrics.incr("session_cas_conflicts", backend=self.name)
+                return False
+        session.version += 1
+        return True
+
+    async def record_answer(self, session_id: str, key: str, answer_metrics: Dict, score: float) -> None:
+        if not await self.client.exists(self._key(session_id)):
+            return
+        scores_key = self._scores_key(session_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(scores_key, f"m:{key}", json.dumps(answer_metrics))
+            pipe.hincrbyfloat(scores_key, "score_total", score)
+            pipe.hincrby(scores_key, "scored_answers", 1)
+            pipe.pexpire(scores_key, self.ttl_ms)
+            await pipe.execute()
+
+    async def discard(self, session_id: str, reason: str) -> bool:
+        deleted = await self.client.delete(self._key(session_id), self._scores_key(session_id))
+        if deleted:
+            metrics.incr("sessions_evicted", reason=reason)
+        return bool(deleted)
+
+    def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,283 @@
+"""Background English-proficiency scoring jobs.
+
+Completing an interview used to parse every answer with spaCy inside the
+request handler before the candidate was stored, stalling that turn and
+every other request on the worker. Now the candidate is inserted straight
+away with ``score_status="pending"`` and a job is written to the
+``scoring_jobs`` collection; in-process workers score it on a thread pool
+and fill in ``english_proficiency_score``.
+
+Jobs are claimed with an atomic lease, so several API workers and the
+``scripts/drain_scoring_queue.py`` CLI can share one queue. Jobs left
+pending, or running under an expired lease (e.g. the process restarted
+mid-job), are picked up again by a periodic sweep.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set
+
+from pymongo import ReturnDocument  # type: ignore
+
+from ..metrics import metrics
+from .candidate_repository import CHANGE_COUNTER_ID, change_counter_update
+from .memo_cache import MemoCache
+from .scoring_service import AnswerMetrics, ProficiencyReport, ScoringService
+
+
+def memo_for(scorer: ScoringService, **kwargs) -> MemoCache:
+    """Memo cache for per-answer metrics, versioned by the scorer and its spaCy pipeline."""
+    return MemoCache(
+        "score",
+        # Resolved on first use so building the cache does not load spaCy
+        lambda: scorer.version,
+        encode=asdict,
+        decode=lambda data: AnswerMetrics(**data),
+        **kwargs,
+    )
+
+
+class ScoringQueue:
+    def __init__(
+        self,
+        scorer: ScoringService,
+        jobs_getter: Callable,
+        candidates_getter: Callable,
+        workers: int = 2,
+        lease_seconds: int = 120,
+        max_attempts: int = 3,
+        poll_seconds: int = 30,
+        memo: Optional[MemoCache] = None,
+        counters_getter: Optional[Callable] = None,
+        on_candidate_change: Optional[Callable[[], None]] = None,
+    ):
+        self.scorer = scorer
+        self.memo = memo
+        self.jobs_getter = jobs_getter
+        self.candidates_getter = candidates_getter
+        # A filled-in score changes the candidate, so it counts as a change for exports too
+        self.counters_getter = counters_getter
+        self.on_candidate_change = on_candidate_change
+        self.workers = max(1, workers)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.poll_seconds = poll_seconds
+        # spaCy parsing is CPU-bound; keep it off the event loop
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scoring")
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._queued: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+
+    def _claimable(self) -> Dict:
+        return {
+            "$or": [
+                {"status": "pending"},
+                {"status": "running", "lease_until": {"$lt": datetime.utcnow()}},
+            ]
+        }
+
+    async def enqueue(self, candidate_id: str, answers: List[str]) -> None:
+        """Persist a scoring job for ``candidate_id`` and hand it to a worker."""
+        now = datetime.utcnow()
+        job = {
+            "_id": candidate_id,
+            "candidate_id": candidate_id,
+            "answers": answers,
+            "status": "pending",
+            "attempts": 0,
+            "lease_until": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        await asyncio.to_thread(lambda: self.jobs_getter().replace_one({"_id": candidate_id}, job, upsert=True))
+        metrics.incr("scoring_jobs_enqueued")
+        self._schedule(candidate_id)
+
+    def score_answer(self, answer: str) -> "asyncio.Future[AnswerMetrics]":
+        """Score a single answer on the worker threads, e.g. while the interview is still going."""
+        return asyncio.ensure_future(self._score_answer(answer))
+
+    async def _score_answer(self, answer: str) -> AnswerMetrics:
+        loop = asyncio.get_running_loop()
+        if self.memo is None:
+            return await loop.run_in_executor(self.executor, self.scorer.score_answer, answer)
+        return await self.memo.get_or_compute(
+            answer, lambda: loop.run_in_executor(self.executor, self.scorer.score_answer, answer)
+        )
+
+    async def score_answers(self, answers: List[str]) -> ProficiencyReport:
+        """Batch-score answers on the worker threads, parsing only those not memoized."""
+        loop = asyncio.get_running_loop()
+        if self.memo is None:
+            return await loop.run_in_executor(self.executor, self.scorer.score_answers, answers)
+        results: List[Optional[AnswerMetrics]] = [await self.memo.get(a) for a in answers]
+        missing = [i for i, r in enumerate(results) if r is None]
+        if missing:
+            report = await loop.run_in_executor(
+                self.executor, self.scorer.score_answers, [answers[i] for i in missing]
+            )
+            for i, answer_metrics in zip(missing, report.answers):
+                results[i] = answer_metrics
+                await self.memo.put(answers[i], answer_metrics)
+        return ProficiencyReport(answers=results)
+
+    def _schedule(self, job_id: str) -> None:
+        if job_id not in self._queued:
+            self._queued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def _claim(self, job_id: Optional[str] = None) -> Optional[Dict]:
+        """Atomically take a claimable job (a specific one, or any) under a fresh lease."""
+        now = datetime.utcnow()
+        query = self._claimable()
+        if job_id is not None:
+            query["_id"] = job_id
+        return await asyncio.to_thread(
+            lambda: self.jobs_getter().find_one_and_update(
+                query,
+                {
+                    "$set": {
+                        "status": "running",
+                        "lease_until": now + timedelta(seconds=self.lease_seconds),
+                        "updated_at": now,
+                    },
+                    "$inc": {"attempts": 1},
+                },
+                sort=[("created_at", 1)],
+                return_document=ReturnDocument.AFTER,
+            )
+        )
+
+    async def process(self, job: Dict) -> bool:
+        """Score a claimed job and write the result to the candidate; False if it failed."""
+        job_id = job["_id"]
+        try:
+            report = await self.score_answers(job.get("answers") or [])
+        except Exception as e:
+            status = "failed" if job.get("attempts", 0) >= self.max_attempts else "pending"
+            logging.error(f"Scoring job {job_id} failed (attempt {job.get('attempts')}): {e}")
+            metrics.incr("scoring_jobs_failed", final=str(status == "failed").lower())
+            await asyncio.to_thread(
+                lambda: self.jobs_getter().update_one(
+                    {"_id": job_id},
+                    {"$set": {"status": status, "error": str(e), "lease_until": None, "updated_at": datetime.utcnow()}},
+                )
+            )
+            return False
+
+        now = datetime.utcnow()
+        candidate = await asyncio.to_thread(
+            lambda: self.candidates_getter().find_one({"id": job["candidate_id"]}, {"qa_responses": 1})
+        )
+        if candidate is None:
+            logging.warning(f"Scoring job {job_id}: candidate not found")
+        else:
+            # Keep each answer's breakdown next to its Q&A pair
+            by_answer = {a: m.to_dict() for a, m in zip(job.get("answers") or [], report.answers)}
+            qa_responses = candidate.get("qa_responses") or []
+            for item in qa_responses:
+                if item.get("answer") in by_answer:
+                    item["metrics"] = by_answer[item["answer"]]
+            await asyncio.to_thread(
+                lambda: self.candidates_getter().update_one(
+                    {"id": job["candidate_id"]},
+                    {
+                        "$set": {
+                            "english_proficiency_score": report.overall,
+                            "score_status": "scored",
+                            "qa_responses": qa_responses,
+                            "updated_at": now,
+                        }
+                    },
+                )
+            )
+            if self.on_candidate_change is not None:
+                self.on_candidate_change()
+            if self.counters_getter is not None:
+                await asyncio.to_thread(
+                    lambda: self.counters_getter().update_one(
+                        {"_id": CHANGE_COUNTER_ID}, change_counter_update(), upsert=True
+                    )
+                )
+        await asyncio.to_thread(
+            lambda: self.jobs_getter().update_one(
+                {"_id": job_id},
+                {"$set": {"status": "done", "score": report.overall, "lease_until": None, "updated_at": now}},
+            )
+        )
+        metrics.incr("scoring_jobs_done")
+        if job.get("created_at"):
+            metrics.observe("scoring_job_delay", (now - job["created_at"]).total_seconds())
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = await self._claim(job_id)
+                if job is not None:
+                    await self.process(job)
+            except Exception as e:
+                logging.error(f"Scoring worker error on job {job_id}: {e}")
+            finally:
+                self._queued.discard(job_id)
+                self._queue.task_done()
+
+    async def _sweep(self) -> None:
+        """Re-queue jobs nobody is working on: left over from a restart, retried, or orphaned."""
+        while True:
+            try:
+                ids = await asyncio.to_thread(
+                    lambda: [d["_id"] for d in self.jobs_getter().find(self._claimable(), {"_id": 1}).limit(500)]
+                )
+                for job_id in ids:
+                    self._schedule(job_id)
+                metrics.set_gauge("scoring_jobs_backlog", len(ids))
+            except Exception as e:
+                logging.warning(f"Scoring queue sweep failed: {e}")
+            await asyncio.sleep(self.poll_seconds)
+
+    async def drain(self, limit: Optional[int] = None) -> int:
+        """Process claimable jobs one by one until none are left (or ``limit`` is reached)."""
+        processed = 0
+        while limit is None or processed < limit:
+            job = await self._claim()
+            if job is None:
+                break
+            await self.process(job)
+            processed += 1
+        return processed
+
+    async def counts(self) -> Dict[str, int]:
+        rows = await asyncio.to_thread(
+            lambda: list(self.jobs_getter().aggregate([{"$group": {"_id": "$status", "n": {"$sum": 1}}}]))
+        )
+        return {r["_id"]: r["n"] for r in rows}
+
+    async def ensure_indexes(self) -> None:
+        try:
+            await asyncio.to_thread(
+                lambda: self.jobs_getter().create_index([("status", 1), ("lease_until", 1), ("created_at", 1)])
+            )
+        except Exception as e:
+            logging.warning(f"Could not create scoring job index: {e}")
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweep()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,52 +1,139 @@
 import logging
+import threading
 import spacy  # type: ignore
-from typing import List, Dict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from ..config import settings
+
+# Components the metrics never read; excluded at load time so they are not run
+UNUSED_COMPONENTS = ["ner"]
+# Bump when the metrics or weights change so memoized scores are not reused
+SCORER_VERSION = "1"
+
+
+@dataclass
+class AnswerMetrics:
+    word_count: int
+    avg_word_length: float
+    sentence_count: int
+    complex_words: int
+    vocab_diversity: float
+    grammar_score: float
+    score: float
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data["score"] = round(self.score, 2)
+        return data
+
+
+@dataclass
+class ProficiencyReport:
+    answers: List[AnswerMetrics] = field(default_factory=list)
+
+    @property
+    def overall(self) -> float:
+        if not self.answers:
+            return 0.0
+        return round(sum(a.score for a in self.answers) / len(self.answers), 2)
+
 
 class ScoringService:
-    def __init__(self):
-        try:
-            # Prefer the small English model for better tagging/lemmatization
-            self.nlp = spacy.load("en_core_web_sm")
-        except Exception as e:
-            # Graceful fallback to a blank English pipeline to avoid runtime crashes
-            logging.warning(
-                "Falling back to spacy.blank('en') because 'en_core_web_sm' is not available: %s",
-                e,
-            )
-            self.nlp = spacy.blank("en")
-            # Add a simple rule-based sentencizer for sentence boundaries
-            if "sentencizer" not in self.nlp.pipe_names:
-                self.nlp.add_pipe("sentencizer")
-    
-    def calculate_proficiency(self, responses: List[str]) -> float:
-        scores = []
-        
-        for response in responses:
-            doc = self.nlp(response)
-            
-            # Metrics
-            word_count = len([token for token in doc if not token.is_punct])
-            avg_word_length = sum(len(token.text) for token in doc if not token.is_punct) / max(word_count, 1)
-            sentence_count = len(list(doc.sents))
-            complex_words = len([token for token in doc if len(token.text) > 7])
-            
-            # Vocabulary diversity
-            unique_words = len(set([token.lemma_ for token in doc if not token.is_stop and not token.is_punct]))
-            vocab_diversity = unique_words / max(word_count, 1)
-            
+    def __init__(self, batch_size: Optional[int] = None, n_process: Optional[int] = None):
+        self.batch_size = batch_size or settings.SCORING_BATCH_SIZE
+        self.n_process = n_process or settings.SCORING_N_PROCESS
+        # The spaCy pipeline is loaded on first use (or by the startup warmup), not at import
+        self._nlp = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            self.load()
+        return self._nlp
+
+    def load(self):
+        """Load the spaCy pipeline once; blocking, so call it off the event loop."""
+        with self._load_lock:
+            if self._nlp is not None:
+                return self._nlp
+            try:
+                # Prefer the small English model for better tagging/lemmatization
+                nlp = spacy.load("en_core_web_sm", exclude=UNUSED_COMPONENTS)
+            except Exception as e:
+                # Graceful fallback to a blank English pipeline to avoid runtime crashes
+                logging.warning(
+                    "Falling back to spacy.blank('en') because 'en_core_web_sm' is not available: %s",
+                    e,
+                )
+                nlp = spacy.blank("en")
+                # Add a simple rule-based sentencizer for sentence boundaries
+                if "sentencizer" not in nlp.pipe_names:
+                    nlp.add_pipe("sentencizer")
+            self._nlp = nlp
+        return self._nlp
+
+    @property
+    def version(self) -> str:
+        """Identifies everything a score depends on: metric code, model and pipeline."""
+        meta = self.nlp.meta
+        return f"{SCORER_VERSION}:{meta.get('name')}-{meta.get('version')}:{','.join(self.nlp.pipe_names)}"
+
+    @staticmethod
+    def _metrics(doc) -> AnswerMetrics:
+        """Compute every metric for one parsed answer in a single pass over its tokens."""
+        word_count = 0
+        word_length = 0
+        sentence_count = 0
+        complex_words = 0
+        proper_structure = 0
+        lemmas = set()
+        for token in doc:
+            if token.is_sent_start:
+                sentence_count += 1
+            if len(token.text) > 7:
+                complex_words += 1
             # Grammar (approximate via dependency parsing)
-            proper_structure = sum(1 for token in doc if token.dep_ in ['nsubj', 'ROOT', 'dobj'])
-            grammar_score = proper_structure / max(word_count, 1)
-            
-            # Calculate individual score
-            score = (
-                min(word_count / 50, 1) * 0.2 +  # Length
-                min(avg_word_length / 6, 1) * 0.15 +  # Word complexity
-                vocab_diversity * 0.25 +  # Diversity
-                grammar_score * 0.25 +  # Structure
-                min(complex_words / 10, 1) * 0.15  # Advanced vocabulary
-            ) * 100
-            
-            scores.append(score)
-        
-        return round(sum(scores) / len(scores), 2) if scores else 0.0
\ No newline at end of file
+            if token.dep_ in ("nsubj", "ROOT", "dobj"):
+                proper_structure += 1
+            if token.is_punct:
+                continue
+            word_count += 1
+            word_length += len(token.text)
+            if not token.is_stop:
+                lemmas.add(token.lemma_)
+
+        avg_word_length = word_length / max(word_count, 1)
+        # Vocabulary diversity
+        vocab_diversity = len(lemmas) / max(word_count, 1)
+        grammar_score = proper_structure / max(word_count, 1)
+
+        score = (
+            min(word_count / 50, 1) * 0.2 +  # Length
+            min(avg_word_length / 6, 1) * 0.15 +  # Word complexity
+            vocab_diversity * 0.25 +  # Diversity
+            grammar_score * 0.25 +  # Structure
+            min(complex_words / 10, 1) * 0.15  # Advanced vocabulary
+        ) * 100
+
+        return AnswerMetrics(
+            word_count=word_count,
+            avg_word_length=round(avg_word_length, 3),
+            sentence_count=sentence_count,
+            complex_words=complex_words,
+            vocab_diversity=round(vocab_diversity, 3),
+            grammar_score=round(grammar_score, 3),
+            score=score,
+        )
+
+    def score_answer(self, response: str) -> AnswerMetrics:
+        return self._metrics(self.nlp(response))
+
+    def score_answers(self, responses: Iterable[str]) -> ProficiencyReport:
+        """Score a batch of answers with ``nlp.pipe``; per-answer metrics plus the aggregate."""
+        docs = self.nlp.pipe(responses, batch_size=self.batch_size, n_process=self.n_process)
+        return ProficiencyReport(answers=[self._metrics(doc) for doc in docs])
+
+    def calculate_proficiency(self, responses: List[str]) -> float:
+        return self.score_answers(responses).overall
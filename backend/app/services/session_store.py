@@ -0,0 +1,287 @@
+"""Interview session state and the stores that hold it between turns.
+
+A turn loads the candidate's ``InterviewSession``, works on that copy and
+saves it back with a compare-and-set on ``version``: if another request for
+the same interview (a double-clicked submit, a retry racing the original)
+saved first, the save is refused and the turn is rejected instead of
+overwriting or interleaving the other turn's progress.
+
+Per-answer scores are not part of that versioned state. They arrive from
+background scoring between turns and are merged in with ``record_answer``,
+which never conflicts with a turn.
+
+``SessionStore`` keeps sessions in process memory, which is only correct
+with a single worker. ``MongoSessionStore`` and ``RedisSessionStore`` share
+them across workers and nodes; choose one with ``SESSION_BACKEND``.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import resource
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Protocol
+
+from ..config import settings
+from ..metrics import metrics
+
+# Fields a turn reads and writes; saved under the version check
+TURN_FIELDS = ("stage", "candidate", "question_count", "skill_index", "last_question", "asked_questions")
+# Fields written by background scoring; merged, never overwritten by a turn
+SCORE_FIELDS = ("answer_metrics", "score_total", "scored_answers")
+
+
+def answer_key(answer: str) -> str:
+    """Stable, storage-safe key for an answer (Mongo field names cannot hold dots)."""
+    return hashlib.sha1(answer.encode("utf-8")).hexdigest()[:16]
+
+
+class InterviewSession:
+    __slots__ = (
+        "session_id",
+        "version",
+        "stage",
+        "candidate",
+        "question_count",
+        "skill_index",
+        "last_question",
+        "asked_questions",
+        "answer_metrics",
+        "score_total",
+        "scored_answers",
+        "last_seen",
+    )
+
+    def __init__(self, session_id: str, stage: str = "greeting"):
+        self.session_id = session_id
+        # Version this copy was loaded at; 0 until the session is first saved
+        self.version = 0
+        self.stage = stage
+        # Candidate fields, held here when the server owns the conversation (/conversation/turn)
+        self.candidate: Dict = {}
+        self.question_count = 0
+        # Server-authoritative pointer to the current skill index
+        self.skill_index = -1
+        self.last_question: Optional[str] = None
+        self.asked_questions: List[str] = []
+        # Per-answer scores by ``answer_key``, recorded as the technical answers arrive
+        self.answer_metrics: Dict[str, Dict] = {}
+        self.score_total = 0.0
+        self.scored_answers = 0
+        self.last_seen = 0.0
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in ("version", *TURN_FIELDS, *SCORE_FIELDS)}
+
+    @classmethod
+    def from_dict(cls, session_id: str, data: Dict) -> "InterviewSession":
+        session = cls(session_id)
+        for name in ("version", *TURN_FIELDS, *SCORE_FIELDS):
+            if name in data and data[name] is not None:
+                setattr(session, name, data[name])
+        return session
+
+    def copy(self) -> "InterviewSession":
+        session = InterviewSession.from_dict(self.session_id, self.to_dict())
+        session.candidate = dict(self.candidate)
+        session.asked_questions = list(self.asked_questions)
+        session.answer_metrics = dict(self.answer_metrics)
+        session.last_seen = self.last_seen
+        return session
+
+
+class SessionBackend(Protocol):
+    async def load(self, session_id: str) -> Optional[InterviewSession]:
+        ...
+
+    async def save(self, session: InterviewSession) -> bool:
+        """Store the turn fields if nobody saved since ``session.version``; bumps the version."""
+        ...
+
+    async def record_answer(self, session_id: str, key: str, answer_metrics: Dict, score: float) -> None:
+        ...
+
+    async def discard(self, session_id: str, reason: str) -> bool:
+        ...
+
+    def start(self) -> None:
+        ...
+
+    async def stop(self) -> None:
+        ...
+
+
+def process_rss_bytes() -> int:
+    """Current resident set size; falls back to the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class SessionStore:
+    """Sessions in process memory, bounded by an idle TTL and an LRU cap.
+
+    A session is evicted once the interview completes or the candidate is
+    rejected, after ``ttl_seconds`` without a turn (abandoned interviews),
+    and, least recently used first, when more than ``max_entries`` are open.
+    """
+
+    name = "memory"
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 7200,
+        sweep_seconds: float = 60,
+        on_evict: Optional[Callable[[str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sweep_seconds = sweep_seconds
+        # Called with the session id whenever a session leaves the store
+        self.on_evict = on_evict
+        self.clock = clock
+        self._sessions: "OrderedDict[str, InterviewSession]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def _live(self, session_id: str) -> Optional[InterviewSession]:
+        session = self._sessions.get(session_id)
+        if session is not None and self.clock() - session.last_seen > self.ttl_seconds:
+            # Idle past the TTL but not swept yet; start over as the sweep would have
+            self._evict(session_id, "idle")
+            return None
+        return session
+
+    async def load(self, session_id: str) -> Optional[InterviewSession]:
+        session = self._live(session_id)
+        # Turns work on a copy so a refused save leaves the stored session untouched
+        return session.copy() if session is not None else None
+
+    async def save(self, session: InterviewSession) -> bool:
+        stored = self._live(session.session_id)
+        current = stored.version if stored is not None else 0
+        if current != session.version:
+            metrics.incr("session_cas_conflicts", backend=self.name)
+            return False
+        if stored is None:
+            stored = InterviewSession(session.session_id)
+            self._sessions[session.session_id] = stored
+            metrics.incr("sessions_created")
+            while len(self._sessions) > self.max_entries:
+                self._evict(next(iter(self._sessions)), "capacity")
+        else:
+            self._sessions.move_to_end(session.session_id)
+        for name in TURN_FIELDS:
+            setattr(stored, name, getattr(session, name))
+        stored.candidate = dict(session.candidate)
+        stored.asked_questions = list(session.asked_questions)
+        stored.version = session.version = current + 1
+        stored.last_seen = self.clock()
+        metrics.set_gauge("sessions_active", len(self._sessions))
+        return True
+
+    async def record_answer(self, session_id: str, key: str, answer_metrics: Dict, score: float) -> None:
+        stored = self._sessions.get(session_id)
+        if stored is None:
+            return
+        stored.answer_metrics[key] = answer_metrics
+        stored.score_total += score
+        stored.scored_answers += 1
+
+    async def discard(self, session_id: str, reason: str) -> bool:
+        """Drop a session that is finished (``completed``, ``rejected``); False if it was not held."""
+        if session_id not in self._sessions:
+            return False
+        self._evict(session_id, reason)
+        metrics.set_gauge("sessions_active", len(self._sessions))
+        return True
+
+    def _evict(self, session_id: str, reason: str) -> None:
+        del self._sessions[session_id]
+        metrics.incr("sessions_evicted", reason=reason)
+        if self.on_evict is not None:
+            try:
+                self.on_evict(session_id)
+            except Exception as e:
+                logging.warning(f"Session eviction hook failed for {session_id}: {e}")
+
+    def expire(self) -> int:
+        """Evict every session idle for longer than the TTL; returns how many were removed."""
+        cutoff = self.clock() - self.ttl_seconds
+        expired = 0
+        # Oldest activity first, so stop at the first session still within the TTL
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_seen >= cutoff:
+                break
+            self._evict(session_id, "idle")
+            expired += 1
+        metrics.set_gauge("sessions_active", len(self._sessions))
+        metrics.set_gauge("process_rss_bytes", process_rss_bytes())
+        return expired
+
+    def clear(self) -> None:
+        for session_id in list(self._sessions):
+            self._evict(session_id, "cleared")
+        metrics.set_gauge("sessions_active", 0)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_seconds)
+            try:
+                self.expire()
+            except Exception as e:
+                logging.warning(f"Session sweep failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def build_session_store(name: str, on_evict: Optional[Callable[[str], None]] = None) -> SessionBackend:
+    """Instantiate the backend configured by ``SESSION_BACKEND``.
+
+    Shared backends are imported lazily so the Redis client is only needed
+    when that backend is selected.
+    """
+    name = (name or "memory").strip().lower()
+    if name == "memory":
+        return SessionStore(
+            max_entries=settings.SESSION_MAX_ENTRIES,
+            ttl_seconds=settings.SESSION_TTL_SECONDS,
+            sweep_seconds=settings.SESSION_SWEEP_SECONDS,
+            on_evict=on_evict,
+        )
+    if name == "mongo":
+        from ..mongodb import get_async_sessions_collection
+        from .mongo_session_store import MongoSessionStore
+        return MongoSessionStore(get_async_sessions_collection, ttl_seconds=settings.SESSION_TTL_SECONDS)
+    if name == "redis":
+        from .redis_session_store import RedisSessionStore
+        return RedisSessionStore(
+            settings.SESSION_REDIS_URL,
+            ttl_seconds=settings.SESSION_TTL_SECONDS,
+            prefix=settings.SESSION_KEY_PREFIX,
+        )
+    raise ValueError(f"Unknown SESSION_BACKEND '{name}'")
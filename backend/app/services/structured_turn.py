@@ -0,0 +1,106 @@
+"""Single structured completion per intake turn.
+
+Instead of one completion to extract a field and a second to phrase the next
+question, ``STRUCTURED_TURN_PROMPT`` asks for both as a JSON object. The
+reply is validated against a per-field schema; anything that fails to parse
+or validate returns None so the caller falls back to the two-call path.
+Valid values are then cleaned up by the caller exactly as extraction
+completions are (``LLM_VALUE_NORMALIZERS`` in the chat route).
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..metrics import metrics
+from ..system_prompt import STRUCTURED_TURN_PROMPT
+
+JSON_OBJECT_RE = re.compile(r"\{.*\}", flags=re.DOTALL)
+
+
+def _text(value: Any) -> Optional[str]:
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+    return None
+
+
+def _email(value: Any) -> Optional[str]:
+    text = _text(value)
+    if text and re.fullmatch(r"[\w\.\+-]+@[\w-]+(?:\.[\w-]+)+", text):
+        return text.lower()
+    return None
+
+
+def _phone(value: Any) -> Optional[str]:
+    digits = re.sub(r"\D", "", str(value)) if value is not None else ""
+    return digits if 8 <= len(digits) <= 15 else None
+
+
+def _years(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)) and 0 <= value < 80:
+        return int(value)
+    if isinstance(value, str) and re.fullmatch(r"\s*\d{1,2}(?:\.\d+)?\s*", value):
+        return int(float(value))
+    return None
+
+
+# field -> (description used in the prompt, validator returning the clean value or None)
+FIELDS: Dict[str, Tuple[str, Callable[[Any], Any]]] = {
+    "name": ("full name", _text),
+    "email": ("email address", _email),
+    "phone": ("phone number", _phone),
+    "experience": ("total years of professional experience, as an integer", _years),
+    "position": ("desired job position", _text),
+    "location": ("current location", _text),
+}
+
+
+def build_prompt(field: str, user_message: str, next_instruction: str) -> str:
+    description, _ = FIELDS[field]
+    return STRUCTURED_TURN_PROMPT.format(
+        user_message=user_message,
+        field_description=description,
+        next_instruction=next_instruction,
+    )
+
+
+def parse_reply(field: str, raw: str) -> Optional[Tuple[Any, str]]:
+    """Validate a structured reply; returns (value, next_message) or None."""
+    match = JSON_OBJECT_RE.search(raw or "")
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    _, validator = FIELDS[field]
+    value = validator(data.get("value"))
+    next_message = _text(data.get("next_message"))
+    if value is None or next_message is None:
+        return None
+    return value, next_message.split("\n")[0]
+
+
+async def structured_turn(
+    generate: Callable, field: str, user_message: str, next_instruction: str
+) -> Optional[Tuple[Any, str]]:
+    """Run the combined completion, recording whether the two-call fallback is needed."""
+    metrics.incr("structured_turn_total", field=field)
+    result = parse_reply(field, await generate(build_prompt(field, user_message, next_instruction)))
+    if result is None:
+        metrics.incr("structured_turn_fallbacks", field=field)
+    return result
+
+
+def fallback_rate(field: Optional[str] = None) -> float:
+    if field is None:
+        total = metrics.total("structured_turn_total")
+        fallbacks = metrics.total("structured_turn_fallbacks")
+    else:
+        total = metrics.get("structured_turn_total", field=field)
+        fallbacks = metrics.get("structured_turn_fallbacks", field=field)
+    return fallbacks / total if total else 0.0
@@ -62,4 +62,11 @@ Return ONLY the question itself, with no introduction, filler, or extra text. Do
 
 # Completion messages
 INTERVIEW_COMPLETE_MESSAGE = "Thank you for completing the interview! We'll be in touch soon!"
-INTERVIEW_ALREADY_COMPLETE_MESSAGE = "Interview completed!"
\ No newline at end of file
+INTERVIEW_ALREADY_COMPLETE_MESSAGE = "Interview completed!"
+
+# Combined extraction + next question in a single structured completion
+STRUCTURED_TURN_PROMPT = """The candidate replied: '{user_message}'.
+1. Extract the candidate's {field_description} from the reply.
+2. Write the interviewer's next message following this instruction: {next_instruction}
+Respond with ONLY a JSON object, no code fences or commentary, exactly of the form:
+{{"value": <the extracted value, or null if it is missing>, "next_message": "<the next message>"}}"""
@@ -0,0 +1,192 @@
+"""
+Candidate lookup latency before and after the index bootstrap.
+
+Seeds a scratch collection with synthetic candidates (a million by default),
+then times the queries the API and dashboard run against it, first with only
+the ``_id`` index and then after ``CandidateRepository.ensure_indexes()``:
+
+- email:   ``find_by_email`` (what every rejection used to do first);
+- status:  newest 50 candidates with a given status;
+- recent:  newest 50 candidates;
+- skill:   50 candidates with a given skill;
+- reject:  the rejection upsert on an existing email.
+
+For each it reports p50/p95 latency and the documents the server examined
+(from ``explain``). It also fires concurrent duplicate rejections for new
+emails and counts the documents they leave behind. Needs a mongod at
+DATABASE_URL (or ``--url``); seeding a million documents takes a minute or
+two. ``--keep`` leaves the collection in place so later runs skip seeding.
+
+Usage examples (from the backend folder):
+
+  python scripts/bench_candidate_indexes.py
+  python scripts/bench_candidate_indexes.py --candidates 200000 --repeat 50 --keep
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.mongodb import client_options  # noqa: E402
+from app.services.candidate_repository import CandidateRepository  # noqa: E402
+
+SKILLS = ["Python", "Java", "Go", "Rust", "SQL", "Docker", "Kubernetes", "React", "AWS", "Kafka", "Redis", "Vue"]
+STATUSES = ["completed"] * 8 + ["rejected"] * 2
+EPOCH = datetime(2025, 1, 1)
+
+
+def synthetic(n: int, rng: random.Random) -> Dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "name": f"Candidate {n}",
+        "email": f"candidate-{n}@example.com",
+        "years_experience": rng.randint(0, 20),
+        "tech_skills": rng.sample(SKILLS, 3),
+        "english_proficiency_score": round(rng.uniform(40, 95), 1),
+        "status": rng.choice(STATUSES),
+        "created_at": EPOCH + timedelta(seconds=rng.randint(0, 365 * 86400)),
+    }
+
+
+async def seed(collection, count: int, batch: int) -> None:
+    existing = await collection.estimated_document_count()
+    if existing == count:
+        print(f"reusing {count} seeded candidates")
+        return
+    await collection.drop()
+    rng = random.Random(0)
+    started = time.perf_counter()
+    for offset in range(0, count, batch):
+        docs = [synthetic(n, rng) for n in range(offset, min(offset + batch, count))]
+        await collection.insert_many(docs, ordered=False)
+        print(f"\rseeding {offset + len(docs)}/{count}", end="", flush=True)
+    print(f"\rseeded {count} candidates in {time.perf_counter() - started:.1f}s")
+
+
+async def timed(run: Callable[[], Awaitable], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await run()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def measure(collection, repository: CandidateRepository, args: argparse.Namespace) -> Dict[str, Dict]:
+    rng = random.Random(1)
+
+    def email() -> str:
+        return f"candidate-{rng.randrange(args.candidates)}@example.com"
+
+    queries = {
+        "email": (
+            lambda: repository.find_by_email(email()),
+            lambda: collection.find({"email": email()}),
+        ),
+        "status": (
+            lambda: collection.find({"status": "rejected"}).sort("created_at", -1).limit(50).to_list(50),
+            lambda: collection.find({"status": "rejected"}).sort("created_at", -1).limit(50),
+        ),
+        "recent": (
+            lambda: collection.find().sort("created_at", -1).limit(50).to_list(50),
+            lambda: collection.find().sort("created_at", -1).limit(50),
+        ),
+        "skill": (
+            lambda: collection.find({"tech_skills": rng.choice(SKILLS)}).limit(50).to_list(50),
+            lambda: collection.find({"tech_skills": "Rust"}).limit(50),
+        ),
+        "reject": (
+            lambda: repository.upsert_by_email(email(), {"status": "rejected", "rejection_reason": "bench"}),
+            None,
+        ),
+    }
+    results = {}
+    for name, (run, explain) in queries.items():
+        samples = await timed(run, args.repeat)
+        examined = None
+        if explain is not None:
+            plan = await explain().explain()
+            examined = plan.get("executionStats", {}).get("totalDocsExamined")
+        results[name] = {"p50": statistics.median(samples), "p95": sorted(samples)[int(len(samples) * 0.95) - 1],
+                         "examined": examined}
+    return results
+
+
+async def duplicate_rejections(collection, repository: CandidateRepository, label: str, emails: int) -> int:
+    """Reject each new email twice at the same moment; returns how many extra documents that left."""
+    targets = [f"race-{label}-{n}@example.com" for n in range(emails)]
+    await asyncio.gather(*(
+        repository.upsert_by_email(target, {"status": "rejected"}, on_insert={"name": "Unknown"})
+        for target in targets for _ in range(2)
+    ), return_exceptions=True)
+    stored = await collection.count_documents({"email": {"$in": targets}})
+    await collection.delete_many({"email": {"$in": targets}})
+    return stored - len(targets)
+
+
+def report(label: str, results: Dict[str, Dict]) -> None:
+    print(f"\n{label}")
+    print(f"{'query':<10}{'p50':>11}{'p95':>11}{'docs examined':>16}")
+    for name, r in results.items():
+        examined = "-" if r["examined"] is None else f"{r['examined']:,}"
+        print(f"{name:<10}{r['p50'] * 1000:>9.2f}ms{r['p95'] * 1000:>9.2f}ms{examined:>16}")
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    client = AsyncIOMotorClient(args.url, **client_options())
+    collection = client[args.db]["candidates"]
+    repository = CandidateRepository(lambda: collection)
+    try:
+        await repository.ping()
+        await seed(collection, args.candidates, args.batch)
+        await collection.drop_indexes()
+        before = await measure(collection, repository, args)
+        race_before = await duplicate_rejections(collection, repository, "before", args.race_emails)
+        report("without indexes (collection scans)", before)
+
+        started = time.perf_counter()
+        await repository.ensure_indexes()
+        print(f"\nindex build: {time.perf_counter() - started:.1f}s")
+        after = await measure(collection, repository, args)
+        race_after = await duplicate_rejections(collection, repository, "after", args.race_emails)
+        report("with indexes", after)
+
+        print(f"\nduplicate documents from {args.race_emails} racing rejection pairs: "
+              f"{race_before} without indexes, {race_after} with the unique email index")
+        for name in before:
+            print(f"{name:<10}p50 speed-up {before[name]['p50'] / max(after[name]['p50'], 1e-9):,.1f}x")
+    finally:
+        if not args.keep:
+            await client.drop_database(args.db)
+        client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Candidate index benchmark")
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--db", default="talent_hiring_bench", help="Scratch database")
+    parser.add_argument("--candidates", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000, help="Documents per insert_many while seeding")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--race-emails", type=int, default=200)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded collection for the next run")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Measure API cold start: time until the process is alive and until it is ready.
+
+Starts ``uvicorn app.main:app`` in a fresh process on a free port and polls
+``/health`` (liveness: the app imported and the server is accepting) and
+``/ready`` (every required component loaded and warmed up). Reports both
+times for each run plus the per-component load times from ``/ready``.
+
+MongoDB must be reachable at DATABASE_URL for ``/ready`` to turn green; the
+LLM backend is whatever LLM_PROVIDER says (``fake`` by default here, so the
+run measures spaCy and the app itself rather than a remote API).
+
+Usage examples (from the backend folder):
+
+  python scripts/bench_cold_start.py
+  python scripts/bench_cold_start.py --runs 5 --provider gguf
+  python scripts/bench_cold_start.py --no-warmup
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def fetch(url: str) -> Tuple[Optional[int], Optional[Dict]]:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"null")
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        return None, None
+
+
+def cold_start(args: argparse.Namespace) -> Dict:
+    port = free_port()
+    env = dict(os.environ)
+    env.setdefault("LLM_PROVIDER", args.provider)
+    env["WARMUP_ENABLED"] = "false" if args.no_warmup else "true"
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    result: Dict = {"health": None, "ready": None, "report": None}
+    try:
+        while time.perf_counter() - started < args.timeout:
+            if result["health"] is None:
+                status, _ = fetch(f"{base}/health")
+                if status == 200:
+                    result["health"] = time.perf_counter() - started
+            if result["health"] is not None:
+                status, report = fetch(f"{base}/ready")
+                result["report"] = report
+                if status == 200:
+                    result["ready"] = time.perf_counter() - started
+                    break
+            time.sleep(args.poll)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="API cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--provider", default="fake", help="LLM_PROVIDER, unless already set in the environment")
+    parser.add_argument("--no-warmup", action="store_true", help="Load components without a warmup inference")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--poll", type=float, default=0.05)
+    args = parser.parse_args()
+
+    health_times = []
+    ready_times = []
+    for run in range(1, args.runs + 1):
+        result = cold_start(args)
+        health = f"{result['health']:.2f}s" if result["health"] is not None else "never"
+        ready = f"{result['ready']:.2f}s" if result["ready"] is not None else "not ready"
+        print(f"run {run}: alive after {health}, ready after {ready}")
+        components = (result["report"] or {}).get("components", {})
+        for name, state in components.items():
+            seconds = state["load_seconds"]
+            timing = f"{seconds:.2f}s" if seconds is not None else "-"
+            error = f"  ({state['error']})" if state["error"] else ""
+            print(f"  {name:<8} {state['status']:<9} {timing}{error}")
+        if result["health"] is not None:
+            health_times.append(result["health"])
+        if result["ready"] is not None:
+            ready_times.append(result["ready"])
+
+    if health_times:
+        print(f"\nmedian time to /health: {statistics.median(health_times):.2f}s")
+    if ready_times:
+        print(f"median time to /ready:  {statistics.median(ready_times):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark interview throughput with many simultaneous candidates.
+
+Drives the intake stages of /api/conversation/message (greeting through
+techStack) for N concurrent interviews against an in-process fake LLM, once
+with an awaitable backend and once with a blocking one, to show how much a
+synchronous client inside the async handler serialises the event loop.
+
+Usage examples (from the backend folder):
+
+  python scripts/bench_concurrency.py --interviews 200 --delay 0.05
+  python scripts/bench_concurrency.py --interviews 50 --delay 0.2 --skip-blocking
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routes import chat  # noqa: E402
+from app.schemas import SendMessageRequest  # noqa: E402
+from app.services.fake_service import FakeLLMService  # noqa: E402
+
+# Intake stages and a representative candidate reply for each
+TURNS = [
+    ("greeting", ""),
+    ("name", "My name is Jane Doe"),
+    ("email", "jane{n}@example.com"),
+    ("phone", "5551234567"),
+    ("experience", "5 years"),
+    ("position", "Backend Engineer"),
+    ("location", "Berlin"),
+]
+
+
+async def run_interview(n: int) -> float:
+    info: dict = {"email": f"bench-{n}@example.com"}
+    started = time.perf_counter()
+    for stage, reply in TURNS:
+        payload = SendMessageRequest(
+            userMessage=reply.format(n=n),
+            currentStage=stage,
+            candidateInfo=info,
+            currentTechQuestionIndex=0,
+        )
+        response = await chat.conversation_message(payload)
+        info = response.updatedCandidateInfo
+    return time.perf_counter() - started
+
+
+async def run(interviews: int) -> List[float]:
+    return await asyncio.gather(*(run_interview(n) for n in range(interviews)))
+
+
+def bench(label: str, provider: FakeLLMService, interviews: int) -> None:
+    chat.llama2 = provider
+    chat.sessions.clear()
+    started = time.perf_counter()
+    latencies = asyncio.run(run(interviews))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(
+        f"{label:<10} interviews={interviews} llm_calls={provider.calls} "
+        f"wall={elapsed:.2f}s throughput={interviews / elapsed:.1f} interviews/s "
+        f"p50={p50:.2f}s p95={p95:.2f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent interview throughput benchmark")
+    parser.add_argument("--interviews", type=int, default=100, help="Simultaneous interviews. Default: 100")
+    parser.add_argument("--delay", type=float, default=0.05, help="Fake LLM latency per call in seconds. Default: 0.05")
+    parser.add_argument("--skip-blocking", action="store_true", help="Only run the async backend")
+    args = parser.parse_args()
+
+    bench("async", FakeLLMService(delay=args.delay), args.interviews)
+    if not args.skip_blocking:
+        bench("blocking", FakeLLMService(delay=args.delay, blocking=True), args.interviews)
+
+
+if __name__ == "__main__":
+    main()
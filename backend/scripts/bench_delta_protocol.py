@@ -0,0 +1,150 @@
+"""
+Compare per-turn payload size and latency of the two conversation protocols.
+
+Plays the same interview through ``/api/conversation/message`` the way the
+frontend does today (the whole candidateInfo, technicalQA included, sent and
+returned every turn) and through ``/api/conversation/turn`` (session token
+and message in, changed fields and version out). The app runs in-process
+behind httpx's ASGI transport with a zero-delay fake LLM, so the timings are
+the request handling, serialisation and parsing that differ between the two.
+
+The interview stops one answer short of completion so no database is needed.
+
+Usage examples (from the backend folder):
+
+  python scripts/bench_delta_protocol.py
+  python scripts/bench_delta_protocol.py --skills 12 --answer-words 250 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("QUESTION_BANK_ENABLED", "false")
+os.environ.setdefault("MEMO_CACHE_MONGO_ENABLED", "false")
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.routes import chat  # noqa: E402
+from app.services.fake_service import FakeLLMService  # noqa: E402
+
+SKILLS = ["Python", "Docker", "SQL", "Kubernetes", "React", "Java", "Go", "Redis", "Kafka", "AWS", "Rust", "Vue"]
+INTAKE = [
+    ("greeting", ""),
+    ("name", "My name is Jane Doe"),
+    ("email", "jane.{n}@example.com"),
+    ("phone", "+1 555 123 4567"),
+    ("experience", "6 years"),
+    ("position", "Backend Engineer"),
+    ("location", "Berlin, Germany"),
+]
+
+Turn = Tuple[str, int, int, float]
+
+
+def answer_text(number: int, words: int) -> str:
+    base = ("I would start by profiling the service under realistic load, then cache the hot path, "
+            "add the missing index and move the slow work to a background queue. ").split()
+    return f"Answer {number}: " + " ".join(base[i % len(base)] for i in range(words))
+
+
+async def post(client: httpx.AsyncClient, url: str, body: Dict) -> Tuple[Dict, int, int, float]:
+    raw = json.dumps(body).encode()
+    started = time.perf_counter()
+    response = await client.post(url, content=raw, headers={"Content-Type": "application/json"})
+    data = response.json()
+    elapsed = time.perf_counter() - started
+    response.raise_for_status()
+    return data, len(raw), len(response.content), elapsed
+
+
+def script(n: int, skills: int, answers: int, words: int) -> List[Tuple[str, str]]:
+    turns = [(stage, text.format(n=n)) for stage, text in INTAKE]
+    turns.append(("techStack", ", ".join(SKILLS[:skills])))
+    turns += [("technicalQuestions", answer_text(i, words)) for i in range(1, answers + 1)]
+    return turns
+
+
+async def run_compat(client: httpx.AsyncClient, turns: List[Tuple[str, str]]) -> List[Turn]:
+    info: Dict = {"fullName": "", "email": "", "phone": "", "yearsExperience": "", "desiredPosition": "",
+                  "location": "", "techStack": [], "technicalAnswers": {}, "technicalQA": [], "timestamp": ""}
+    stage, index, results = "greeting", 0, []
+    for name, text in turns:
+        body = {"userMessage": text, "currentStage": stage, "candidateInfo": info,
+                "currentTechQuestionIndex": index}
+        data, sent, received, elapsed = await post(client, "/api/conversation/message", body)
+        info = {**info, **data["updatedCandidateInfo"]}
+        stage = data["nextStage"]
+        if data.get("technicalQuestion"):
+            index += 1
+        results.append((name, sent, received, elapsed))
+    return results
+
+
+async def run_delta(client: httpx.AsyncClient, turns: List[Tuple[str, str]]) -> List[Turn]:
+    info: Dict = {}
+    token, version, results = None, None, []
+    for name, text in turns:
+        body = {"sessionToken": token, "userMessage": text, "version": version}
+        data, sent, received, elapsed = await post(client, "/api/conversation/turn", body)
+        token, version = data["sessionToken"], data["version"]
+        info.update(data["changes"])
+        for key, items in data["appended"].items():
+            info[key] = info.get(key, []) + items
+        results.append((name, sent, received, elapsed))
+    return results
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    chat.llama2 = FakeLLMService(delay=0)
+    transport = httpx.ASGITransport(app=app)
+    runs: Dict[str, List[List[Turn]]] = {"compat": [], "delta": []}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for n in range(args.repeat):
+            turns = script(n, args.skills, args.skills - 1, args.answer_words)
+            runs["compat"].append(await run_compat(client, turns))
+            runs["delta"].append(await run_delta(client, turns))
+
+    print(f"{'turn':<22}{'compat bytes':>14}{'delta bytes':>13}{'compat ms':>11}{'delta ms':>10}")
+    totals = {"compat": [0, 0.0], "delta": [0, 0.0]}
+    for i, (name, *_rest) in enumerate(runs["compat"][0]):
+        row = {}
+        for mode in ("compat", "delta"):
+            size = statistics.mean(r[i][1] + r[i][2] for r in runs[mode])
+            latency = statistics.median(r[i][3] for r in runs[mode]) * 1000
+            totals[mode][0] += size
+            totals[mode][1] += latency
+            row[mode] = (size, latency)
+        print(f"{i + 1:>2} {name:<19}{row['compat'][0]:>14.0f}{row['delta'][0]:>13.0f}"
+              f"{row['compat'][1]:>11.2f}{row['delta'][1]:>10.2f}")
+    saved_bytes = totals["compat"][0] - totals["delta"][0]
+    saved_ms = totals["compat"][1] - totals["delta"][1]
+    turns = len(runs["compat"][0])
+    print(f"\nper interview: {totals['compat'][0]:.0f} -> {totals['delta'][0]:.0f} bytes "
+          f"({saved_bytes / totals['compat'][0]:.0%} less), "
+          f"{totals['compat'][1]:.1f} -> {totals['delta'][1]:.1f} ms")
+    print(f"saved per turn: {saved_bytes / turns:.0f} bytes, {saved_ms / turns:.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Conversation protocol payload benchmark")
+    parser.add_argument("--skills", type=int, default=8, help="Skills in the tech stack (questions asked)")
+    parser.add_argument("--answer-words", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    args.skills = max(2, min(args.skills, len(SKILLS)))
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Memory, time-to-first-byte and downstream load time of the candidate exports.
+
+Compares the streaming exporter (``/api/export/csv`` today: cursor batches
+with a projection, CSV encoded a chunk at a time) with the previous
+implementation (``list(find())`` into a pandas DataFrame, written to a
+StringIO and sent as one chunk), and the analytics formats of
+``/api/export`` (``ndjson``, ``parquet``; add ``--columns`` to project).
+Each run happens in a fresh subprocess so its peak RSS is its own, writes
+the body to a temporary file as it arrives, and reports:
+
+- time to first byte and total time to drain the response body;
+- bytes produced;
+- resident memory just before the export and the process's peak during it;
+- time for an analytics job to load the file into a table (pandas for
+  CSV/NDJSON, pyarrow for Parquet).
+
+``--source synthetic`` (default) serves generated candidates from an
+in-process cursor, so the numbers are the exporter's own cost.
+``--source mongo`` seeds a scratch database at DATABASE_URL (or ``--url``)
+and exports through the real drivers. The legacy run and the load step
+need pandas: ``pip install -r requirements-dev.txt``.
+
+Usage examples (from the backend folder):
+
+  python scripts/bench_export.py
+  python scripts/bench_export.py --rows 1000000 --modes streaming
+  python scripts/bench_export.py --modes streaming,ndjson,parquet --columns email,tech_skills,english_proficiency_score
+  python scripts/bench_export.py --source mongo --rows 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("QUESTION_BANK_ENABLED", "false")
+# Measure the exporters themselves, not the snapshot cache that serves repeat downloads
+os.environ.setdefault("EXPORT_SNAPSHOT_CACHE_BYTES", "0")
+
+SKILLS = ["Python", "Java", "Go", "Rust", "SQL", "Docker", "Kubernetes", "React"]
+ANSWER = "I would profile the slow endpoint first, then add the missing index and cache the hot path."
+
+
+def synthetic(n: int) -> Dict:
+    return {
+        "id": str(uuid.UUID(int=n)),
+        "name": f"Candidate {n}",
+        "email": f"candidate-{n}@example.com",
+        "phone": "+1 555 123 4567",
+        "years_experience": n % 20,
+        "desired_position": "Backend Engineer",
+        "location": "Berlin, Germany",
+        "tech_skills": [SKILLS[n % 8], SKILLS[(n + 3) % 8], SKILLS[(n + 5) % 8]],
+        "qa_responses": [
+            {"question": f"Question {i} about {SKILLS[(n + i) % 8]}?", "answer": ANSWER,
+             "metrics": {"grammar": 0.9, "vocabulary": 0.8, "coherence": 0.85}}
+            for i in range(3)
+        ],
+        "english_proficiency_score": 60 + n % 35,
+        "status": "completed",
+        "created_at": datetime(2025, 1, 1) + timedelta(minutes=n),
+    }
+
+
+class SyntheticCursor:
+    """Yields generated candidates lazily, synchronously (legacy) or in async batches (streaming)."""
+
+    def __init__(self, rows: int, batch_size: int):
+        self.rows = rows
+        self.batch_size = batch_size
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (synthetic(n) for n in range(self.rows))
+
+    async def __aiter__(self):
+        for n in range(self.rows):
+            if n % self.batch_size == 0:
+                # A batch boundary is where the real cursor awaits the next getMore
+                await asyncio.sleep(0)
+            yield synthetic(n)
+
+
+class SyntheticCollection:
+    def __init__(self, rows: int):
+        self.rows = rows
+
+    def find(self, filter=None, projection=None, batch_size: int = 101, sort=None) -> SyntheticCursor:
+        return SyntheticCursor(self.rows, batch_size)
+
+    async def find_one(self, filter=None, projection=None, sort=None):
+        # No since-cursor for generated rows
+        return None
+
+
+def legacy_export(collection):
+    """The export as it was before streaming: everything in memory, then one chunk."""
+    import io
+    import pandas as pd
+    from fastapi.responses import StreamingResponse
+
+    data = []
+    for c in list(collection.find()):
+        qa_text = "\n\n".join(
+            f"Q{idx}: {qa.get('question', '')}\nA{idx}: {qa.get('answer', '')}"
+            for idx, qa in enumerate(c.get("qa_responses", []), 1)
+        )
+        data.append({
+            "ID": c.get("id"),
+            "Name": c.get("name"),
+            "Email": c.get("email"),
+            "Phone": c.get("phone"),
+            "Years Experience": c.get("years_experience"),
+            "Position": c.get("desired_position"),
+            "Location": c.get("location"),
+            "Tech Skills": ", ".join(c.get("tech_skills", [])) if c.get("tech_skills") else "",
+            "Technical Q&A": qa_text,
+            "English Score": c.get("english_proficiency_score"),
+            "Created At": c.get("created_at"),
+        })
+    df = pd.DataFrame(data)
+    stream = io.StringIO()
+    df.to_csv(stream, index=False)
+    stream.seek(0)
+    return StreamingResponse(iter([stream.getvalue()]), media_type="text/csv")
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def peak_rss_bytes() -> int:
+    # VmHWM is this process's own high-water mark; ru_maxrss would include the parent's at fork time
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+async def seed_mongo(url: str, db: str, rows: int) -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    client = AsyncIOMotorClient(url)
+    collection = client[db]["candidates"]
+    if await collection.estimated_document_count() != rows:
+        await collection.drop()
+        for offset in range(0, rows, 10_000):
+            await collection.insert_many([synthetic(n) for n in range(offset, min(offset + 10_000, rows))])
+    client.close()
+
+
+async def run_one(args: argparse.Namespace) -> Dict:
+    from fastapi import Request
+    from app.routes import chat, export
+
+    if args.source == "mongo":
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from pymongo import MongoClient
+        async_collection = AsyncIOMotorClient(args.url)[args.db]["candidates"]
+        sync_collection = MongoClient(args.url)[args.db]["candidates"]
+    else:
+        async_collection = sync_collection = SyntheticCollection(args.rows)
+    chat.candidates.collection_getter = lambda: async_collection
+    # No change counter: every run is a fresh full export
+    chat.candidates.counters_getter = None
+    request = Request({"type": "http", "method": "GET", "headers": []})
+    if args.run == "parquet":
+        # Imported on the first Parquet export; a server pays that once, not per export
+        import pyarrow.parquet  # noqa: F401
+
+    baseline = rss_bytes()
+    started = time.perf_counter()
+    if args.run == "legacy":
+        # The old handler did all of this inside the request, before returning the response
+        response = legacy_export(sync_collection)
+    elif args.run == "streaming":
+        response = await export.export_csv(request)
+    else:
+        response = await export.export_candidates(
+            request, format=args.run, status=None, created_from=None, created_to=None, skill=None, min_score=None,
+            columns=args.columns, since=None,
+        )
+    first_byte = None
+    size = 0
+    with open(args.output, "wb") as out:
+        async for chunk in response.body_iterator:
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            chunk = chunk.encode() if isinstance(chunk, str) else chunk
+            out.write(chunk)
+            size += len(chunk)
+    total = time.perf_counter() - started
+    peak = peak_rss_bytes()
+    return {"ttfb": first_byte, "total": total, "bytes": size, "rss_before": baseline, "peak_rss": peak}
+
+
+def load_seconds(mode: str, path: str) -> float:
+    """Time for a downstream job to read the export into a table."""
+    started = time.perf_counter()
+    if mode == "parquet":
+        import pyarrow.parquet as pq
+        pq.read_table(path)
+    else:
+        import pandas as pd
+        pd.read_json(path, lines=True) if mode == "ndjson" else pd.read_csv(path)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Candidate CSV export benchmark")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--modes", default="legacy,streaming",
+                        help="Comma-separated: legacy, streaming (CSV) and ndjson, parquet (/api/export)")
+    parser.add_argument("--columns", default=None, help="Columns for the ndjson and parquet modes (default all)")
+    parser.add_argument("--source", choices=["synthetic", "mongo"], default="synthetic")
+    parser.add_argument("--url", default=os.getenv("DATABASE_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db", default="talent_hiring_bench_export", help="Scratch database for --source mongo")
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(asyncio.run(run_one(args))))
+        return
+
+    if args.source == "mongo":
+        asyncio.run(seed_mongo(args.url, args.db, args.rows))
+    print(f"{args.rows:,} candidates from {args.source}")
+    print(f"{'mode':<11}{'first byte':>12}{'total':>10}{'MB out':>9}{'RSS before':>13}{'peak RSS':>11}{'load':>9}")
+    for mode in args.modes.split(","):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, f"export.{mode}")
+            command = [sys.executable, __file__, "--run", mode, "--rows", str(args.rows), "--source", args.source,
+                       "--url", args.url, "--db", args.db, "--output", path]
+            if args.columns:
+                command += ["--columns", args.columns]
+            output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+            r = json.loads(output.strip().splitlines()[-1])
+            load = load_seconds(mode, path)
+        print(f"{mode:<11}{r['ttfb'] * 1000:>10.1f}ms{r['total']:>9.2f}s{r['bytes'] / 2**20:>9.1f}"
+              f"{r['rss_before'] / 2**20:>10.0f} MB{r['peak_rss'] / 2**20:>8.0f} MB{load:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
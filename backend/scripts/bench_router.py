@@ -0,0 +1,91 @@
+"""
+Exercise the latency-aware LLM router against fake providers.
+
+Builds an LLMRouter over in-process fake backends with configurable delays,
+jitter and failure rates, fires a burst of concurrent calls, and reports
+where calls went, end-to-end latency, how often hedging fired and won, and
+the final breaker state of each provider. A provider can also be made to
+fail completely partway through to show its breaker opening.
+
+Usage examples (from the backend folder):
+
+  python scripts/bench_router.py
+  python scripts/bench_router.py --calls 2000 --no-hedge
+  python scripts/bench_router.py --outage-after 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.metrics import metrics  # noqa: E402
+from app.services.fake_service import FakeLLMService  # noqa: E402
+from app.services.llm_provider import is_unavailable  # noqa: E402
+from app.services.llm_router import LLMRouter  # noqa: E402
+
+
+async def run(args: argparse.Namespace) -> None:
+    fast = FakeLLMService(name="fast-flaky", delay=0.02, jitter=0.2, failure_rate=0.05, seed=1)
+    steady = FakeLLMService(name="steady", delay=0.06, jitter=0.02, seed=2)
+    slow = FakeLLMService(name="slow", delay=0.3, jitter=0.1, seed=3)
+    router = LLMRouter(
+        [fast, steady, slow],
+        timeout=2.0,
+        hedge=not args.no_hedge,
+        hedge_min_delay=args.hedge_min_delay_ms / 1000,
+        breaker_cooldown=5.0,
+    )
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    failures = 0
+
+    async def one(i: int) -> None:
+        nonlocal failures
+        if args.outage_after and i == args.outage_after:
+            fast.failure_rate = 1.0
+        async with semaphore:
+            started = time.perf_counter()
+            text = await router.generate_response(f"Extract the candidate's name from this message: 'Jane {i}'.")
+            latencies.append(time.perf_counter() - started)
+            if is_unavailable(text):
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.calls)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[int(len(latencies) * 0.95)]
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(f"calls={args.calls} wall={elapsed:.2f}s failures={failures} p50={p50 * 1000:.0f}ms "
+          f"p95={p95 * 1000:.0f}ms p99={p99 * 1000:.0f}ms")
+    counters = metrics.snapshot()["counters"]
+    print(f"hedges={counters.get('llm_router_hedges', 0)}")
+    for provider in (fast, steady, slow):
+        ok = counters.get(f"llm_router_calls{{outcome=ok,provider={provider.name}}}", 0)
+        err = counters.get(f"llm_router_calls{{outcome=error,provider={provider.name}}}", 0)
+        wins = counters.get(f"llm_router_hedge_wins{{provider={provider.name}}}", 0)
+        print(f"  {provider.name:<11} backend_calls={provider.calls:<5} ok={ok:<5} errors={err:<4} hedge_wins={wins}")
+    for row in router.status():
+        print(f"  {row}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LLM router simulation with fake providers")
+    parser.add_argument("--calls", type=int, default=1000, help="Total calls. Default: 1000")
+    parser.add_argument("--concurrency", type=int, default=50, help="Calls in flight at once. Default: 50")
+    parser.add_argument("--no-hedge", action="store_true", help="Disable hedged requests")
+    parser.add_argument("--hedge-min-delay-ms", type=int, default=50, help="Minimum hedge delay. Default: 50")
+    parser.add_argument("--outage-after", type=int, default=0, help="Make the fast provider fail from this call on")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark batch proficiency scoring against the original per-answer loop.
+
+Generates a few thousand synthetic technical answers and scores them twice:
+once the way ``ScoringService.calculate_proficiency`` used to (``nlp(text)``
+per answer on the full pipeline, five passes over each doc) and once with
+``ScoringService.score_answers`` (``nlp.pipe`` on the trimmed pipeline, one
+pass). Reports answers per second for each and checks the scores agree.
+
+Usage examples (from the backend folder):
+
+  python scripts/bench_scoring.py
+  python scripts/bench_scoring.py --answers 5000 --batch-size 128 --n-process 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spacy  # noqa: E402
+
+from app.services.scoring_service import ScoringService  # noqa: E402
+
+SENTENCES = [
+    "A Python decorator wraps a function to extend its behaviour without modifying it.",
+    "React uses a virtual DOM and reconciliation to minimise expensive updates.",
+    "Indexes speed up reads but every write has to maintain them as well.",
+    "I would profile the endpoint first and then cache the expensive query.",
+    "Docker images are built in layers, so ordering instructions matters for caching.",
+    "The garbage collector reclaims objects that are no longer reachable.",
+    "In Kubernetes a deployment manages replica sets and rolling updates.",
+    "Closures capture variables from the enclosing scope by reference.",
+    "yes",
+    "I am not sure, maybe use a loop?",
+]
+
+
+def make_answers(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(SENTENCES, k=rng.randint(1, 6))) for _ in range(count)]
+
+
+def load_full_pipeline():
+    try:
+        return spacy.load("en_core_web_sm")
+    except Exception:
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        return nlp
+
+
+def legacy_scores(nlp, responses: List[str]) -> Tuple[List[float], int]:
+    """The original per-answer implementation, kept verbatim for comparison.
+
+    Also returns the total sentence count: the original split every answer
+    into sentences, which is part of its cost, so it is reported too.
+    """
+    scores = []
+    sentences = 0
+    for response in responses:
+        doc = nlp(response)
+        word_count = len([token for token in doc if not token.is_punct])
+        avg_word_length = sum(len(token.text) for token in doc if not token.is_punct) / max(word_count, 1)
+        sentence_count = len(list(doc.sents))
+        sentences += sentence_count
+        complex_words = len([token for token in doc if len(token.text) > 7])
+        unique_words = len(set([token.lemma_ for token in doc if not token.is_stop and not token.is_punct]))
+        vocab_diversity = unique_words / max(word_count, 1)
+        proper_structure = sum(1 for token in doc if token.dep_ in ['nsubj', 'ROOT', 'dobj'])
+        grammar_score = proper_structure / max(word_count, 1)
+        score = (
+            min(word_count / 50, 1) * 0.2 +
+            min(avg_word_length / 6, 1) * 0.15 +
+            vocab_diversity * 0.25 +
+            grammar_score * 0.25 +
+            min(complex_words / 10, 1) * 0.15
+        ) * 100
+        scores.append(score)
+    return scores, sentences
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Proficiency scoring benchmark")
+    parser.add_argument("--answers", type=int, default=3000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--n-process", type=int, default=1)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    answers = make_answers(args.answers)
+    full = load_full_pipeline()
+    service = ScoringService(batch_size=args.batch_size, n_process=args.n_process)
+    print(f"full pipeline:    {full.pipe_names}")
+    print(f"scoring pipeline: {service.nlp.pipe_names}")
+
+    started = time.perf_counter()
+    old, sentences = legacy_scores(full, answers)
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    report = service.score_answers(answers)
+    batch_seconds = time.perf_counter() - started
+
+    mismatches = sum(1 for a, b in zip(old, report.answers) if abs(a - b.score) > 1e-6)
+    print(f"\n{args.answers} answers ({sentences} sentences split by the legacy path)")
+    print(f"legacy per-answer: {legacy_seconds:.2f}s ({args.answers / legacy_seconds:.0f} answers/s)")
+    print(f"batched nlp.pipe:  {batch_seconds:.2f}s ({args.answers / batch_seconds:.0f} answers/s)")
+    print(f"speedup:           {legacy_seconds / batch_seconds:.2f}x")
+    print(f"aggregate score:   {round(sum(old) / len(old), 2)} (legacy) vs {report.overall} (batched)")
+    print(f"score mismatches:  {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Drain the background English-proficiency scoring queue.
+
+Claims pending jobs from the ``scoring_jobs`` collection (and running jobs
+whose lease has expired, e.g. after a crash) and scores them in this
+process, using the same lease as the API workers so both can run at once.
+Useful after downtime, or to score a backlog without starting the API.
+
+Usage examples (from the backend folder):
+
+  python scripts/drain_scoring_queue.py
+  python scripts/drain_scoring_queue.py --limit 100
+  python scripts/drain_scoring_queue.py --status
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.mongodb import (  # noqa: E402
+    get_candidates_collection, get_change_counters_collection, get_scoring_jobs_collection,
+)
+from app.services.scoring_queue import ScoringQueue  # noqa: E402
+from app.services.scoring_service import ScoringService  # noqa: E402
+
+
+async def run(args: argparse.Namespace) -> None:
+    queue = ScoringQueue(
+        ScoringService(),
+        get_scoring_jobs_collection,
+        get_candidates_collection,
+        workers=1,
+        lease_seconds=settings.SCORING_JOB_LEASE_SECONDS,
+        max_attempts=settings.SCORING_JOB_MAX_ATTEMPTS,
+        counters_getter=get_change_counters_collection,
+    )
+    print(f"Jobs by status: {await queue.counts()}")
+    if args.status:
+        return
+    started = time.perf_counter()
+    processed = await queue.drain(limit=args.limit)
+    elapsed = time.perf_counter() - started
+    print(f"Processed {processed} job(s) in {elapsed:.1f}s")
+    print(f"Jobs by status: {await queue.counts()}")
+    queue.executor.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drain the scoring job queue")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many jobs")
+    parser.add_argument("--status", action="store_true", help="Only print job counts by status")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Compare the rule-based intake extractors with the LLM extraction path.
+
+Runs a labelled corpus of candidate replies through
+``app.services.extraction_service`` and through the LLM helpers in
+``app.routes.chat`` and reports accuracy for each, plus how often the fast
+path would still have needed the LLM.
+
+Usage examples (from the backend folder):
+
+  # Against the configured Groq model (needs GROQ_API)
+  python scripts/eval_extractors.py
+
+  # Offline, rule-based path only
+  python scripts/eval_extractors.py --rules-only
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.metrics import metrics  # noqa: E402
+from app.routes import chat  # noqa: E402
+from app.services.extraction_service import fast_extract, llm_call_rates  # noqa: E402
+
+# (field, candidate message, expected value)
+CORPUS: List[Tuple[str, str, Any]] = [
+    ("name", "Jane Doe", "Jane Doe"),
+    ("name", "My name is John Smith", "John Smith"),
+    ("name", "I'm Priya Raman", "Priya Raman"),
+    ("name", "hi, i am carlos alvarez", "Carlos Alvarez"),
+    ("name", "This is Mary-Ann O'Neil", "Mary-Ann O'Neil"),
+    ("name", "Ahmed", "Ahmed"),
+    ("name", "my name is Wei", "Wei"),
+    ("name", "Sure, it's Li Na", "Li Na"),
+    ("name", "JOHN DOE", "John Doe"),
+    ("name", "Ranesh Kumar.", "Ranesh Kumar"),
+    # Not names: the rule path must leave these to the LLM ("" = no name given)
+    ("name", "Good morning", ""),
+    ("name", "Software engineer", ""),
+    ("name", "Data scientist", ""),
+    ("name", "I am fine", ""),
+    ("email", "jane.doe@example.com", "jane.doe@example.com"),
+    ("email", "my email is john_smith@mail.co.uk", "john_smith@mail.co.uk"),
+    ("email", "You can reach me at priya+jobs@gmail.com.", "priya+jobs@gmail.com"),
+    ("email", "Email: CARLOS@EXAMPLE.ORG", "carlos@example.org"),
+    ("email", "it's wei at example dot com", "wei@example.com"),
+    ("email", "a.b-c@sub.domain.io", "a.b-c@sub.domain.io"),
+    ("phone", "5551234567", "5551234567"),
+    ("phone", "+1 (555) 123-4567", "15551234567"),
+    ("phone", "my number is 98765 43210", "9876543210"),
+    ("phone", "call me on 020 7946 0958", "02079460958"),
+    ("phone", "+91-98450-12345", "919845012345"),
+    ("phone", "phone: 555.123.4567", "5551234567"),
+    ("experience", "5 years", 5),
+    ("experience", "five", 5),
+    ("experience", "I have 3 years of experience", 3),
+    ("experience", "around ten years", 10),
+    ("experience", "fresher", 0),
+    ("experience", "2", 2),
+    ("experience", "12 years in backend development", 12),
+    ("experience", "I have worked for 2 years and 6 months", 2),
+]
+
+LLM_EXTRACTORS = {
+    "name": chat.llm_extract_name,
+    "email": chat.llm_extract_email,
+    "phone": chat.llm_extract_phone,
+    "experience": chat.llm_extract_experience,
+}
+
+
+def normalise(value: Any) -> Any:
+    return value.strip().lower() if isinstance(value, str) else value
+
+
+async def evaluate(rules_only: bool) -> None:
+    metrics.reset()
+    stats: Dict[str, Dict[str, int]] = {}
+    for field, message, expected in CORPUS:
+        row = stats.setdefault(field, {"n": 0, "rules": 0, "hybrid": 0, "llm": 0})
+        row["n"] += 1
+        fast = fast_extract(field, message)
+        if expected == "":
+            # Correct when the rules do not claim a value
+            if not (fast.confident and fast.value):
+                row["rules"] += 1
+        elif fast.confident and normalise(fast.value) == normalise(expected):
+            row["rules"] += 1
+        if rules_only:
+            continue
+        llm_value = await LLM_EXTRACTORS[field](message)
+        if normalise(llm_value) == normalise(expected):
+            row["llm"] += 1
+        hybrid_value = fast.value if fast.confident else llm_value
+        if normalise(hybrid_value) == normalise(expected):
+            row["hybrid"] += 1
+
+    rates = llm_call_rates()
+    print(f"{'field':<12}{'n':>4}{'rules':>8}{'llm':>8}{'hybrid':>8}{'llm_rate':>10}")
+    for field, row in stats.items():
+        n = row["n"]
+        llm_acc = f"{row['llm'] / n:.0%}" if not rules_only else "-"
+        hybrid_acc = f"{row['hybrid'] / n:.0%}" if not rules_only else "-"
+        print(f"{field:<12}{n:>4}{row['rules'] / n:>8.0%}{llm_acc:>8}{hybrid_acc:>8}{rates[field]:>10.0%}")
+    print(f"overall LLM call rate with fast path: {rates['overall']:.0%} (was 100%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rule-based vs LLM extraction accuracy")
+    parser.add_argument("--rules-only", action="store_true", help="Skip the LLM path (no API key needed)")
+    args = parser.parse_args()
+    asyncio.run(evaluate(args.rules_only))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Event-loop responsiveness under concurrent candidate writes.
+
+Runs many concurrent writers against a real MongoDB while a probe coroutine
+measures event-loop lag (how late a short ``asyncio.sleep`` wakes up, which
+is how late every other request on the worker would be served). Two modes:
+
+- ``blocking``: the synchronous pymongo ``insert_one`` called inside the
+  coroutine, as the request handlers used to do;
+- ``async``: ``CandidateRepository.create`` through motor, with the pool,
+  timeouts and write concern from Settings.
+
+Writes go to a scratch database that is dropped afterwards. Needs a mongod
+at DATABASE_URL (or ``--url``).
+
+Usage examples (from the backend folder):
+
+  python scripts/load_test_mongo.py
+  python scripts/load_test_mongo.py --writers 500 --writes 10 --doc-kb 16
+  MONGO_MAX_POOL_SIZE=10 MONGO_WRITE_CONCERN_J=false python scripts/load_test_mongo.py --mode async
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+from pymongo import MongoClient  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.mongodb import client_options  # noqa: E402
+from app.services.candidate_repository import CandidateRepository  # noqa: E402
+
+
+def candidate_doc(writer: int, n: int, doc_kb: int) -> Dict:
+    answer = ("I would profile the slow endpoint, add the missing index and cache the hot path. " * 16)[:1024]
+    return {
+        "id": str(uuid.uuid4()),
+        "name": f"Load Test {writer}",
+        "email": f"load-{writer}-{n}@example.com",
+        "tech_skills": ["Python", "MongoDB", "Docker"],
+        "qa_responses": [{"question": f"Question {i}", "answer": answer} for i in range(doc_kb)],
+        "status": "completed",
+    }
+
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values) or [0.0]
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def probe(interval: float, lags: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def run(mode: str, args: argparse.Namespace) -> Dict:
+    options = client_options()
+    sync_client = MongoClient(args.url, **options)
+    async_client = AsyncIOMotorClient(args.url, **options)
+    sync_collection = sync_client[args.db]["candidates"]
+    repository = CandidateRepository(lambda: async_client[args.db]["candidates"])
+    await repository.ping()
+
+    async def write(doc: Dict) -> None:
+        if mode == "blocking":
+            sync_collection.insert_one(doc)
+        else:
+            await repository.create(doc)
+
+    write_latencies: List[float] = []
+
+    async def writer(w: int) -> None:
+        for n in range(args.writes):
+            started = time.perf_counter()
+            await write(candidate_doc(w, n, args.doc_kb))
+            write_latencies.append(time.perf_counter() - started)
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(args.probe_ms / 1000, lags, stop))
+    # Let the probe establish an idle baseline tick before the writers start
+    await asyncio.sleep(args.probe_ms / 1000 * 2)
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(w) for w in range(args.writers)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await prober
+
+    await async_client.drop_database(args.db)
+    async_client.close()
+    sync_client.close()
+    return {"elapsed": elapsed, "writes": len(write_latencies), "write": write_latencies, "lag": lags}
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    modes = ["blocking", "async"] if args.mode == "both" else [args.mode]
+    print(f"{args.writers} writers x {args.writes} writes of ~{args.doc_kb} KB, "
+          f"pool {settings.MONGO_MAX_POOL_SIZE}, w={settings.MONGO_WRITE_CONCERN_W} j={settings.MONGO_WRITE_CONCERN_J}")
+    print(f"{'mode':<10}{'writes/s':>10}{'write p50':>11}{'write p99':>11}"
+          f"{'lag p50':>10}{'lag p99':>10}{'lag max':>10}{'ticks':>7}")
+    for mode in modes:
+        result = await run(mode, args)
+        ms = lambda v: f"{v * 1000:.1f}ms"  # noqa: E731
+        print(f"{mode:<10}{result['writes'] / result['elapsed']:>10.0f}"
+              f"{ms(statistics.median(result['write'])):>11}{ms(percentile(result['write'], 0.99)):>11}"
+              f"{ms(statistics.median(result['lag'] or [0.0])):>10}{ms(percentile(result['lag'], 0.99)):>10}"
+              f"{ms(max(result['lag'] or [0.0])):>10}{len(result['lag']):>7}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MongoDB write load test: event-loop lag, blocking vs async")
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--db", default="talent_hiring_loadtest", help="Scratch database, dropped afterwards")
+    parser.add_argument("--mode", choices=["both", "blocking", "async"], default="both")
+    parser.add_argument("--writers", type=int, default=200, help="Concurrent writers (simulated requests)")
+    parser.add_argument("--writes", type=int, default=20, help="Writes per writer")
+    parser.add_argument("--doc-kb", type=int, default=4, help="Approximate document size")
+    parser.add_argument("--probe-ms", type=float, default=5, help="Event-loop probe interval")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
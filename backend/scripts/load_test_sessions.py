@@ -0,0 +1,320 @@
+"""
+Multi-worker load test for the interview session backends.
+
+Starts ``uvicorn app.main:app --workers N`` with the chosen SESSION_BACKEND
+and the fake LLM, then runs many concurrent technical-question interviews.
+Every request opens a new connection, so consecutive turns of one interview
+land on different workers, as they would behind a load balancer. A share of
+turns is submitted twice at the same moment (a double-clicked send).
+
+For each run it reports:
+
+- desynced turns: the question number in the reply is not the one the
+  interview had reached, i.e. the worker did not see the session's state;
+- duplicate submissions: refused with 409 by the compare-and-set, or applied
+  twice (both copies advanced the interview);
+- turn latency.
+
+The ``redis`` backend runs against a small in-process stand-in that speaks
+the Redis protocol (enough of it for ``RedisSessionStore``), unless
+``--redis-url`` points at a real server. The ``mongo`` backend needs MongoDB
+at DATABASE_URL.
+
+Usage examples (from the backend folder):
+
+  python scripts/load_test_sessions.py --backend memory
+  python scripts/load_test_sessions.py --backend redis --workers 4 --interviews 200
+  python scripts/load_test_sessions.py --backend mongo --duplicate-rate 0.3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SKILLS = "Python, Docker, SQL, Kubernetes, React, Java"
+
+
+class RespStandIn:
+    """Just enough of a Redis server, in memory, to exercise ``RedisSessionStore``."""
+
+    def __init__(self):
+        self.data: Dict[str, object] = {}
+        self.expires: Dict[str, float] = {}
+        # Bumped on every write, for WATCH
+        self.revisions: Dict[str, int] = {}
+
+    def _alive(self, key: str) -> bool:
+        if key in self.expires and self.expires[key] <= time.monotonic():
+            self._delete(key)
+        return key in self.data
+
+    def _touch(self, key: str) -> None:
+        self.revisions[key] = self.revisions.get(key, 0) + 1
+
+    def _delete(self, key: str) -> int:
+        self.expires.pop(key, None)
+        if self.data.pop(key, None) is None:
+            return 0
+        self._touch(key)
+        return 1
+
+    def execute(self, args: List[str]):
+        command, args = args[0].upper(), args[1:]
+        if command in ("PING",):
+            return "+PONG"
+        if command in ("CLIENT", "SELECT"):
+            return "+OK"
+        if command == "GET":
+            return self.data.get(args[0]) if self._alive(args[0]) else None
+        if command == "SET":
+            self.data[args[0]] = args[1]
+            self.expires.pop(args[0], None)
+            if len(args) > 3 and args[2].upper() in ("PX", "EX"):
+                scale = 1000 if args[2].upper() == "PX" else 1
+                self.expires[args[0]] = time.monotonic() + int(args[3]) / scale
+            self._touch(args[0])
+            return "+OK"
+        if command == "DEL":
+            return sum(self._delete(key) for key in args)
+        if command == "EXISTS":
+            return sum(1 for key in args if self._alive(key))
+        if command == "PEXPIRE":
+            if not self._alive(args[0]):
+                return 0
+            self.expires[args[0]] = time.monotonic() + int(args[1]) / 1000
+            return 1
+        if command == "HGETALL":
+            values = self.data.get(args[0], {}) if self._alive(args[0]) else {}
+            return [item for pair in values.items() for item in pair]
+        if command in ("HSET", "HINCRBY", "HINCRBYFLOAT"):
+            if not self._alive(args[0]):
+                self.data[args[0]] = {}
+            values = self.data[args[0]]
+            self._touch(args[0])
+            if command == "HSET":
+                pairs = list(zip(args[1::2], args[2::2]))
+                added = sum(1 for field, _ in pairs if field not in values)
+                values.update(pairs)
+                return added
+            cast = int if command == "HINCRBY" else float
+            result = cast(values.get(args[1], 0)) + cast(args[2])
+            values[args[1]] = str(result)
+            return result if command == "HINCRBY" else str(result)
+        return Exception(f"ERR unknown command '{command}'")
+
+    @staticmethod
+    def encode(value) -> bytes:
+        if isinstance(value, Exception):
+            return f"-{value}\r\n".encode()
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, str) and value.startswith("+"):
+            return f"{value}\r\n".encode()
+        if isinstance(value, int):
+            return f":{value}\r\n".encode()
+        if isinstance(value, list):
+            return f"*{len(value)}\r\n".encode() + b"".join(RespStandIn.encode(v) for v in value)
+        raw = str(value).encode()
+        return b"$" + str(len(raw)).encode() + b"\r\n" + raw + b"\r\n"
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        watched: Dict[str, int] = {}
+        queued: Optional[List[List[str]]] = None
+        try:
+            while True:
+                header = await reader.readline()
+                if not header:
+                    break
+                args = []
+                for _ in range(int(header[1:])):
+                    length = int((await reader.readline())[1:])
+                    args.append((await reader.readexactly(length + 2))[:-2].decode())
+                command = args[0].upper()
+                if command == "WATCH":
+                    watched.update({key: self.revisions.get(key, 0) for key in args[1:]})
+                    reply = "+OK"
+                elif command == "UNWATCH":
+                    watched.clear()
+                    reply = "+OK"
+                elif command == "MULTI":
+                    queued = []
+                    reply = "+OK"
+                elif command == "DISCARD":
+                    queued, reply = None, "+OK"
+                    watched.clear()
+                elif command == "EXEC":
+                    changed = any(self.revisions.get(key, 0) != rev for key, rev in watched.items())
+                    reply = None if changed else [self.execute(q) for q in queued or []]
+                    if changed:
+                        writer.write(b"*-1\r\n")
+                        await writer.drain()
+                        queued = None
+                        watched.clear()
+                        continue
+                    queued = None
+                    watched.clear()
+                elif queued is not None:
+                    queued.append(args)
+                    reply = "+QUEUED"
+                else:
+                    reply = self.execute(args)
+                writer.write(self.encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def post(client: httpx.AsyncClient, payload: Dict) -> Tuple[int, Dict]:
+    response = await client.post("/api/conversation/message", json=payload)
+    return response.status_code, response.json()
+
+
+async def run_interview(
+    client: httpx.AsyncClient, n: int, answers: int, duplicate_rate: float, rng: random.Random, stats: Dict
+) -> None:
+    info: Dict = {"email": f"load-{n}-{rng.random():.8f}@example.com"}
+    stage, message, index = "techStack", SKILLS, 0
+    for expected in range(1, answers + 2):
+        payload = {"userMessage": message, "currentStage": stage, "candidateInfo": info,
+                   "currentTechQuestionIndex": index}
+        started = time.perf_counter()
+        if rng.random() < duplicate_rate:
+            results = await asyncio.gather(post(client, payload), post(client, payload))
+            ok = [body for status, body in results if status == 200]
+            stats["duplicates"] += 1
+            stats["refused"] += sum(1 for status, _ in results if status == 409)
+            stats["applied_twice"] += len(ok) == 2
+            if not ok:
+                stats["errors"] += 1
+                return
+            body = ok[0]
+        else:
+            status, body = await post(client, payload)
+            if status != 200:
+                stats["errors"] += 1
+                return
+        stats["latencies"].append(time.perf_counter() - started)
+        stats["turns"] += 1
+        match = re.search(r"Question (\d+) about", body["message"])
+        if not match or int(match.group(1)) != expected:
+            stats["desynced"] += 1
+        info = body["updatedCandidateInfo"]
+        stage = body["nextStage"]
+        # Every skill is valid, so question n is about skill n - 1
+        index = expected - 1
+        message = f"Answer {expected}: I would profile first, then cache the hot path and add an index."
+
+
+async def run_load(base_url: str, args: argparse.Namespace) -> Dict:
+    stats: Dict = {"turns": 0, "desynced": 0, "duplicates": 0, "refused": 0, "applied_twice": 0,
+                   "errors": 0, "latencies": []}
+    rng = random.Random(args.seed)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    # No keep-alive: every request is a new connection, so turns spread over the workers
+    limits = httpx.Limits(max_keepalive_connections=0, max_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+
+        async def one(n: int) -> None:
+            async with semaphore:
+                await run_interview(client, n, args.answers, args.duplicate_rate, rng, stats)
+
+        await asyncio.gather(*(one(n) for n in range(args.interviews)))
+    return stats
+
+
+def wait_until_up(base_url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError("API did not come up")
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    env = dict(os.environ)
+    env.update({
+        "LLM_PROVIDER": "fake",
+        "SESSION_BACKEND": args.backend,
+        "QUESTION_BANK_ENABLED": "false",
+        "WARMUP_ENABLED": "false",
+    })
+    server = None
+    if args.backend == "redis" and not args.redis_url:
+        stand_in = RespStandIn()
+        redis_port = free_port()
+        server = await asyncio.start_server(stand_in.handle, "127.0.0.1", redis_port)
+        env["SESSION_REDIS_URL"] = f"redis://127.0.0.1:{redis_port}/0"
+    elif args.redis_url:
+        env["SESSION_REDIS_URL"] = args.redis_url
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    try:
+        await asyncio.to_thread(wait_until_up, base_url, 60)
+        started = time.perf_counter()
+        stats = await run_load(base_url, args)
+        elapsed = time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+        if server is not None:
+            server.close()
+
+    latencies = sorted(stats["latencies"]) or [0.0]
+    print(f"backend={args.backend} workers={args.workers} interviews={args.interviews} "
+          f"turns={stats['turns']} in {elapsed:.1f}s")
+    print(f"desynced turns:        {stats['desynced']} ({stats['desynced'] / max(stats['turns'], 1):.1%})")
+    print(f"duplicate submissions: {stats['duplicates']} "
+          f"(refused with 409: {stats['refused']}, applied twice: {stats['applied_twice']})")
+    print(f"failed interviews:     {stats['errors']}")
+    print(f"turn latency:          p50 {statistics.median(latencies) * 1000:.0f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Session backend multi-worker load test")
+    parser.add_argument("--backend", choices=["memory", "mongo", "redis"], default="redis")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--interviews", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--answers", type=int, default=4, help="Technical answers per interview (fewer than 6)")
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--redis-url", default=None, help="Use a real Redis server instead of the stand-in")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Simulate GroqService under rate limits against a local fake Groq server.
+
+Starts a small FastAPI app on 127.0.0.1 that mimics Groq's chat completions
+endpoint and enforces per-model requests-per-"minute" and tokens-per-"minute"
+limits (answering 429 with retry-after and sending x-ratelimit-* headers).
+The "minute" is shortened to --window seconds so a run takes a few seconds.
+
+A burst of background calls (question prefetch) is fired at start-up while
+live candidate turns keep arriving; the run is repeated with the client-side
+scheduler disabled and enabled. For each run it reports live-turn latency,
+how many calls were shed or served by the degraded model, and how many 429s
+the server had to send.
+
+Usage examples (from the backend folder):
+
+  python scripts/sim_rate_limits.py
+  python scripts/sim_rate_limits.py --turns 120 --background 80
+  python scripts/sim_rate_limits.py --degraded-model sim-small --interactive-max-wait 0.3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API", "sim")
+os.environ["GROQ_MODEL"] = "sim-model"
+os.environ["GROQ_MODEL_CATALOG_PATH"] = os.path.join(tempfile.mkdtemp(), "groq_model.json")
+
+import uvicorn  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from groq import AsyncGroq  # noqa: E402
+
+from app.metrics import metrics  # noqa: E402
+from app.services.groq_service import GroqService  # noqa: E402
+from app.services.llm_provider import Priority, current_priority, is_unavailable  # noqa: E402
+from app.services.rate_limiter import RateLimitScheduler  # noqa: E402
+
+
+class Limit:
+    """Server-side token bucket refilling ``limit`` units per ``window`` seconds."""
+
+    def __init__(self, limit: float, window: float):
+        self.limit = limit
+        self.window = window
+        self.level = limit
+        self.updated = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.limit, self.level + (now - self.updated) * self.limit / self.window)
+        self.updated = now
+
+    def reset_in(self) -> float:
+        return (self.limit - self.level) * self.window / self.limit
+
+
+def fake_groq(args: argparse.Namespace, stats: dict) -> FastAPI:
+    app = FastAPI()
+    limits = {}
+
+    def model_limits(model: str):
+        if model not in limits:
+            limits[model] = (Limit(args.rpm, args.window), Limit(args.tpm, args.window))
+        return limits[model]
+
+    @app.get("/openai/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "sim-model", "object": "model"}, {"id": "sim-small", "object": "model"}]}
+
+    @app.post("/openai/v1/chat/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        model = body["model"]
+        requests_limit, tokens_limit = model_limits(model)
+        requests_limit.refill()
+        tokens_limit.refill()
+        prompt_tokens = sum(len(m["content"]) for m in body["messages"]) // 4
+        needed = prompt_tokens + body.get("max_tokens", 512)
+        if requests_limit.level < 1 or tokens_limit.level < needed:
+            stats["429"] += 1
+            retry = max(1 - requests_limit.level, 0) * args.window / args.rpm
+            retry = max(retry, max(needed - tokens_limit.level, 0) * args.window / args.tpm)
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"retry-after": f"{retry:.2f}"},
+            )
+        completion_tokens = min(body.get("max_tokens", 512), 40)
+        requests_limit.level -= 1
+        tokens_limit.level -= prompt_tokens + completion_tokens
+        stats["served"][model] = stats["served"].get(model, 0) + 1
+        await asyncio.sleep(random.uniform(0.05, 0.2))
+        return JSONResponse(
+            {
+                "id": "sim",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {"index": 0, "message": {"role": "assistant", "content": "Sure."}, "finish_reason": "stop"}
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            },
+            headers={
+                "x-ratelimit-limit-tokens": str(args.tpm),
+                "x-ratelimit-remaining-tokens": str(int(tokens_limit.level)),
+                "x-ratelimit-reset-tokens": f"{tokens_limit.reset_in():.2f}s",
+            },
+        )
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def scenario(args: argparse.Namespace, base_url: str, stats: dict, enabled: bool) -> None:
+    stats.update({"429": 0, "served": {}})
+    metrics.reset()
+    service = GroqService()
+    service.client = AsyncGroq(api_key="sim", base_url=base_url)
+    service.scheduler = RateLimitScheduler(
+        rpm=args.rpm,
+        tpm=args.tpm,
+        degraded_model=args.degraded_model,
+        interactive_max_wait=args.interactive_max_wait,
+        background_max_wait=args.window * 4,
+        reserve=0.2,
+        enabled=enabled,
+        period=args.window,
+    )
+    prompt = "Extract the candidate's name from this message: 'I am Jane Doe, a backend engineer.' " * 4
+    live, background = [], []
+
+    async def background_call() -> None:
+        current_priority.set(Priority.BACKGROUND)
+        text = await service.generate_response(prompt, profile="question")
+        background.append(not is_unavailable(text))
+
+    async def live_turn(delay: float) -> None:
+        await asyncio.sleep(delay)
+        started = time.perf_counter()
+        text = await service.generate_response(prompt, profile="ask")
+        live.append((time.perf_counter() - started, not is_unavailable(text)))
+
+    rng = random.Random(7)
+    arrivals = sorted(rng.uniform(0, args.duration) for _ in range(args.turns))
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(background_call() for _ in range(args.background)),
+        *(live_turn(t) for t in arrivals),
+    )
+    elapsed = time.perf_counter() - started
+    await service.aclose()
+
+    latencies = sorted(t for t, ok in live if ok)
+    print(f"\n== scheduler {'enabled' if enabled else 'disabled'} ({elapsed:.1f}s) ==")
+    print(f"live turns answered:   {len(latencies)}/{len(live)}")
+    if latencies:
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"live latency p50/p95:  {statistics.median(latencies) * 1000:.0f} / {p95 * 1000:.0f} ms")
+    print(f"background completed:  {sum(background)}/{len(background)}")
+    print(f"served per model:      {stats['served']}")
+    print(f"server 429 responses:  {stats['429']}")
+    print(f"degraded live turns:   {int(metrics.total('llm_rate_limit_degraded'))}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    stats = {"429": 0, "served": {}}
+    port = free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(fake_groq(args, stats), host="127.0.0.1", port=port, log_level="warning")
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    try:
+        for enabled in (False, True):
+            await scenario(args, f"http://127.0.0.1:{port}", stats, enabled)
+            # Let the server's buckets refill between runs
+            await asyncio.sleep(args.window)
+    finally:
+        server.should_exit = True
+        await serving
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GroqService rate-limit simulation")
+    parser.add_argument("--turns", type=int, default=60, help="Live candidate turns")
+    parser.add_argument("--background", type=int, default=40, help="Background calls fired at start-up")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds over which live turns arrive")
+    parser.add_argument("--window", type=float, default=5.0, help="Length of the server's rate-limit 'minute'")
+    parser.add_argument("--rpm", type=int, default=30, help="Requests per window, per model")
+    parser.add_argument("--tpm", type=int, default=8000, help="Tokens per window, per model")
+    parser.add_argument("--interactive-max-wait", type=float, default=2.0)
+    parser.add_argument("--degraded-model", default="", help="e.g. sim-small")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
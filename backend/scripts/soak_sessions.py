@@ -0,0 +1,170 @@
+"""
+Soak test for the interview session store: memory must stay flat.
+
+Runs tens of thousands of simulated interviews through ``SessionStore`` with
+the same state changes a real interview makes (question pointers, asked
+questions, per-answer metrics). Most complete, some are rejected and the rest
+are abandoned mid-interview and left to the idle TTL. Hundreds of
+interviews are in progress at once, and a simulated clock advances with
+every turn so the TTL sweep actually fires. Traced Python memory is sampled
+at checkpoints and the run fails if it keeps growing once the store has
+reached its steady state.
+
+``--unbounded`` runs the same traffic against a plain never-pruned dict, the
+way ``chat.py`` used to hold sessions, for comparison.
+
+Usage examples (from the backend folder):
+
+  python scripts/soak_sessions.py
+  python scripts/soak_sessions.py --interviews 100000 --ttl 600
+  python scripts/soak_sessions.py --unbounded
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tracemalloc
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.metrics import metrics  # noqa: E402
+from app.services.session_store import (  # noqa: E402
+    InterviewSession, SessionStore, answer_key, process_rss_bytes
+)
+
+SKILLS = ["python", "react", "docker", "sql", "kubernetes", "java"]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class UnboundedStore:
+    """The old behaviour: a dict of sessions that is never pruned."""
+
+    def __init__(self):
+        self._sessions = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def load(self, session_id: str) -> InterviewSession:
+        return self._sessions.get(session_id)
+
+    async def save(self, session: InterviewSession) -> bool:
+        self._sessions[session.session_id] = session
+        return True
+
+    async def record_answer(self, session_id: str, key: str, answer_metrics, score: float) -> None:
+        session = self._sessions[session_id]
+        session.answer_metrics[key] = answer_metrics
+        session.score_total += score
+        session.scored_answers += 1
+
+    async def discard(self, session_id: str, reason: str) -> bool:
+        return False
+
+    def expire(self) -> int:
+        return 0
+
+
+async def interview(store, rng: random.Random, number: int, abandon: float, reject: float):
+    """One candidate's interview; yields after each turn so many can be interleaved."""
+    session_id = f"candidate{number}@example.com"
+    await store.save(InterviewSession(session_id, "techStack"))
+    questions = rng.randint(2, len(SKILLS))
+    outcome = rng.random()
+    for turn in range(questions):
+        yield
+        session = await store.load(session_id) or InterviewSession(session_id)
+        question = f"Question {turn + 1} about {SKILLS[turn]}: explain {rng.random():.6f}"
+        session.stage = "technicalQuestions"
+        session.question_count += 1
+        session.skill_index = turn
+        session.last_question = question
+        session.asked_questions.append(question)
+        await store.save(session)
+        answer = f"answer {number}-{turn} " * rng.randint(5, 40)
+        await store.record_answer(
+            session_id, answer_key(answer), {"word_count": len(answer.split()), "score": 50.0}, 50.0
+        )
+        if outcome < abandon and turn == 0:
+            return
+    await store.discard(session_id, "rejected" if outcome < abandon + reject else "completed")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Session store soak test")
+    parser.add_argument("--interviews", type=int, default=50000)
+    parser.add_argument("--ttl", type=float, default=300.0, help="Idle TTL in simulated seconds")
+    parser.add_argument("--max-entries", type=int, default=5000)
+    parser.add_argument("--abandon", type=float, default=0.2, help="Share of interviews never finished")
+    parser.add_argument("--reject", type=float, default=0.1, help="Share of interviews rejected")
+    parser.add_argument("--concurrent", type=int, default=500, help="Interviews in progress at once")
+    parser.add_argument("--turns-per-minute", type=float, default=600.0)
+    parser.add_argument("--checkpoints", type=int, default=10)
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed growth after warm-up")
+    parser.add_argument("--unbounded", action="store_true", help="Use a never-pruned dict instead")
+    args = parser.parse_args()
+
+    clock = Clock()
+    rng = random.Random(0)
+    if args.unbounded:
+        store = UnboundedStore()
+    else:
+        store = SessionStore(max_entries=args.max_entries, ttl_seconds=args.ttl, clock=clock)
+
+    tracemalloc.start()
+    samples: List[int] = []
+    every = max(1, args.interviews // args.checkpoints)
+    active = []
+    started = finished = 0
+    while finished < args.interviews:
+        while len(active) < args.concurrent and started < args.interviews:
+            started += 1
+            active.append(interview(store, rng, started, args.abandon, args.reject))
+        # One turn of a random in-progress interview, a fraction of a second apart
+        clock.now += 60 / args.turns_per_minute
+        index = rng.randrange(len(active))
+        try:
+            await active[index].__anext__()
+            continue
+        except StopAsyncIteration:
+            active[index] = active[-1]
+            active.pop()
+        finished += 1
+        if finished % 20 == 0:
+            store.expire()
+        # Sample only while new interviews keep arriving, not during the final drain
+        if finished % every == 0 and started < args.interviews:
+            current, _ = tracemalloc.get_traced_memory()
+            samples.append(current)
+            print(
+                f"{finished:>7} interviews  sessions={len(store):>6}  "
+                f"traced={current / 1e6:7.2f} MB  rss={process_rss_bytes() / 1e6:7.1f} MB"
+            )
+    tracemalloc.stop()
+
+    evicted = {k: v for k, v in metrics.snapshot()["counters"].items() if k.startswith("sessions_evicted")}
+    print(f"\nevictions: {evicted}")
+    # Ignore the first checkpoints while the store fills up to its steady state
+    settled = samples[len(samples) // 3:]
+    growth = (settled[-1] - settled[0]) / settled[0] if settled and settled[0] else 0.0
+    print(f"memory growth after warm-up: {growth:+.1%} (tolerance {args.tolerance:.0%})")
+    if growth > args.tolerance:
+        print("FAIL: session memory keeps growing")
+        sys.exit(1)
+    print("OK: session memory is flat")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
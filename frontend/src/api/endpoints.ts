@@ -5,6 +5,7 @@ const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000
 export const endpoints = {
   // Conversation endpoints
   sendMessage: `${API_BASE_URL}/api/conversation/message`,
+  conversationTurn: `${API_BASE_URL}/api/conversation/turn`,
   getNextQuestion: `${API_BASE_URL}/api/conversation/next-question`,
   
   // Technical questions endpoints
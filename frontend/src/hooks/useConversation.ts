@@ -1,5 +1,6 @@
-import { useState, useCallback, useEffect } from 'react';
+import { useState, useCallback, useEffect, useRef } from 'react';
 import { Message, CandidateInfo, ConversationStage } from '@/types/interview';
+import { TurnResponse } from '@/types/api';
 import { endpoints, apiClient } from '@/api/endpoints';
 
 const initialCandidateInfo: CandidateInfo = {
@@ -19,8 +20,9 @@ export const useConversation = () => {
   const [messages, setMessages] = useState<Message[]>([]);
   const [stage, setStage] = useState<ConversationStage>('greeting');
   const [candidateInfo, setCandidateInfo] = useState<CandidateInfo>(initialCandidateInfo);
-  const [currentTechQuestionIndex, setCurrentTechQuestionIndex] = useState(0);
   const [techQuestionsAsked, setTechQuestionsAsked] = useState<string[]>([]);
+  // The server owns the interview state; we only echo its token and version
+  const session = useRef<{ token: string | null; version: number | null }>({ token: null, version: null });
 
   const sendMessage = useCallback(async (content: string) => {
     const userMessage: Message = {
@@ -33,35 +35,30 @@ export const useConversation = () => {
     setMessages(prev => [...prev, userMessage]);
 
     try {
-      // Send message to backend and get AI response
-      const response = await apiClient.post<{
-        message: string;
-        nextStage: ConversationStage;
-        updatedCandidateInfo?: Partial<CandidateInfo>;
-        technicalQuestion?: string;
-        isComplete?: boolean;
-      }>(endpoints.sendMessage, {
+      // Send only the new message; the backend replies with what changed
+      const response = await apiClient.post<TurnResponse>(endpoints.conversationTurn, {
+        sessionToken: session.current.token,
         userMessage: content,
-        currentStage: stage,
-        candidateInfo,
-        currentTechQuestionIndex,
+        version: session.current.version,
       });
+      session.current = { token: response.sessionToken, version: response.version };
 
-      // Update candidate info if provided by backend
-      if (response.updatedCandidateInfo) {
-        setCandidateInfo(prev => ({
-          ...prev,
-          ...response.updatedCandidateInfo,
-        }));
-      }
+      // Apply changed fields, and items appended to lists such as technicalQA
+      setCandidateInfo(prev => {
+        const next = { ...prev, ...response.changes };
+        for (const [key, items] of Object.entries(response.appended)) {
+          const field = key as keyof CandidateInfo;
+          next[field] = [...((prev[field] as unknown[]) || []), ...(items || [])] as never;
+        }
+        return next;
+      });
 
       // Update stage
-      setStage(response.nextStage);
+      setStage(response.stage);
 
       // Handle technical questions
       if (response.technicalQuestion) {
         setTechQuestionsAsked(prev => [...prev, response.technicalQuestion!]);
-        setCurrentTechQuestionIndex(prev => prev + 1);
       }
 
       // Add AI response
@@ -88,14 +85,17 @@ export const useConversation = () => {
       };
       setMessages(prev => [...prev, errorMessage]);
     }
-  }, [stage, candidateInfo, currentTechQuestionIndex]);
+  }, []);
+
+  // Read at call time; there is no token until the first turn returns
+  const getSessionToken = useCallback(() => session.current.token, []);
 
   const resetConversation = useCallback(() => {
     setMessages([]);
     setStage('greeting');
     setCandidateInfo(initialCandidateInfo);
-    setCurrentTechQuestionIndex(0);
     setTechQuestionsAsked([]);
+    session.current = { token: null, version: null };
     
     // Do not add hardcoded greeting; let backend/LLM generate the greeting
     setMessages([]);
@@ -113,6 +113,7 @@ export const useConversation = () => {
     stage,
     candidateInfo,
     sendMessage,
-    resetConversation
+    resetConversation,
+    getSessionToken
   };
 };
@@ -3,12 +3,15 @@ import { apiClient, endpoints } from '@/api/endpoints';
 
 interface FullscreenMonitorOptions {
   candidateEmail: string;
+  // Token of the /conversation/turn session, so the backend can end it
+  getSessionToken?: () => string | null;
   maxExits?: number;
   onRejected?: () => void;
 }
 
 export const useFullscreenMonitor = ({ 
   candidateEmail, 
+  getSessionToken,
   maxExits = 3,
   onRejected 
 }: FullscreenMonitorOptions) => {
@@ -99,6 +102,7 @@ export const useFullscreenMonitor = ({
       await apiClient.post(endpoints.rejectCandidate, {
         email: candidateEmail,
         reason: 'malpractice_fullscreen_exit',
+        sessionToken: getSessionToken?.() ?? null,
       });
       console.log('Candidate marked as rejected in database');
     } catch (error) {
@@ -13,7 +13,7 @@ import { useToast } from '@/hooks/use-toast';
 import { Alert, AlertDescription, AlertTitle } from '@/components/ui/alert';
 
 const Interview = () => {
-  const { messages, stage, candidateInfo, sendMessage, resetConversation } = useConversation();
+  const { messages, stage, candidateInfo, sendMessage, resetConversation, getSessionToken } = useConversation();
   const { toast } = useToast();
   const navigate = useNavigate();
   const messagesEndRef = useRef<HTMLDivElement>(null);
@@ -22,6 +22,7 @@ const Interview = () => {
   // Fullscreen monitoring with rejection logic
   const { exitCount, maxExits, isFullscreen, isRejected } = useFullscreenMonitor({
     candidateEmail: candidateInfo.email || '',
+    getSessionToken,
     maxExits: 3,
     onRejected: () => {
       toast({
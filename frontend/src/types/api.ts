@@ -8,6 +8,13 @@ export interface SendMessageRequest {
   currentTechQuestionIndex: number;
 }
 
+// Server-authoritative protocol: token and message in, changed fields out
+export interface TurnRequest {
+  sessionToken: string | null;
+  userMessage: string;
+  version: number | null;
+}
+
 export interface SaveCandidateRequest {
   candidateInfo: CandidateInfo;
 }
@@ -25,6 +32,17 @@ export interface SendMessageResponse {
   isComplete?: boolean;
 }
 
+export interface TurnResponse {
+  sessionToken: string;
+  version: number;
+  message: string;
+  stage: ConversationStage;
+  changes: Partial<CandidateInfo>;
+  appended: Partial<Record<keyof CandidateInfo, unknown[]>>;
+  technicalQuestion?: string;
+  isComplete?: boolean;
+}
+
 export interface SaveCandidateResponse {
   id: string;
   message: string;